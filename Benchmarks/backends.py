@@ -0,0 +1,105 @@
+""" Compare the time per iteration of the NumPy and Numba backends
+
+    Examples
+    --------
+        python -m Benchmarks.backends --sizes 100 1000 10000
+"""
+import argparse
+import json
+import sys
+import time
+
+import numpy as np
+
+from Optimizers import ConvexHull, SampleWeighting, kernels
+from Optimizers.SampleWeighting.Distributions import TruncatedGaussian
+
+from .problems import binomial_exam_problems, hypercube_problems
+
+
+def time_per_iteration(optimizer, w, n_iter, repeats, search_kwargs=None):
+    """ Returns the best, over `repeats`, of the mean time of `n_iter` calls to `search` from `w` """
+    search_kwargs = {} if search_kwargs is None else search_kwargs
+
+    # The first call compiles the kernels
+    optimizer.search(w, **search_kwargs)
+
+    best = np.inf
+    for _ in range(repeats):
+        x = w
+        start = time.perf_counter()
+        for _ in range(n_iter):
+            x = optimizer.search(x, **search_kwargs)
+        best = min(best, (time.perf_counter() - start) / n_iter)
+
+    return best
+
+
+def convex_hull_cases(size, dimension, seed):
+    samples_per_surface = max(1, size // (2 * dimension))
+    X, y, _ = next(hypercube_problems(samples_per_surface, dimension, 1, seed))
+
+    n = len(X)
+    vertex = np.zeros(n)
+    vertex[0] = 1
+
+    yield "ConvexHull.CauchySimplex", n, lambda backend: ConvexHull.CauchySimplex(X, y, backend=backend), \
+        np.ones(n) / n, {}
+    yield "ConvexHull.PairwiseFrankWolfe", n, lambda backend: ConvexHull.PairwiseFrankWolfe(X, y, backend=backend), \
+        vertex, {}
+
+
+def sample_weighting_cases(size, num_students, seed):
+    samples = next(binomial_exam_problems(num_students, size, 1, seed))
+    integration_points = np.linspace(0, 1, 401)
+    target_distribution = TruncatedGaussian(0.5, 0.1, 0, 1)
+
+    def factory(cls):
+        return lambda backend: cls(samples, integration_points, target_distribution, e=0.05, backend=backend)
+
+    w = np.ones(size) / size
+    yield "SampleWeighting.CauchySimplex", size, factory(SampleWeighting.CauchySimplex), w, {'gamma': 1}
+    yield "SampleWeighting.PairwiseFrankWolfe", size, factory(SampleWeighting.PairwiseFrankWolfe), w, {}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 1000, 10000],
+                        help="The number of hull points, or questions")
+    parser.add_argument('--dimension', type=int, default=10)
+    parser.add_argument('--students', type=int, default=200)
+    parser.add_argument('--n-iter', type=int, default=50)
+    parser.add_argument('--repeats', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default=None, help="Also write the results to this JSON file")
+    args = parser.parse_args(argv)
+
+    if not kernels.NUMBA_AVAILABLE:
+        print("Numba is not installed, so only the NumPy backend is timed.", file=sys.stderr)
+
+    backends = kernels.BACKENDS if kernels.NUMBA_AVAILABLE else ("numpy",)
+
+    results = []
+    header = "".join(f"{backend + ' (us)':>14}" for backend in backends)
+    print(f"{'optimizer':<36}{'n':>8}{header}{'speedup':>10}")
+    for size in args.sizes:
+        cases = list(convex_hull_cases(size, args.dimension, args.seed))
+        cases += list(sample_weighting_cases(size, args.students, args.seed))
+
+        for name, n, factory, w, search_kwargs in cases:
+            times = {backend: time_per_iteration(factory(backend), w, args.n_iter, args.repeats, search_kwargs)
+                     for backend in backends}
+            speedup = times['numpy'] / times['numba'] if 'numba' in times else None
+
+            results.append({'optimizer': name, 'n': n, 'time_per_iter': times, 'speedup': speedup})
+            print(f"{name:<36}{n:>8}" + "".join(f"{times[backend] * 1e6:>14.1f}" for backend in backends)
+                  + (f"{speedup:>10.2f}" if speedup is not None else f"{'-':>10}"))
+
+    if args.output is not None:
+        with open(args.output, 'w') as f:
+            json.dump({'numba_available': kernels.NUMBA_AVAILABLE, 'args': vars(args), 'results': results}, f,
+                      indent=2)
+
+
+if __name__ == '__main__':
+    main()
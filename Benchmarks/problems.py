@@ -0,0 +1,118 @@
+import numpy as np
+
+
+def sample_unit_hypercube(N, dimension, random_state):
+    """ N is the number of samples on each surface of the hypercube
+
+        https://stats.stackexchange.com/questions/504487/distributions-on-the-surface-of-a-hypercube
+
+        The random numbers are drawn in the same order as the loop in `Results/Convex_Hull_Tests.ipynb`,
+        so the same seed gives the same points.
+    """
+    index = np.arange(dimension)
+    X = np.zeros((N * dimension * 2, dimension))
+
+    count = 0
+    for k in range(dimension):  # The dimension of the surface to sample on
+        working_indices = index[index != k]
+        for j in range(2):  # The top or bottom face of the surface
+            X[count:count + N, working_indices] = random_state.rand(N, dimension - 1)
+            X[count:count + N, k] = j
+
+            count += N
+    return X
+
+
+def generate_point_on_surface(d, top_surface, X, random_state):
+    """ Generates a point sampled on the convex hull of X
+
+        Parameters
+        ----------
+        d : int
+            The dimension of the surface to sample from
+        top_surface : int
+            0 for the bottom surface and 1 for the top surface
+        X : np.ndarray
+            The set of points
+        random_state : np.random.RandomState
+    """
+    surface_points = X[X[:, d] == top_surface]
+    n, _ = surface_points.shape
+
+    w = random_state.rand(n)
+    w = w / np.sum(w)
+
+    return w @ surface_points
+
+
+def hypercube_problems(samples_per_surface, dimension, num_trials, seed):
+    """ Yields the hypercube-surface projection problems of `Results/Convex_Hull_Tests.ipynb`
+
+        Parameters
+        ----------
+        samples_per_surface : int
+            The number of points on each face of the hypercube, so X has 2 * dimension times as many rows
+        dimension : int
+        num_trials : int
+            The number of points to project
+        seed : int
+
+        Yields
+        ------
+        tuple
+            (X, y, y_true), where y_true is the projection of y onto the convex hull of X
+    """
+    random_state = np.random.RandomState(seed)
+    X = sample_unit_hypercube(samples_per_surface, dimension, random_state)
+
+    for _ in range(num_trials):
+        d, top_surface = random_state.randint(dimension), random_state.randint(2)
+        y_true = generate_point_on_surface(d, top_surface, X, random_state)
+
+        y = y_true.copy()
+        y[d] += (1 if top_surface else -1)
+
+        yield X, y, y_true
+
+
+def generate_student_scores(num_students=100, num_questions=100,
+                            easy_question_proportion=0.8, smart_student_proportion=0.6):
+    """ Returns the probability of each student answering each question correctly """
+    # Question difficulty
+    q_values = np.zeros(num_questions)
+    n = int(num_questions * easy_question_proportion)
+
+    q_values[:n] = 7 / 8
+    q_values[n:] = 1 / 5
+
+    # Student smartness
+    s_values = np.zeros(num_students)
+    n = int(num_students * smart_student_proportion)
+
+    s_values[:n] = 4 / 5
+    s_values[n:] = 1 / 2
+
+    return s_values[:, None] * q_values[None, :]
+
+
+def binomial_exam_problems(num_students, num_questions, num_trials, seed):
+    """ Yields the binomial exam marks of `Results/Mark_Distribution_Tests.ipynb`
+
+        Parameters
+        ----------
+        num_students : int
+        num_questions : int
+        num_trials : int
+            The number of exams
+        seed : int
+            Trial i uses the seed `seed + i`, so `seed=0` matches the notebook
+
+        Yields
+        ------
+        (num_students, num_questions) np.ndarray
+            The marks of each student on each question
+    """
+    p_values = generate_student_scores(num_students=num_students, num_questions=num_questions)
+
+    for i in range(num_trials):
+        yield np.random.RandomState(seed + i).binomial(1, p_values)
@@ -0,0 +1,348 @@
+""" Benchmark every optimizer on the problems of the paper, and write the results to JSON
+
+    Examples
+    --------
+    Run the default sweep, and compare it against an earlier run
+
+        python -m Benchmarks.run --output results.json --baseline previous.json
+
+    A small sweep for a quick check
+
+        python -m Benchmarks.run --quick
+"""
+import argparse
+import datetime
+import json
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from Optimizers import ConvexHull, SampleWeighting
+from Optimizers.ConvexHull.BatchConvexHull import BatchConvexHull
+from Optimizers.SampleWeighting.Distributions import TruncatedGaussian
+
+from .problems import binomial_exam_problems, hypercube_problems
+
+
+def centroid(n):
+    return np.ones(n) / n
+
+
+def vertex(n):
+    w = np.zeros(n)
+    w[0] = 1
+    return w
+
+
+# name: (constructor, constructor kwargs, search kwargs, starting point), following the notebooks
+CONVEX_HULL_OPTIMIZERS = {
+    "CauchySimplex": (ConvexHull.CauchySimplex, {}, {}, centroid),
+    "EGD": (ConvexHull.EGD, {}, {'step_size': 10}, centroid),
+    "EGD-newton": (ConvexHull.EGD, {'line_search': "newton", 'incremental': True}, {}, centroid),
+    "PairwiseFrankWolfe": (ConvexHull.PairwiseFrankWolfe, {}, {}, vertex),
+    "AwayStepFrankWolfe": (ConvexHull.AwayStepFrankWolfe, {}, {}, vertex),
+    "FullyCorrectiveFrankWolfe": (ConvexHull.FullyCorrectiveFrankWolfe, {}, {}, vertex),
+    "ProjectedGradient": (ConvexHull.ProjectedGradient, {}, {}, centroid),
+    "FISTA": (ConvexHull.FISTA, {}, {}, centroid),
+    # The batch optimizers project `--queries` points onto the hull of each problem at once
+    "BatchCauchySimplex": (ConvexHull.BatchCauchySimplex, {}, {}, centroid),
+    "BatchPairwiseFrankWolfe": (ConvexHull.BatchPairwiseFrankWolfe, {}, {}, vertex),
+}
+
+# Solvers that are run through `solve`, so only the final point is recorded
+CONVEX_HULL_SOLVERS = {
+    "WorkingSetSolver": (ConvexHull.WorkingSetSolver, {}),
+    "ScreeningSolver": (ConvexHull.ScreeningSolver, {}),
+}
+
+SAMPLE_WEIGHTING_OPTIMIZERS = {
+    "CauchySimplex": (SampleWeighting.CauchySimplex, {}, {'gamma': 1}, centroid),
+    "EGD": (SampleWeighting.EGD, {}, {'step_size': 10}, centroid),
+    "PairwiseFrankWolfe": (SampleWeighting.PairwiseFrankWolfe, {}, {}, centroid),
+    "AwayStepFrankWolfe": (SampleWeighting.AwayStepFrankWolfe, {}, {}, centroid),
+    "FullyCorrectiveFrankWolfe": (SampleWeighting.FullyCorrectiveFrankWolfe, {}, {}, centroid),
+}
+
+
+def run_search(optimizer, w, search_kwargs, max_iter, metric, tol=None):
+    """ Call `search` until `metric(w) < tol` or `max_iter`, timing only the calls to `search`
+
+        Returns
+        -------
+        tuple
+            (iterations, total search time, the metric after each iteration, the cumulative times)
+    """
+    metrics, times = [], []
+
+    elapsed = 0.0
+    for _ in range(max_iter):
+        start = time.perf_counter()
+        w = optimizer.search(w, **search_kwargs)
+        elapsed += time.perf_counter() - start
+
+        metrics.append(float(metric(w)))
+        times.append(elapsed)
+
+        if tol is not None and metrics[-1] < tol:
+            break
+
+    return len(metrics), elapsed, metrics, times
+
+
+def peak_memory(factory, w, search_kwargs, n_iter):
+    """ Returns the peak traced memory, in bytes, of building the optimizer and `n_iter` searches """
+    tracemalloc.start()
+    try:
+        optimizer = factory()
+        for _ in range(n_iter):
+            w = optimizer.search(w, **search_kwargs)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def time_to_tolerance(metrics, times, tol):
+    """ Returns the search time until the metric first drops below `tol`, or None if it never does """
+    for metric, elapsed in zip(metrics, times):
+        if metric < tol:
+            return elapsed
+    return None
+
+
+def record(suite, name, params, trial, iterations, elapsed, final, time_to_tol, memory, setup=None):
+    """ Returns the result of one run. `elapsed` is the search time only, and `setup` the time taken to
+        build the optimizer, so that the time per iteration does not include it
+    """
+    return {
+        'suite': suite,
+        'optimizer': name,
+        'params': params,
+        'trial': trial,
+        'iterations': iterations,
+        'time': elapsed,
+        'setup': setup,
+        'time_per_iter': elapsed / iterations if iterations > 0 else None,
+        'time_to_tol': time_to_tol,
+        'final': final,
+        'peak_memory': memory,
+    }
+
+
+def convex_hull_suite(args, names):
+    results = []
+
+    for i, (dimension, samples) in enumerate((d, s) for d in args.dimensions for s in args.samples_per_surface):
+        n = 2 * dimension * samples
+        params = {'n': n, 'd': dimension, 'samples_per_surface': samples, 'seed': args.seed + i}
+        print(f"ConvexHull n={n} d={dimension}", file=sys.stderr)
+
+        # The points of all the problems share X, and the first `trials` are the single-query problems
+        problems = list(hypercube_problems(samples, dimension, args.trials * args.queries, args.seed + i))
+        for trial, (X, y, y_true) in enumerate(problems[:args.trials]):
+            def distance(w):
+                return np.linalg.norm(w @ X - y_true)
+
+            batch = problems[trial * args.queries:(trial + 1) * args.queries]
+            Y = np.array([y for _, y, _ in batch])
+            Y_true = np.array([y_true for _, _, y_true in batch])
+
+            def max_distance(W):
+                return np.max(np.linalg.norm(W @ X - Y_true, axis=1))
+
+            for name, (cls, kwargs, search_kwargs, start) in CONVEX_HULL_OPTIMIZERS.items():
+                if name not in names:
+                    continue
+
+                if issubclass(cls, BatchConvexHull):
+                    target, w0, metric = Y, np.tile(start(n), (len(Y), 1)), max_distance
+                    run_params = {**params, 'queries': len(Y)}
+                else:
+                    target, w0, metric = y, start(n), distance
+                    run_params = params
+
+                def factory():
+                    return cls(X, target, **kwargs)
+
+                start_time = time.perf_counter()
+                optimizer = factory()
+                setup = time.perf_counter() - start_time
+
+                iterations, elapsed, metrics, times = run_search(optimizer, w0, search_kwargs,
+                                                                 args.max_iter, metric, tol=args.tol)
+                memory = peak_memory(factory, w0, search_kwargs, args.memory_iter)
+
+                results.append(record('convex_hull', name, run_params, trial, iterations, elapsed,
+                                      metrics[-1], time_to_tolerance(metrics, times, args.tol), memory,
+                                      setup=setup))
+
+            for name, (cls, kwargs) in CONVEX_HULL_SOLVERS.items():
+                if name not in names:
+                    continue
+
+                result = cls(X, y, **kwargs).solve(centroid(n), max_iter=args.max_iter)
+                final = float(distance(result.w))
+
+                results.append(record('convex_hull', name, params, trial, result.iterations, result.time,
+                                      final, result.time if final < args.tol else None, None))
+
+    return results
+
+
+def sample_weighting_suite(args, names):
+    results = []
+
+    target_distribution = TruncatedGaussian(0.5, 0.1, 0, 1)
+
+    grid = [(s, q, m) for s in args.students for q in args.questions for m in args.integration_points]
+    for num_students, num_questions, num_points in grid:
+        params = {'students': num_students, 'questions': num_questions, 'integration_points': num_points,
+                  'seed': args.seed}
+        print(f"SampleWeighting students={num_students} questions={num_questions} points={num_points}",
+              file=sys.stderr)
+
+        integration_points = np.linspace(0, 1, num_points)
+
+        exams = binomial_exam_problems(num_students, num_questions, args.trials, args.seed)
+        for trial, samples in enumerate(exams):
+            trial_results = []
+            for name, (cls, kwargs, search_kwargs, start) in SAMPLE_WEIGHTING_OPTIMIZERS.items():
+                if name not in names:
+                    continue
+
+                def factory():
+                    return cls(samples, integration_points, target_distribution, e=0.05, **kwargs)
+
+                start_time = time.perf_counter()
+                optimizer = factory()
+                setup = time.perf_counter() - start_time
+
+                iterations, elapsed, metrics, times = run_search(optimizer, start(num_questions), search_kwargs,
+                                                                 args.sample_weighting_max_iter, optimizer.f)
+                memory = peak_memory(factory, start(num_questions), search_kwargs, args.memory_iter)
+
+                trial_results.append((name, iterations, elapsed, metrics, times, memory, setup))
+
+            # There is no known optimum, so the tolerance is relative to the best objective found
+            best = min(min(metrics) for _, _, _, metrics, _, _, _ in trial_results)
+            tol = best + args.tol * max(1.0, abs(best))
+
+            for name, iterations, elapsed, metrics, times, memory, setup in trial_results:
+                results.append(record('sample_weighting', name, params, trial, iterations, elapsed,
+                                      metrics[-1], time_to_tolerance(metrics, times, tol), memory,
+                                      setup=setup))
+
+    return results
+
+
+def metadata(args):
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True,
+                                check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    return {
+        'timestamp': datetime.datetime.now().isoformat(),
+        'commit': commit,
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'args': vars(args),
+    }
+
+
+def compare(baseline, results, threshold=1.25):
+    """ Returns the results whose time per iteration is more than `threshold` times the baseline """
+    def key(result):
+        return (result['suite'], result['optimizer'], json.dumps(result['params'], sort_keys=True),
+                result['trial'])
+
+    previous = {key(result): result for result in baseline['results']}
+
+    regressions = []
+    for result in results:
+        old = previous.get(key(result))
+        if old is None or not old['time_per_iter'] or not result['time_per_iter']:
+            continue
+
+        ratio = result['time_per_iter'] / old['time_per_iter']
+        if ratio > threshold:
+            regressions.append((result, ratio))
+
+    return regressions
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--suite', choices=['convex_hull', 'sample_weighting', 'all'], default='all')
+    parser.add_argument('--optimizers', nargs='+', default=None,
+                        help="Only run the optimizers with these names")
+    parser.add_argument('--output', default='benchmark_results.json')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--trials', type=int, default=5)
+    parser.add_argument('--tol', type=float, default=1e-5,
+                        help="Distance to the true projection, or relative gap to the best objective")
+    parser.add_argument('--memory-iter', type=int, default=5,
+                        help="Number of iterations traced for the peak memory")
+
+    parser.add_argument('--dimensions', type=int, nargs='+', default=[10, 20, 30, 40, 50])
+    parser.add_argument('--samples-per-surface', type=int, nargs='+', default=[100])
+    parser.add_argument('--max-iter', type=int, default=10_000)
+    parser.add_argument('--queries', type=int, default=16,
+                        help="Number of points projected at once by the batch optimizers")
+
+    parser.add_argument('--students', type=int, nargs='+', default=[200])
+    parser.add_argument('--questions', type=int, nargs='+', default=[75])
+    parser.add_argument('--integration-points', type=int, nargs='+', default=[401])
+    parser.add_argument('--sample-weighting-max-iter', type=int, default=150)
+
+    parser.add_argument('--baseline', default=None, help="An earlier output to compare the time per iteration to")
+    parser.add_argument('--threshold', type=float, default=1.25,
+                        help="Slowdown relative to the baseline that is reported as a regression")
+    parser.add_argument('--quick', action='store_true', help="Run a small sweep")
+
+    args = parser.parse_args(argv)
+
+    if args.quick:
+        # A smaller default sweep, which explicit arguments still override
+        parser.set_defaults(trials=2, dimensions=[10], samples_per_surface=[20], max_iter=1000, queries=4,
+                            students=[50], questions=[20], integration_points=[101], sample_weighting_max_iter=10)
+        args = parser.parse_args(argv)
+
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    results = []
+    if args.suite in ('convex_hull', 'all'):
+        names = set(CONVEX_HULL_OPTIMIZERS) | set(CONVEX_HULL_SOLVERS)
+        results += convex_hull_suite(args, names if args.optimizers is None else set(args.optimizers))
+
+    if args.suite in ('sample_weighting', 'all'):
+        names = set(SAMPLE_WEIGHTING_OPTIMIZERS)
+        results += sample_weighting_suite(args, names if args.optimizers is None else set(args.optimizers))
+
+    with open(args.output, 'w') as f:
+        json.dump({'metadata': metadata(args), 'results': results}, f, indent=2)
+
+    if args.baseline is not None:
+        with open(args.baseline) as f:
+            regressions = compare(json.load(f), results, threshold=args.threshold)
+
+        for result, ratio in regressions:
+            print(f"Regression: {result['suite']} {result['optimizer']} {result['params']} "
+                  f"trial {result['trial']} is {ratio:.2f}x slower per iteration")
+
+        return 1 if regressions else 0
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
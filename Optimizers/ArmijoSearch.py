@@ -25,7 +25,8 @@ class ArmijoSearch(ABC):
 
         return self.f(x_new) <= f_old + c1 * grad_old @ (x_new - x_old)
 
-    def backtracking_armijo_line_search(self, x, d, step_size, c1=1e-4, c2=0.5, max_iter=100):
+    def backtracking_armijo_line_search(self, x, d, step_size, c1=1e-4, c2=0.5, max_iter=100,
+                                        f0=None, grad0=None, out=None):
         """ Returns the step_size that satisfies the Armijo condition
 
             Parameters
@@ -40,19 +41,35 @@ class ArmijoSearch(ABC):
                 The amount to decrease the step_size at each iteration
             max_iter : int
                 The maximum number of steps to try
+            f0 : float, optional
+                The function evaluated at x, if already known
+            grad0 : np.ndarray, optional
+                The gradient of the function evaluated at x, if already known
+            out : np.ndarray, optional
+                A buffer that every trial point is written into, for optimizers whose `update` takes
+                `out`. Its contents afterwards are unspecified
         """
-        f0 = self.f(x)
-        grad0 = self.f(x, grad=True)
+        if f0 is None and grad0 is None:
+            f0, grad0 = self.value_and_grad(x)
+        f0 = self.f(x) if f0 is None else f0
+        grad0 = self.f(x, grad=True) if grad0 is None else grad0
+
+        def trial(step_size):
+            if out is None:
+                return self.update(x, d, step_size)
+            return self.update(x, d, step_size, out=out)
 
         count = 0
-        x_new = self.update(x, d, step_size)
+        x_new = trial(step_size)
 
         while (not self.armijo_condition(x, x_new, f_old=f0, grad_old=grad0, c1=c1)) and count < max_iter:
             step_size = step_size * c2
-            x_new = self.update(x, d, step_size)
+            x_new = trial(step_size)
 
             count += 1
 
+        self.telemetry.count('backtracks', count)
+
         if count == max_iter:
             if f0 < self.f(x_new):
                 return 0
@@ -64,6 +81,10 @@ class ArmijoSearch(ABC):
         """ The function to be minimised """
         pass
 
+    def value_and_grad(self, x):
+        """ Returns `f(x)` and `f(x, grad=True)`, which subclasses can override to share work between them """
+        return self.f(x), self.f(x, grad=True)
+
     @abstractmethod
     def update(self, x, d, step_size):
         """ Returns the new position according to the update rule """
@@ -0,0 +1,215 @@
+import numpy as np
+
+from Optimizers import ArmijoSearch, Optimizer
+from .ConvexHull import ConvexHull
+from Optimizers.utils import clip
+
+
+class AwayStepFrankWolfe(ConvexHull, ArmijoSearch, Optimizer):
+    """ Projection onto a convex hull using the Away-Step Frank-Wolfe Optimizer
+
+        Attributes
+        ----------
+        X : (n, d) np.ndarray
+            The n-points that make up the convex hull
+        y : (d, ) np.ndarray
+            The point to project into the hull
+        tol : float
+            The tolerance for the zero-set
+        G : (n, n) np.ndarray or None
+            The Gram matrix X X^T, if the objective is evaluated through it
+
+        Notes
+        -----
+        Each step either moves towards the vertex with the smallest gradient (a Frank-Wolfe step), or
+        away from the active vertex with the largest gradient (an away step), whichever has the larger
+        gap. Away steps can remove a vertex from the support entirely, which avoids the zig-zagging of
+        the plain Frank-Wolfe algorithm and gives linear convergence.
+
+        The active vertices are kept as an explicit list, which is carried between calls to `search`
+        when it is given the exact array it last returned.
+    """
+    def __init__(self, X, y, tol=None, gram="auto", incremental=False, refresh_every=100,
+                 dtype=None, chunk_size=None, n_threads=1, inplace=False):
+        """ Initialize Away-Step FW Optimizer Class
+
+            Parameters
+            ----------
+            X : (n, d) np.ndarray or str
+                The n-points that make up the convex hull, or the path to a `.npy` file
+            y : (d, ) np.ndarray
+                The point to project into the hull
+            tol : float, optional
+                The tolerance for the zero-set. Defaults to 1e-10, scaled to the precision of `dtype`
+            gram : bool, str or (n, n) np.ndarray
+                Whether to evaluate the objective through the Gram matrix X X^T. See `ConvexHull`
+            incremental : bool
+                If True, the residual is carried between calls to `search` and updated in O(d)
+                (or O(n) in Gram mode) rather than recomputed. See `ConvexHull`
+            refresh_every : int
+                Number of incremental updates between full recomputations of the residual
+            dtype : np.dtype, optional
+                The floating point type used for all arithmetic. See `ConvexHull`
+            chunk_size : int, optional
+                Number of rows of `X` per block when streaming products with `X`. See `ConvexHull`
+            n_threads : int
+                Number of threads used to process the row blocks. See `ConvexHull`
+            inplace : bool
+                If True, every array of size n is written into a preallocated workspace instead of
+                being allocated. See `ConvexHull`
+        """
+        ConvexHull.__init__(self, X, y, gram=gram, incremental=incremental,
+                            refresh_every=refresh_every, dtype=dtype, chunk_size=chunk_size,
+                            n_threads=n_threads, inplace=inplace)
+        self.tol = tol
+        self._active = None
+
+    def update(self, x, d, step_size, out=None):
+        """ Perform a step using the Away-Step FW scheme
+
+            Parameters
+            ----------
+            x : (n, ) np.ndarray
+                The starting point to take the step
+            d : tuple
+                2-tuple containing the vertex index, and whether the step is an away step
+            step_size : float
+            out : (n, ) np.ndarray, optional
+                If given, the new point is written into `out` instead of a new array
+
+            Returns
+            -------
+            (n, ) np.ndarray
+                The point after the step has been taken
+        """
+        index, away = d
+
+        if away:
+            w = (1 + step_size) * x if out is None else np.multiply(x, 1 + step_size, out=out)
+            w[index] -= step_size
+        else:
+            w = (1 - step_size) * x if out is None else np.multiply(x, 1 - step_size, out=out)
+            w[index] += step_size
+
+        return w
+
+    def search(self, x):
+        """ Perform a step using the Away-Step FW scheme using the optimal step size
+
+            Parameters
+            ----------
+            x : (n, ) np.ndarray
+                The starting point to take the step
+
+            Returns
+            -------
+            (n, ) np.ndarray
+                The point after the step has been taken
+
+            Notes
+            -----
+            The step size is determined through an exact line search
+        """
+        self.telemetry.begin()
+
+        residual, grad = self.residual_and_gradient(x)
+        self.record_gradient(x, grad)
+        self.telemetry.lap('gradient')
+
+        active = self.active_set(x)
+        s_index, v_index = self.frank_wolfe_pair(grad, active)
+
+        grad_x = grad @ x
+        if grad_x - grad[s_index] >= grad[v_index] - grad_x:
+            index, away = s_index, False
+            gap, max_step_size = grad_x - grad[s_index], 1
+        else:
+            index, away = v_index, True
+            gap, max_step_size = grad[v_index] - grad_x, x[v_index] / (1 - x[v_index])
+        self.telemetry.lap('direction')
+
+        if self.workspace is None:
+            image = residual + self.target_image
+        else:
+            image = np.add(residual, self.target_image, out=self.workspace.like('image', residual))
+        distance = self.vertex_distance(index, x, image)
+
+        # The direction is +-(e_index - x), so the Cauchy step is the gap over ||X[index] - x @ X||^2
+        cauchy_step_size = gap / distance if distance > 0 else 0
+        step_size = clip(cauchy_step_size, 0, max_step_size)
+        self.telemetry.lap('line_search')
+
+        out = None if self.workspace is None else self.workspace.output(x)
+        x_new = self.update(x, (index, away), step_size, out=out)
+        if away and step_size == max_step_size:
+            x_new[index] = 0
+
+        self._active = (x_new, self.updated_active_set(active, index, away, step_size, max_step_size))
+
+        if self.incremental:
+            self.carry_state(x_new, self.updated_residual(residual, image, index, away, step_size))
+        self.telemetry.lap('update')
+
+        self.telemetry.end(x, x_new, grad=grad, step_size=step_size, objective=lambda: self.objective(x, residual))
+
+        return x_new
+
+    def updated_residual(self, residual, image, index, away, step_size):
+        """ Returns the residual after a step towards, or away from, the vertex `index`, given the
+            residual and image at the start of the step
+        """
+        sign = -1 if away else 1
+
+        if self.workspace is None:
+            image_new = (1 - sign * step_size) * image + sign * step_size * self.image_rows(index)
+            return image_new - self.target_image
+
+        # The same arithmetic, written into the residual buffer that is not `residual`
+        scaled_row = np.multiply(self.image_rows(index), sign * step_size,
+                                 out=self.workspace.like('scaled_row', image))
+        image_new = np.multiply(image, 1 - sign * step_size, out=self.workspace.output(residual, name='residual'))
+        image_new += scaled_row
+
+        return np.subtract(image_new, self.target_image, out=image_new)
+
+    def active_set(self, x):
+        """ Returns the indices of the active vertices of `x`, reusing the carried list if possible """
+        if self._active is not None and self._active[0] is x:
+            return self._active[1]
+        return np.flatnonzero(x > self.tol)
+
+    @staticmethod
+    def updated_active_set(active, index, away, step_size, max_step_size):
+        """ Returns the active vertices after a step towards, or away from, the vertex `index` """
+        if step_size == 0:
+            return active
+
+        if away:
+            return active[active != index] if step_size == max_step_size else active
+        elif step_size == 1:
+            return np.array([index])
+        elif index not in active:
+            return np.append(active, index)
+
+        return active
+
+    @staticmethod
+    def frank_wolfe_pair(grad, active):
+        """ Returns the Frank-Wolfe vertex and the away vertex
+
+            Parameters
+            ----------
+            grad : (n, ) np.ndarray
+                Gradient at the current point
+            active : (k, ) np.ndarray
+                The indices of the active vertices
+
+            Returns
+            -------
+            tuple
+                Tuple containing the ('to', 'away') index pair
+        """
+        s_index = np.argmin(grad)
+        v_index = active[np.argmax(grad[active])]
+
+        return s_index, v_index
@@ -0,0 +1,128 @@
+import numpy as np
+
+from Optimizers import Optimizer
+from .BatchConvexHull import BatchConvexHull
+
+
+class BatchCauchySimplex(BatchConvexHull, Optimizer):
+    """ Projection of many points onto a convex hull using the Cauchy-Simplex Optimizer
+
+        Attributes
+        ----------
+        X : (n, d) np.ndarray
+            The n-points that make up the convex hull
+        Y : (k, d) np.ndarray
+            The k-points to project into the hull
+        tol : float
+            The tolerance for the zero-set
+        G : (n, n) np.ndarray or None
+            The Gram matrix X X^T, if the objective is evaluated through it
+    """
+    def __init__(self, X, Y, tol=None, gram="auto", refresh_every=100, dtype=None):
+        """ Initialize Batched Cauchy-Simplex Optimizer Class
+
+            Parameters
+            ----------
+            X : (n, d) np.ndarray
+                The n-points that make up the convex hull
+            Y : (k, d) np.ndarray
+                The k-points to project into the hull
+            tol : float, optional
+                The tolerance for the zero-set. Defaults to 1e-10, scaled to the precision of `dtype`
+            gram : bool, str or (n, n) np.ndarray
+                Whether to evaluate the objective through the Gram matrix X X^T. See `ConvexHull`
+            refresh_every : int
+                Number of iterations in `solve` between full recomputations of the residuals
+            dtype : np.dtype, optional
+                The floating point type used for all arithmetic. See `ConvexHull`
+        """
+        BatchConvexHull.__init__(self, X, Y, gram=gram, refresh_every=refresh_every, dtype=dtype)
+        self.tol = tol
+
+    def update(self, x, d, step_size):
+        """ Perform a step on each row using the Cauchy-Simplex scheme
+
+            Parameters
+            ----------
+            x : (k, n) np.ndarray
+                The starting points to take the step
+            d : (k, n) np.ndarray
+                The directions to take
+            step_size : (k, ) np.ndarray
+                The step size for each row
+
+            Returns
+            -------
+            (k, n) np.ndarray
+                The points after the step has been taken
+        """
+        z = x - step_size[:, None] * d
+        z[x < self.tol] = 0
+        z = z / np.sum(z, axis=1, keepdims=True)
+
+        # Rows with a single non-zero entry are already at a vertex
+        vertex = np.sum(x > 0, axis=1) == 1
+        z[vertex] = x[vertex]
+
+        return z
+
+    def step(self, W, residual, grad, rows=None):
+        """ Returns the new weights and residuals after a single Cauchy-Simplex step """
+        D = W * (grad - np.sum(grad * W, axis=1, keepdims=True))
+
+        max_step_size = self.max_step_size(W, grad, tol=self.tol, min_diff=self.min_step_diff)
+
+        D_image = self.image(D)
+        numerator = np.sum(D * grad, axis=1)
+        denominator = self.quadratic_form(D, image=D_image)
+
+        cauchy_step_size = np.divide(numerator, denominator, out=np.zeros_like(numerator),
+                                     where=denominator > 0)
+        step_size = np.clip(cauchy_step_size, 0, max_step_size)
+
+        W_new = self.update(W, D, step_size)
+
+        # The step is affine followed by a renormalisation, so the residual is updated with D @ X
+        target = self.target_image(rows)
+
+        Z = W - step_size[:, None] * D
+        zeroed = (W < self.tol) & (Z != 0)
+
+        image = residual + target - step_size[:, None] * D_image
+        if np.any(zeroed):
+            columns = np.any(zeroed, axis=0)
+            Z_zeroed = np.where(zeroed, Z, 0)[:, columns]
+
+            image -= Z_zeroed @ self.image_rows(columns)
+            Z[zeroed] = 0
+
+        residual_new = image / np.sum(Z, axis=1, keepdims=True) - target
+
+        vertex = np.sum(W > 0, axis=1) == 1
+        residual_new[vertex] = residual[vertex]
+
+        return W_new, residual_new
+
+    @staticmethod
+    def max_step_size(x, grad, tol=1e-10, min_diff=1e-6):
+        """ Compute the maximum step size of each row
+
+            Parameters
+            ----------
+            x : (k, n) np.ndarray
+                Points in the probability simplex
+            grad : (k, n) np.ndarray
+                Gradient at the points `x`
+            tol : float
+                Tolerance for the zero set
+            min_diff : float
+                Differences below this are treated as zero, giving a maximum step size of 1 / min_diff
+
+            Returns
+            -------
+            (k, ) np.ndarray
+        """
+        support = x > tol
+
+        diff = np.max(np.where(support, grad, -np.inf), axis=1) - np.sum(x * grad, axis=1)
+        return 1 / np.maximum(diff, min_diff)
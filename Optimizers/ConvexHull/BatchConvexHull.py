@@ -0,0 +1,289 @@
+import time
+
+import numpy as np
+
+from abc import ABC
+from abc import abstractmethod
+
+from .ConvexHull import ConvexHull
+from Optimizers.SolveResult import SolveResult
+from Optimizers.Telemetry import NullTelemetry
+from Optimizers.utils import as_dtype, dense_rows, dtype_tolerances
+
+
+class BatchConvexHull(ABC):
+    # Replaced by a `Telemetry` instance to record each iteration
+    telemetry = NullTelemetry()
+
+    def __init__(self, X, Y, gram="auto", refresh_every=100, dtype=None):
+        """ Projection of each row of `Y` onto the convex hull of the rows of `X`
+
+            Parameters
+            ----------
+            X : (n, d) np.ndarray or scipy.sparse matrix
+                The n-points that make up the convex hull
+            Y : (k, d) np.ndarray
+                The k-points to project into the hull
+            gram : bool, str or (n, n) np.ndarray
+                Whether to evaluate the objective through the Gram matrix X X^T. See `ConvexHull`
+            refresh_every : int
+                Number of iterations in `solve` between full recomputations of the residuals
+            dtype : np.dtype, optional
+                The floating point type used for all arithmetic. See `ConvexHull`
+
+            Notes
+            -----
+            The weights are stored as a (k, n) matrix, where row i are the weights for the query Y[i].
+            Methods that take `rows` operate on the block of queries Y[rows].
+        """
+        self.dtype = np.dtype(np.float64 if dtype is None else dtype)
+        self.X = as_dtype(X, dtype)
+        self.Y = as_dtype(Y, dtype)
+
+        self.G = as_dtype(ConvexHull._make_gram(self.X, gram), dtype)
+        self.XY = self.Y @ self.X.T if self.G is not None else None
+
+        self.refresh_every = refresh_every
+
+    @property
+    def use_gram(self):
+        return self.G is not None
+
+    @property
+    def tol(self):
+        """ The tolerance for the zero-set, which defaults to a value scaled to `dtype` """
+        tol = getattr(self, '_tol', None)
+        return dtype_tolerances(self.dtype)[0] if tol is None else tol
+
+    @tol.setter
+    def tol(self, tol):
+        self._tol = tol
+
+    @property
+    def min_step_diff(self):
+        """ The guard used by `max_step_size`, scaled to `dtype` """
+        return dtype_tolerances(self.dtype)[1]
+
+    def f(self, W, grad=False, rows=None):
+        """ Returns the objective of each row of `W`, or the (k, n) matrix of gradients """
+        residual = self.residual(W, rows=rows)
+
+        if grad:
+            return self.gradient(residual)
+        return self.objective(W, residual, rows=rows)
+
+    def __call__(self, W, grad=False, rows=None):
+        return self.f(W, grad=grad, rows=rows)
+
+    def image(self, W):
+        """ Returns W @ X, or W @ G in Gram mode """
+        if self.use_gram:
+            return W @ self.G
+        return W @ self.X
+
+    def image_rows(self, index):
+        """ Returns X[index], or G[index] in Gram mode """
+        if self.use_gram:
+            return self.G[index]
+        return dense_rows(self.X, index)
+
+    def target_image(self, rows=None):
+        target = self.XY if self.use_gram else self.Y
+        return target if rows is None else target[rows]
+
+    def residual(self, W, rows=None):
+        """ Returns W @ X - Y[rows], or the gradients W @ G - Y[rows] @ X.T in Gram mode """
+        self.telemetry.count('f_evals')
+        return self.image(W) - self.target_image(rows)
+
+    def gradient(self, residual):
+        self.telemetry.count('grad_evals')
+
+        if self.use_gram:
+            return residual
+        return residual @ self.X.T
+
+    def objective(self, W, residual, rows=None):
+        if self.use_gram:
+            Y = self.Y if rows is None else self.Y[rows]
+            return (np.sum(W * (residual - self.target_image(rows)), axis=1) + np.sum(Y ** 2, axis=1)) / 2
+        return np.sum(residual ** 2, axis=1) / 2
+
+    def quadratic_form(self, D, image=None):
+        """ Returns ||D[i] @ X||^2 for each row of `D` """
+        image = self.image(D) if image is None else image
+
+        if self.use_gram:
+            return np.sum(D * image, axis=1)
+        return np.sum(image ** 2, axis=1)
+
+    def pair_distance(self, s_index, v_index):
+        """ Returns ||X[s_index[i]] - X[v_index[i]]||^2 for each i """
+        if self.use_gram:
+            return self.G[s_index, s_index] - 2 * self.G[s_index, v_index] + self.G[v_index, v_index]
+
+        diff = dense_rows(self.X, s_index) - dense_rows(self.X, v_index)
+        return np.sum(diff ** 2, axis=1)
+
+    def search(self, W, rows=None):
+        """ Perform a single step on each row of `W`
+
+            Parameters
+            ----------
+            W : (k, n) np.ndarray
+                The weights of the block of queries Y[rows]
+            rows : np.ndarray, optional
+                The queries the rows of `W` belong to. Defaults to all queries
+
+            Returns
+            -------
+            (k, n) np.ndarray
+                The weights after the step has been taken
+        """
+        self.telemetry.begin()
+
+        residual = self.residual(W, rows=rows)
+        grad = self.gradient(residual)
+        self.telemetry.lap('gradient')
+
+        W_new, _ = self.step(W, residual, grad, rows=rows)
+        self.telemetry.lap('update')
+
+        self.telemetry.end(W, W_new, grad=grad, objective=lambda: self.objective(W, residual, rows=rows))
+
+        return W_new
+
+    def project(self, W, max_iter=1000, tol=1e-8):
+        """ Iterate until every row of `W` has converged
+
+            Parameters
+            ----------
+            W : (k, n) np.ndarray
+                The starting weights for each query
+            max_iter : int
+                The maximum number of iterations
+            tol : float
+                Tolerance on the Frank-Wolfe duality gap, `grad @ w - min(grad)`, which bounds the
+                sub-optimality of each row
+
+            Returns
+            -------
+            (k, n) np.ndarray
+                The weights for each query
+        """
+        return self.solve(W, max_iter=max_iter, stopping="GAP", tol=tol).w
+
+    def solve(self, W0, max_iter=1000, time_budget=None, stopping=None, tol=1e-6, check_every=1):
+        """ Iterate every row of `W0` until it meets a stopping condition, or a budget is met
+
+            Parameters
+            ----------
+            W0 : (k, n) np.ndarray
+                The starting weights for each query, assumed to be in the probability simplex
+            max_iter : int
+                The maximum number of iterations
+            time_budget : float, optional
+                The maximum wall time in seconds. Checked after every iteration
+            stopping : str, optional
+                The stopping condition, either 'KKT', 'KKTVAR' or 'GAP', checked on each row. If None,
+                only the budgets are used. See `Optimizer.solve`
+            tol : float
+                The tolerance for the stopping condition
+            check_every : int
+                The stopping condition is only checked every `check_every` iterations
+
+            Returns
+            -------
+            SolveResult
+                With the (k, n) weights, and the (k, ) objectives, iteration counts and statuses of
+                each query
+
+            Notes
+            -----
+            Converged rows are removed from the active block, so later iterations only perform
+            matrix products over the queries that are still running. The residuals of the active
+            block are carried between iterations and recomputed every `refresh_every` iterations.
+        """
+        from .KKTConditions.StoppingCondition import validate_batch_gradient_conditions
+
+        if stopping not in (None, "KKT", "KKTVAR", "GAP"):
+            raise ValueError("stopping_type can only be KKT, KKTVAR or GAP.")
+
+        start = time.perf_counter()
+        deadline = None if time_budget is None else start + time_budget
+
+        W = np.array(W0, dtype=self.dtype)
+        iterations = np.full(len(W), max_iter)
+        status = np.full(len(W), "max_iter", dtype=object)
+
+        rows = np.arange(len(W))
+        W_active = W
+        residual = self.residual(W_active)
+
+        count = 0
+        while count < max_iter:
+            self.telemetry.begin()
+
+            if count > 0 and count % self.refresh_every == 0:
+                residual = self.residual(W_active, rows=rows)
+
+            grad = self.gradient(residual)
+            self.telemetry.lap('gradient')
+            count += 1
+
+            if stopping is not None and count % check_every == 0:
+                converged = validate_batch_gradient_conditions(W_active, grad, tol=tol, e=self.tol,
+                                                               stopping_type=stopping)
+
+                if np.any(converged):
+                    W[rows[converged]] = W_active[converged]
+                    iterations[rows[converged]] = count
+                    status[rows[converged]] = "converged"
+
+                    if np.all(converged):
+                        rows = rows[:0]
+                        self.telemetry.end(W_active, W_active, grad=grad)
+                        break
+
+                    running = ~converged
+                    rows = rows[running]
+                    W_active, residual, grad = W_active[running], residual[running], grad[running]
+
+            W_old, residual_old = W_active, residual
+            W_active, residual = self.step(W_active, residual, grad, rows=rows)
+            self.telemetry.lap('update')
+
+            self.telemetry.end(W_old, W_active, grad=grad,
+                               objective=lambda: self.objective(W_old, residual_old, rows=rows))
+
+            if deadline is not None and time.perf_counter() >= deadline:
+                iterations[rows] = count
+                status[rows] = "time_budget"
+                break
+
+        W[rows] = W_active
+        return SolveResult(W, self.f(W), iterations, time.perf_counter() - start, status)
+
+    @abstractmethod
+    def step(self, W, residual, grad, rows=None):
+        """ Perform a single step on each row, given the residuals and gradients at `W`
+
+            Parameters
+            ----------
+            W : (k, n) np.ndarray
+                The weights of the block of queries Y[rows]
+            residual : (k, d) np.ndarray
+                The residuals of `W`, see `residual`
+            grad : (k, n) np.ndarray
+                The gradients of `W`, see `gradient`
+            rows : np.ndarray, optional
+                The queries the rows of `W` belong to. Defaults to all queries
+
+            Returns
+            -------
+            (k, n) np.ndarray
+                The weights after the step has been taken
+            (k, d) np.ndarray
+                The residuals of the new weights
+        """
+        pass
@@ -0,0 +1,113 @@
+import numpy as np
+
+from Optimizers import Optimizer
+from .BatchConvexHull import BatchConvexHull
+
+
+class BatchPairwiseFrankWolfe(BatchConvexHull, Optimizer):
+    """ Projection of many points onto a convex hull using the Pairwise Frank-Wolfe Optimizer
+
+        Attributes
+        ----------
+        X : (n, d) np.ndarray
+            The n-points that make up the convex hull
+        Y : (k, d) np.ndarray
+            The k-points to project into the hull
+        tol : float
+            The tolerance for the zero-set
+        G : (n, n) np.ndarray or None
+            The Gram matrix X X^T, if the objective is evaluated through it
+    """
+    def __init__(self, X, Y, tol=None, gram="auto", refresh_every=100, dtype=None):
+        """ Initialize Batched PFW Optimizer Class
+
+            Parameters
+            ----------
+            X : (n, d) np.ndarray
+                The n-points that make up the convex hull
+            Y : (k, d) np.ndarray
+                The k-points to project into the hull
+            tol : float, optional
+                The tolerance for the zero-set. Defaults to 1e-10, scaled to the precision of `dtype`
+            gram : bool, str or (n, n) np.ndarray
+                Whether to evaluate the objective through the Gram matrix X X^T. See `ConvexHull`
+            refresh_every : int
+                Number of iterations in `solve` between full recomputations of the residuals
+            dtype : np.dtype, optional
+                The floating point type used for all arithmetic. See `ConvexHull`
+        """
+        BatchConvexHull.__init__(self, X, Y, gram=gram, refresh_every=refresh_every, dtype=dtype)
+        self.tol = tol
+
+    def update(self, x, d, step_size):
+        """ Perform a step on each row using the PFW scheme
+
+            Parameters
+            ----------
+            x : (k, n) np.ndarray
+                The starting points to take the step
+            d : tuple
+                2-tuple containing the ('to', 'from') index arrays, one index per row
+            step_size : (k, ) np.ndarray
+                The step size for each row
+
+            Returns
+            -------
+            (k, n) np.ndarray
+                The points after the step has been taken
+        """
+        s_index, v_index = d
+        rows = np.arange(len(x))
+
+        w = x.copy()
+        alpha = w[rows, v_index]
+
+        w[rows, s_index] += step_size * alpha
+        w[rows, v_index] -= step_size * alpha
+
+        return w
+
+    def step(self, W, residual, grad, rows=None):
+        """ Returns the new weights and residuals after a single PFW step """
+        index = np.arange(len(W))
+        s_index, v_index = self.frank_wolfe_pair(W, grad, tol=self.tol)
+
+        alpha = W[index, v_index]
+        pair_distance = self.pair_distance(s_index, v_index)
+
+        numerator = grad[index, v_index] - grad[index, s_index]
+        denominator = alpha * pair_distance
+
+        cauchy_step_size = np.divide(numerator, denominator, out=np.zeros_like(numerator),
+                                     where=denominator > 0)
+        step_size = np.clip(cauchy_step_size, 0, 1)
+
+        W_new = self.update(W, (s_index, v_index), step_size)
+
+        pair_image = self.image_rows(s_index) - self.image_rows(v_index)
+        residual_new = residual + (step_size * alpha)[:, None] * pair_image
+
+        return W_new, residual_new
+
+    @staticmethod
+    def frank_wolfe_pair(x, grad, tol=1e-10):
+        """ Returns the 'from' and 'to' index pair of each row used in the PFW algorithm
+
+            Parameters
+            ----------
+            x : (k, n) np.ndarray
+                Points in the probability simplex
+            grad : (k, n) np.ndarray
+                Gradient at the points `x`
+            tol : float
+                Tolerance for the zero-set
+
+            Returns
+            -------
+            tuple
+                Tuple containing the ('to', 'from') index arrays
+        """
+        s_index = np.argmin(grad, axis=1)
+        v_index = np.argmax(np.where(x > tol, grad, -np.inf), axis=1)
+
+        return s_index, v_index
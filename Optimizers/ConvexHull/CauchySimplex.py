@@ -1,6 +1,6 @@
 import numpy as np
 
-from Optimizers import ArmijoSearch, Optimizer
+from Optimizers import ArmijoSearch, Optimizer, kernels
 from .ConvexHull import ConvexHull
 from Optimizers.utils import clip
 
@@ -16,23 +16,49 @@ class CauchySimplex(ConvexHull, ArmijoSearch, Optimizer):
             The point to project into the hull
         tol : float
             The tolerance for the zero-set
+        G : (n, n) np.ndarray or None
+            The Gram matrix X X^T, if the objective is evaluated through it
     """
-    def __init__(self, X, y, tol=1e-10):
+    def __init__(self, X, y, tol=None, gram="auto", incremental=False, refresh_every=100,
+                 dtype=None, chunk_size=None, n_threads=1, backend="numpy", inplace=False):
         """ Initialize Cauchy-Simplex Optimizer Class
 
             Parameters
             ----------
-            X : (n, d) np.ndarray
-                The n-points that make up the convex hull
+            X : (n, d) np.ndarray or str
+                The n-points that make up the convex hull, or the path to a `.npy` file
             y : (d, ) np.ndarray
                 The point to project into the hull
-            tol : float
-                The tolerance for the zero-set
+            tol : float, optional
+                The tolerance for the zero-set. Defaults to 1e-10, scaled to the precision of `dtype`
+            gram : bool, str or (n, n) np.ndarray
+                Whether to evaluate the objective through the Gram matrix X X^T. See `ConvexHull`
+            incremental : bool
+                If True, the residual is carried between calls to `search` and updated in O(d)
+                (or O(n) in Gram mode) rather than recomputed. See `ConvexHull`
+            refresh_every : int
+                Number of incremental updates between full recomputations of the residual
+            dtype : np.dtype, optional
+                The floating point type used for all arithmetic. See `ConvexHull`
+            chunk_size : int, optional
+                Number of rows of `X` per block when streaming products with `X`. See `ConvexHull`
+            n_threads : int
+                Number of threads used to process the row blocks. See `ConvexHull`
+            backend : str
+                Either "numpy" or "numba". The Numba backend computes the maximum step size and the
+                update with compiled single-pass kernels, when `chunk_size` is not given. It falls back
+                to NumPy with a warning if Numba is not installed
+            inplace : bool
+                If True, every array of size n is written into a preallocated workspace instead of
+                being allocated. See `ConvexHull`
         """
-        ConvexHull.__init__(self, X, y)
+        ConvexHull.__init__(self, X, y, gram=gram, incremental=incremental,
+                            refresh_every=refresh_every, dtype=dtype, chunk_size=chunk_size,
+                            n_threads=n_threads, inplace=inplace)
         self.tol = tol
+        self.backend = kernels.resolve_backend(backend)
 
-    def update(self, x, d, step_size):
+    def update(self, x, d, step_size, out=None):
         """ Perform a step using the Cauchy-Simplex scheme
 
             Parameters
@@ -42,19 +68,37 @@ class CauchySimplex(ConvexHull, ArmijoSearch, Optimizer):
             d : (n, ) np.ndarray
                 The direction to take
             step_size : float
+            out : (n, ) np.ndarray, optional
+                If given, the new point is written into `out` instead of a new array
 
             Returns
             -------
             (n, ) np.ndarray
                 The point after the step has been taken
         """
-        if np.sum(x > 0) == 1:
+        if self.chunk_size is not None:
+            return self._blocked_update(x, d, step_size, out=out)
+        elif self.backend == "numba":
+            z = np.empty(len(x), dtype=np.result_type(x, d)) if out is None else out
+            return z if kernels.cauchy_simplex_update(x, d, step_size, self.tol, z) else x
+
+        if np.count_nonzero(x) == 1:
             return x
 
-        z = x - step_size * d
-        z[x < self.tol] = 0
+        if out is None:
+            z = x - step_size * d
+            z[x < self.tol] = 0
+
+            return z / np.sum(z)
 
-        return z / np.sum(z)
+        # The same arithmetic as above, but without temporaries
+        zero_set = None if self.workspace is None else self.workspace.like('mask', x, dtype=bool)
+
+        np.multiply(d, -step_size, out=out)
+        np.add(out, x, out=out)
+        np.copyto(out, 0, where=np.less(x, self.tol, out=zero_set))
+
+        return np.divide(out, np.sum(out), out=out)
 
     def search(self, x, gamma=1):
         """ Perform a step using the Cauchy-Simplex scheme using the optimal step size
@@ -76,18 +120,148 @@ class CauchySimplex(ConvexHull, ArmijoSearch, Optimizer):
             -----
             The step size is determined through a line search
         """
-        grad = self.f(x, grad=True)
-        d = x * (grad - grad @ x)
+        self.telemetry.begin()
+
+        if self.chunk_size is None or self.use_gram:
+            residual, grad = self.residual_and_gradient(x)
+            self.telemetry.lap('gradient')
 
-        max_step_size = self.max_step_size(x, grad, tol=self.tol) * gamma
-        
-        cauchy_step_size = d @ grad / np.sum((d @ self.X) ** 2)
+            d = self.direction(x, grad, grad @ x)
+            d_image = self.image(d, out=self.buffer('d_image', self.target_image.shape, d))
+        else:
+            # grad @ x = residual @ (x @ X) is known before the gradient, so the pass over X that
+            # computes the gradient can also compute d @ X
+            residual = self.residual_at(x)
+            grad_x = residual @ (residual + self.y)
+
+            grad, d_image = self.gradient(residual, weights=x, shift=grad_x, out=self.buffer('grad', x.shape, x))
+            self.cache_gradient(x, residual, grad)
+            self.telemetry.lap('gradient')
+
+            d = self.direction(x, grad, grad_x)
+
+        self.record_gradient(x, grad)
+        self.telemetry.lap('direction')
+
+        if self.chunk_size is not None:
+            max_step_size = self._blocked_max_step_size(x, grad) * gamma
+        elif self.backend == "numba":
+            max_step_size = kernels.max_step_size(x, grad, self.tol, self.min_step_diff) * gamma
+        else:
+            support = None if self.workspace is None else self.workspace.like('mask', x, dtype=bool)
+            max_step_size = self.max_step_size(x, grad, tol=self.tol, min_diff=self.min_step_diff,
+                                               support=support) * gamma
+
+        quadratic_form = self.quadratic_form(d, image=d_image)
+        cauchy_step_size = d @ grad / quadratic_form if quadratic_form > 0 else 0
 
         step_size = clip(cauchy_step_size, 0, max_step_size)
-        return self.update(x, d, step_size)
+        self.telemetry.lap('line_search')
+
+        out = None if self.workspace is None else self.workspace.output(x, dtype=d.dtype)
+        x_new = self.update(x, d, step_size, out=out)
+
+        if self.incremental and x_new is not x:
+            self.carry_state(x_new, self.updated_residual(x, d, step_size, residual, d_image))
+        self.telemetry.lap('update')
+
+        self.telemetry.end(x, x_new, grad=grad, step_size=step_size, objective=lambda: self.objective(x, residual))
+
+        return x_new
+
+    def updated_residual(self, x, d, step_size, residual, d_image):
+        """ Returns the residual after the Cauchy-Simplex step, without recomputing `x @ X`
+
+            Parameters
+            ----------
+            x : (n, ) np.ndarray
+                The starting point of the step
+            d : (n, ) np.ndarray
+                The direction of the step
+            step_size : float
+            residual : np.ndarray
+                The residual at `x`
+            d_image : np.ndarray
+                The image of the direction, `self.image(d)`
+
+            Returns
+            -------
+            np.ndarray
+                The residual at `self.update(x, d, step_size)`
+
+            Notes
+            -----
+            The step is affine in `x` followed by a renormalisation, so the image of the new point is
+            a rescaling of `image(x) - step_size * image(d)`. Entries in the zero-set that were not
+            already zero are removed with a correction over those entries only.
+        """
+        target = self.target_image
+
+        if self.workspace is None:
+            z = x - step_size * d
+            zeroed = (x < self.tol) & (z != 0)
+
+            image = residual + target - step_size * d_image
+        else:
+            # The same arithmetic, with the new residual written into the residual buffer that is not
+            # `residual`, as `residual` is still needed until the end of `search`
+            z = np.subtract(x, np.multiply(d, step_size, out=self.workspace.like('z', d)),
+                            out=self.workspace.like('z', d))
+            zeroed = np.less(x, self.tol, out=self.workspace.like('mask', x, dtype=bool))
+            zeroed &= np.not_equal(z, 0, out=self.workspace.like('nonzero', x, dtype=bool))
+
+            scaled_image = np.multiply(d_image, step_size, out=self.workspace.like('scaled_image', d_image))
+            image = np.add(residual, target, out=self.workspace.output(residual, name='residual'))
+            image -= scaled_image
+
+        if np.any(zeroed):
+            image = image - z[zeroed] @ self.image_rows(zeroed)
+            z[zeroed] = 0
+
+        image /= np.sum(z)
+        image -= target
+        return image
+
+    def _blocked_update(self, x, d, step_size, out=None):
+        z = np.empty(len(x), dtype=np.result_type(x, d)) if out is None else out
+
+        def block_update(index):
+            x_block = x[index]
+            z_block = z[index]
+
+            np.subtract(x_block, step_size * d[index], out=z_block)
+            z_block[x_block < self.tol] = 0
+            return np.count_nonzero(x_block > 0), np.sum(z_block)
+
+        counts, sums = zip(*self.map_blocks(block_update, rows_only=True))
+        if sum(counts) == 1:
+            return x
+
+        total = sum(sums)
+        self.map_blocks(lambda index: np.divide(z[index], total, out=z[index]), rows_only=True)
+
+        return z
+
+    def _blocked_max_step_size(self, x, grad):
+        def block_reductions(index):
+            x_block, grad_block = x[index], grad[index]
+            return np.max(grad_block, where=x_block > self.tol, initial=-np.inf), x_block @ grad_block
+
+        maxima, products = zip(*self.map_blocks(block_reductions, rows_only=True))
+
+        diff = max(maxima) - sum(products)
+        return 1 / diff if diff > self.min_step_diff else 1 / self.min_step_diff
+
+    def direction(self, x, grad, grad_x):
+        """ Returns the Cauchy-Simplex direction x * (grad - grad @ x), given `grad_x = grad @ x` """
+        if self.workspace is None:
+            return x * (grad - grad_x)
+
+        d = self.buffer('direction', x.shape, x, grad)
+        return np.multiply(x, np.subtract(grad, grad_x, out=d), out=d)
 
     @staticmethod
-    def max_step_size(x, grad, tol=1e-10):
+    def max_step_size(x, grad, tol=1e-10, min_diff=1e-6, support=None):
         """ Compute the maximum step size
 
             Parameters
@@ -98,12 +272,16 @@ class CauchySimplex(ConvexHull, ArmijoSearch, Optimizer):
                 Gradient at the point `x`
             tol : float
                 Tolerance for the zero set
+            min_diff : float
+                Differences below this are treated as zero, giving a maximum step size of 1 / min_diff
+            support : (n, ) np.ndarray of bool, optional
+                A buffer to write the support `x > tol` into
 
             Returns
             -------
             float
         """
-        support = x > tol
+        support = np.greater(x, tol, out=support)
 
-        diff = np.max(grad[support]) - x @ grad
-        return 1 / diff if diff > 1e-6 else 1e6
+        diff = np.max(grad, where=support, initial=-np.inf) - x @ grad
+        return 1 / diff if diff > min_diff else 1 / min_diff
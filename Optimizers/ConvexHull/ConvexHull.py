@@ -1,14 +1,383 @@
+import copy
+import os
+
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from scipy import sparse
+
+from Optimizers.Workspace import Workspace
+from Optimizers.utils import as_dtype, dense_rows, dtype_tolerances
+
+
 class ConvexHull:
-    def __init__(self, X, y):
-        self.X = X
+    def __init__(self, X, y, gram="auto", incremental=False, refresh_every=100, dtype=None,
+                 chunk_size=None, n_threads=1, inplace=False):
+        """ Projection of `y` onto the convex hull of the rows of `X`
+
+            Parameters
+            ----------
+            X : (n, d) np.ndarray, scipy.sparse matrix, np.memmap or str
+                The n-points that make up the convex hull. Sparse matrices (preferably CSR) are never
+                densified, apart from the individual rows needed by the PFW step. A path to a `.npy`
+                file is opened as a read-only memory-map
+            y : (d, ) np.ndarray
+                The point to project into the hull
+            gram : bool, str or (n, n) np.ndarray
+                If True, the Gram matrix G = X X^T is precomputed and the objective, gradient and
+                step sizes are evaluated in O(n^2) with no dependence on d. If "auto", the Gram matrix
+                is used when n <= d, or when n^2 is at most the number of non-zeros of a sparse `X`,
+                as the Gram matrix is dense. A precomputed (n, n) Gram matrix can also be given, which allows
+                a single Gram matrix to be shared across many targets `y`
+            incremental : bool
+                If True, the residual (and gradient) is carried between calls to `search` and updated
+                with low-rank updates, instead of being recomputed from scratch
+            refresh_every : int
+                Number of incremental updates after which the residual is recomputed from scratch,
+                to limit the accumulation of floating point drift
+            dtype : np.dtype, optional
+                The floating point type used for all arithmetic, e.g. np.float32. `X` and `y` are
+                cast to it, and the default zero-set tolerances are scaled to its precision. If not
+                given, `X` is left as is and float64 tolerances are used
+            chunk_size : int, optional
+                If given, products with `X` stream over blocks of `chunk_size` rows, so `X` never
+                needs to be fully in memory. This also turns on `incremental`, so that each gradient
+                reads `X` exactly once. Defaults to blocks of about 64MB for memory-maps, and no
+                chunking otherwise
+            n_threads : int
+                If larger than 1, the row blocks are processed by a pool of this many threads, so it
+                only has an effect with chunking. The blocks only depend on `chunk_size`, and partial
+                results are merged in block order, so the results do not depend on the number of threads
+            inplace : bool
+                If True, the optimizer owns a `Workspace` of preallocated arrays, and the gradient,
+                residual and iterates are written into it instead of newly allocated arrays. For dense
+                `X` the steady-state iterations then allocate nothing of size n. The returned points
+                are reused by later calls to `search`, see `Workspace`
+
+            Notes
+            -----
+            The carried state is only reused when `search` is given the exact array it last returned.
+            Modifying that array in-place between calls invalidates the state.
+
+            Memory-mapped `X` is never cast to `dtype` as a whole; instead each block is cast as it
+            is read.
+
+            With `n_threads > 1`, each block product is a small BLAS call, so the BLAS library is
+            best limited to a single thread (e.g. `OPENBLAS_NUM_THREADS=1`) to avoid oversubscription.
+        """
+        if isinstance(X, (str, os.PathLike)):
+            X = np.load(X, mmap_mode='r')
+
+        if chunk_size is None and isinstance(X, np.memmap):
+            chunk_size = max(1, 2 ** 26 // (X.shape[1] * X.itemsize))
+
+        self.dtype = np.dtype(np.float64 if dtype is None else dtype)
+        self._cast_dtype = dtype
+
+        self.X = X if isinstance(X, np.memmap) else as_dtype(X, dtype)
+        self.chunk_size = chunk_size
+
+        self.n_threads = n_threads
+        self._executor = None
+
+        self.workspace = Workspace() if inplace else None
+
+        self.G = as_dtype(self._make_gram(self.X, gram), dtype)
+        self.set_target(y)
+
+        self.incremental = incremental or chunk_size is not None
+        self.refresh_every = refresh_every
+
+    @property
+    def use_gram(self):
+        return self.G is not None
+
+    @property
+    def tol(self):
+        """ The tolerance for the zero-set, which defaults to a value scaled to `dtype` """
+        tol = getattr(self, '_tol', None)
+        return dtype_tolerances(self.dtype)[0] if tol is None else tol
+
+    @tol.setter
+    def tol(self, tol):
+        self._tol = tol
+
+    @property
+    def min_step_diff(self):
+        """ The guard used by `max_step_size`, scaled to `dtype` """
+        return dtype_tolerances(self.dtype)[1]
+
+    def astype(self, dtype):
+        """ Returns a copy of the hull with its arrays cast to `dtype` """
+        hull = copy.copy(self)
+
+        hull.dtype = np.dtype(dtype)
+        hull._cast_dtype = dtype
+        hull.X = self.X if isinstance(self.X, np.memmap) else as_dtype(self.X, dtype)
+        hull.G = as_dtype(self.G, dtype)
+        hull.set_target(self.y)
+
+        if self.workspace is not None:
+            hull.workspace = Workspace()
+
+        return hull
+
+    def set_target(self, y):
+        """ Change the point to be projected, keeping the Gram matrix (if any). `y` is cast to `dtype` """
+        y = as_dtype(np.asarray(y), self.dtype)
         self.y = y
 
+        if self.use_gram:
+            self.Xy = self.X @ y
+            self.yy = y @ y
+
+        self.reset_state()
+
     def f(self, x, grad=False):
-        z = x @ self.X - self.y
+        residual = self.residual(x)
 
         if grad:
-            return z @ self.X.T
-        return (z @ z) / 2
+            return self.gradient(residual)
+        return self.objective(x, residual)
 
     def __call__(self, x, grad=False):
         return self.f(x, grad=grad)
+
+    def blocks(self):
+        """ Yields the row slices of X used for chunked products """
+        n = self.X.shape[0]
+        for start in range(0, n, self.chunk_size):
+            yield slice(start, min(start + self.chunk_size, n))
+
+    def map_blocks(self, func, rows_only=False):
+        """ Returns `[func(index, X[index]) for each block]`, in block order
+
+            If `rows_only`, `func` is only given the row slice. The blocks are processed in parallel
+            when `n_threads > 1`.
+        """
+        if rows_only:
+            task = func
+        else:
+            def task(index):
+                return func(index, as_dtype(self.X[index], self._cast_dtype))
+
+        if self.n_threads <= 1:
+            return [task(index) for index in self.blocks()]
+
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.n_threads)
+        return list(self._executor.map(task, self.blocks()))
+
+    def close(self):
+        """ Shut down the thread pool, if one was started """
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def image(self, x, out=None):
+        """ Returns x @ X, or x @ G in Gram mode. `x` can also be a stack of points
+
+            If given, the image is written into `out`, unless `X` is sparse or chunked
+        """
+        if self.use_gram:
+            return x @ self.G if out is None else np.matmul(x, self.G, out=out)
+        elif self.chunk_size is not None:
+            return sum(self.map_blocks(lambda index, X_block: x[..., index] @ X_block))
+        elif out is None or sparse.issparse(self.X):
+            return x @ self.X
+        return np.matmul(x, self.X, out=out)
+
+    def image_rows(self, index):
+        """ Returns the images of the basis vectors at `index`, that is X[index] or G[index] """
+        if self.use_gram:
+            return self.G[index]
+        return as_dtype(dense_rows(self.X, index), self._cast_dtype)
+
+    @property
+    def target_image(self):
+        """ The image of the target, that is y, or X @ y in Gram mode """
+        return self.Xy if self.use_gram else self.y
+
+    def residual(self, x, out=None):
+        """ Returns x @ X - y, or the gradient x @ G - X @ y in Gram mode, written into `out` if possible """
+        self.telemetry.count('f_evals')
+
+        image = self.image(x, out=out)
+        if out is not None and image is out:
+            return np.subtract(image, self.target_image, out=out)
+        return image - self.target_image
+
+    def gradient(self, residual, weights=None, shift=0, out=None):
+        """ Returns the gradient given the residual of a point
+
+            If `weights` is given, `(weights * (grad - shift)) @ X` is also returned. In chunked mode
+            both are computed in the same pass over `X`. If given, the gradient is written into `out`,
+            unless `X` is sparse or the residual already is the gradient (Gram mode).
+        """
+        self.telemetry.count('grad_evals')
+
+        if self.use_gram:
+            grad = residual
+        elif self.chunk_size is not None:
+            return self._blocked_gradient(residual, weights, shift, out=out)
+        elif out is None or sparse.issparse(self.X):
+            grad = residual @ self.X.T
+        else:
+            grad = np.matmul(residual, self.X.T, out=out)
+
+        if weights is None:
+            return grad
+        return grad, self.image(weights * (grad - shift))
+
+    def _blocked_gradient(self, residual, weights=None, shift=0, out=None):
+        grad = np.empty(self.X.shape[0], dtype=np.result_type(residual, self.dtype)) if out is None else out
+
+        def block_gradient(index, X_block):
+            grad[index] = X_block @ residual
+            if weights is not None:
+                return (weights[index] * (grad[index] - shift)) @ X_block
+
+        weighted_images = self.map_blocks(block_gradient)
+
+        if weights is None:
+            return grad
+        return grad, sum(weighted_images)
+
+    def objective(self, x, residual):
+        """ Returns the objective given a point and its residual """
+        if self.use_gram:
+            return (x @ residual - x @ self.Xy + self.yy) / 2
+        return (residual @ residual) / 2
+
+    def quadratic_form(self, d, image=None):
+        """ Returns ||d @ X||^2, where `image` is the optional precomputed `self.image(d)` """
+        image = self.image(d) if image is None else image
+
+        if self.use_gram:
+            return d @ image
+        return image @ image
+
+    def pair_distance(self, i, j):
+        """ Returns ||X[i] - X[j]||^2 """
+        if self.use_gram:
+            return self.G[i, i] - 2 * self.G[i, j] + self.G[j, j]
+
+        diff = self.image_rows(i) - self.image_rows(j)
+        return diff @ diff
+
+    def vertex_distance(self, i, x, image):
+        """ Returns ||X[i] - x @ X||^2, where `image` is the precomputed `self.image(x)` """
+        if self.use_gram:
+            return self.G[i, i] - 2 * image[i] + x @ image
+
+        diff = self.image_rows(i) - image
+        return diff @ diff
+
+    def lipschitz_constant(self, n_iter=100, rtol=1e-4):
+        """ Returns an estimate of the Lipschitz constant of the gradient, the largest eigenvalue of G
+
+            The estimate is made by power iteration, using X X^T v = X @ (v @ X), so G is never formed.
+            Each iteration is a full pass over X, so the iteration stops once the estimate changes by
+            less than `rtol`. The estimate approaches the eigenvalue from below.
+        """
+        v = np.ones(self.X.shape[0], dtype=self.dtype)
+        v /= np.linalg.norm(v)
+
+        eigenvalue = 0
+        for _ in range(n_iter):
+            w = self.gradient(self.image(v))
+            previous, eigenvalue = eigenvalue, np.linalg.norm(w)
+            if eigenvalue == 0 or eigenvalue - previous <= rtol * eigenvalue:
+                break
+            v = w / eigenvalue
+
+        return eigenvalue
+
+    def default_step_size(self):
+        """ Returns the projected gradient step 1 / L, with L inflated by 1% as its estimate is from below """
+        return 1 / (1.01 * self.lipschitz_constant())
+
+    def residual_at(self, x):
+        """ Returns the residual at `x`, reusing the carried state when possible """
+        if self._state is not None and self._state[0] is x:
+            return self._state[1]
+
+        residual = self.residual(x, out=self.buffer('residual', self.target_image.shape, x))
+
+        if self.incremental:
+            self._state = (x, residual, None)
+            self._state_count = 0
+
+        return residual
+
+    def residual_and_gradient(self, x):
+        """ Returns the residual and gradient at `x`, reusing the carried state when possible """
+        residual = self.residual_at(x)
+
+        if self._state is not None and self._state[0] is x and self._state[2] is not None:
+            return residual, self._state[2]
+
+        grad = self.gradient(residual, out=self.buffer('grad', x.shape, residual))
+        self.cache_gradient(x, residual, grad)
+
+        return residual, grad
+
+    def buffer(self, name, shape, *arrays):
+        """ Returns the workspace array `name`, with the result type of `arrays` and `X`, or None if the
+            optimizer is not `inplace`
+        """
+        if self.workspace is None:
+            return None
+
+        data = self.G if self.use_gram else self.X
+        data_dtype = data.dtype if self._cast_dtype is None else self.dtype
+
+        dtype = np.result_type(*(array.dtype for array in arrays), data_dtype, self.target_image.dtype)
+        return self.workspace.get(name, shape, dtype)
+
+    def cache_gradient(self, x, residual, grad):
+        """ Store the gradient at `x` alongside its carried residual """
+        if self.incremental:
+            self._state = (x, residual, grad)
+
+    def carry_state(self, x, residual):
+        """ Store the residual of the point `x` to be used by the next call to `search` """
+        if not self.incremental:
+            return
+
+        self._state_count += 1
+        if self._state_count >= self.refresh_every:
+            self._state = None
+        else:
+            self._state = (x, residual, None)
+
+    def reset_state(self):
+        """ Discard the carried residual and gradient """
+        self._state = None
+        self._state_count = 0
+
+    @staticmethod
+    def gram_matrix(X):
+        """ Returns the Gram matrix X X^T, which can be shared between hulls with the same points """
+        G = X @ X.T
+        return G.toarray() if sparse.issparse(G) else G
+
+    @staticmethod
+    def _make_gram(X, gram):
+        if isinstance(gram, str):
+            if gram != "auto":
+                raise ValueError("gram can only be True, False, 'auto' or a precomputed Gram matrix.")
+
+            # The dense Gram matrix costs n^2 per product, against n d for dense X or nnz for sparse X
+            n, d = X.shape
+            gram = n * n <= X.nnz if sparse.issparse(X) else n <= d
+
+        if gram is None or isinstance(gram, (bool, np.bool_)):
+            return ConvexHull.gram_matrix(X) if gram else None
+
+        G = np.asarray(gram)
+        if G.shape != (X.shape[0], X.shape[0]):
+            raise ValueError(f"Expected a Gram matrix of shape {(X.shape[0], X.shape[0])}, got {G.shape}.")
+
+        return G
@@ -0,0 +1,76 @@
+class DaskCluster:
+    """ Runs the workers of a `DistributedSolver` as actors on a Dask distributed cluster
+
+        Each object is created on one Dask worker as an actor, and its methods are called in place,
+        so the rows of X stay on that worker. It has the same interface as `LocalCluster`.
+
+        Attributes
+        ----------
+        client : dask.distributed.Client
+            The client connected to the cluster
+        n_workers : int
+            The number of Dask workers
+
+        Notes
+        -----
+        Requires `dask.distributed`, which is an optional dependency
+
+            >>> from dask.distributed import Client
+            >>> with DistributedSolver(X, cluster=DaskCluster(Client('scheduler:8786'))) as solver:
+            ...     result = solver.solve(y)
+    """
+    def __init__(self, client):
+        """ Initialize the Dask Cluster
+
+            Parameters
+            ----------
+            client : dask.distributed.Client or str
+                A client, or the address of the scheduler to connect to
+        """
+        try:
+            from dask.distributed import Client
+        except ImportError as error:
+            raise ImportError("DaskCluster requires dask.distributed, which can be installed with "
+                              "`pip install dask[distributed]`.") from error
+
+        self.client = Client(client) if isinstance(client, str) else client
+        self._owns_client = isinstance(client, str)
+
+        self._workers = list(self.client.scheduler_info()['workers'])
+        self._actors = []
+
+    @property
+    def n_workers(self):
+        return len(self._workers)
+
+    def start(self, factory, args):
+        """ Create the object `factory(*args[i])` as an actor on Dask worker i """
+        if len(args) > self.n_workers:
+            raise ValueError(f"Got {len(args)} workers, but the cluster only has {self.n_workers}.")
+
+        futures = [self.client.submit(factory, *worker_args, actor=True, workers=[worker], pure=False)
+                   for worker, worker_args in zip(self._workers, args)]
+        self._actors = [future.result() for future in futures]
+
+    def call(self, method, *args):
+        """ Call `method(*args)` on every actor, and return the results in worker order """
+        return self.call_each(method, [args] * len(self._actors))
+
+    def call_each(self, method, args):
+        """ Call `method(*args[i])` on actor i, and return the results in worker order """
+        futures = [getattr(actor, method)(*worker_args) for actor, worker_args in zip(self._actors, args)]
+        return [future.result() for future in futures]
+
+    def stop(self):
+        self._actors = []
+
+    def close(self):
+        self.stop()
+        if self._owns_client:
+            self.client.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
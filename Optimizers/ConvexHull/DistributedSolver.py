@@ -0,0 +1,255 @@
+import os
+import time
+
+import numpy as np
+
+from Optimizers import SolveResult
+from Optimizers.utils import clip, dtype_tolerances
+from .CauchySimplex import CauchySimplex
+from .HullPartition import HullPartition
+from .LocalCluster import LocalCluster
+from .PairwiseFrankWolfe import PairwiseFrankWolfe
+
+
+class DistributedSolver:
+    """ Projection onto a convex hull whose points are partitioned across the workers of a cluster
+
+        The rows of `X`, and the matching weights, are split into contiguous blocks that each live on
+        one worker. In every iteration the workers return their partial images `w_i @ X_i`, which are
+        summed into the residual `w @ X - y`. The residual is sent back to each worker, which computes
+        its slice of the gradient `X_i @ residual` and returns a handful of reductions over it. The step
+        is chosen from these reductions, so each iteration exchanges O(d) numbers with each worker,
+        rather than O(n) or O(n d).
+
+        Attributes
+        ----------
+        X : (n, d) np.ndarray, scipy.sparse matrix or str
+            The n-points that make up the convex hull, or the path to a `.npy` file
+        cluster : LocalCluster or DaskCluster
+            The cluster the partitions live on
+        optimizer : class
+            Either `CauchySimplex` or `PairwiseFrankWolfe`
+        tol : float
+            The tolerance for the zero-set
+        refresh_every : int
+            Pairwise Frank-Wolfe updates the residual from the two rows it moves mass between, and
+            recomputes it from the partial images every `refresh_every` iterations to bound the drift
+
+        Notes
+        -----
+        A cluster created by the solver is stopped by `close`, so the solver should be used as a
+        context manager
+
+            >>> with DistributedSolver(X, n_workers=8) as solver:
+            ...     result = solver.solve(y, max_iter=1000, stopping="GAP")
+    """
+    def __init__(self, X, cluster=None, n_workers=None, optimizer=CauchySimplex, tol=1e-10, refresh_every=100):
+        """ Initialize the Distributed Solver
+
+            Parameters
+            ----------
+            X : (n, d) np.ndarray, scipy.sparse matrix or str
+                The n-points that make up the convex hull. A path to a `.npy` file is memory-mapped by
+                each worker, so X is never sent over the cluster
+            cluster : LocalCluster or DaskCluster, optional
+                The cluster to place the partitions on. Defaults to a `LocalCluster` that is owned,
+                and closed, by the solver
+            n_workers : int, optional
+                The number of partitions. Defaults to the number of workers of the cluster
+            optimizer : class
+                Either `CauchySimplex` or `PairwiseFrankWolfe`
+            tol : float
+                The tolerance for the zero-set
+            refresh_every : int
+                The number of Pairwise Frank-Wolfe iterations between exact residuals
+        """
+        if optimizer not in (CauchySimplex, PairwiseFrankWolfe):
+            raise ValueError("optimizer can only be CauchySimplex or PairwiseFrankWolfe.")
+
+        self.optimizer = optimizer
+        self.tol = tol
+        self.refresh_every = refresh_every
+
+        self._owns_cluster = cluster is None
+        if cluster is None:
+            cluster = LocalCluster(os.cpu_count() if n_workers is None else n_workers)
+        self.cluster = cluster
+
+        if isinstance(X, (str, os.PathLike)):
+            self.X = os.fspath(X)
+            n = np.load(self.X, mmap_mode='r').shape[0]
+        else:
+            self.X = X
+            n = X.shape[0]
+        self.n = n
+
+        n_workers = cluster.n_workers if n_workers is None else n_workers
+        bounds = np.linspace(0, n, min(n_workers, n) + 1).astype(int)
+        self.slices = [slice(start, stop) for start, stop in zip(bounds[:-1], bounds[1:])]
+
+        if isinstance(self.X, str):
+            cluster.start(HullPartition.from_file, [(self.X, s.start, s.stop) for s in self.slices])
+        else:
+            cluster.start(HullPartition, [(self.X[s], s.start) for s in self.slices])
+
+        self.min_step_diff = dtype_tolerances(np.float64)[1]
+
+    def solve(self, y, w0=None, max_iter=1000, time_budget=None, stopping=None, tol=1e-6, check_every=1, gamma=1):
+        """ Project `y` onto the hull
+
+            Parameters
+            ----------
+            y : (d, ) np.ndarray
+                The point to project into the hull
+            w0 : (n, ) np.ndarray, optional
+                The starting point. Defaults to the centroid weights for Cauchy-Simplex, and the first
+                vertex for Pairwise Frank-Wolfe
+            max_iter, time_budget, stopping, tol, check_every
+                See `Optimizer.solve`. The stopping conditions are evaluated from the reductions
+                returned by the workers, so they are checked on the whole gradient without gathering it
+            gamma : float
+                The percent of the maximum step size that can be taken by Cauchy-Simplex
+
+            Returns
+            -------
+            SolveResult
+                The weights are gathered from the workers once, at the end of the solve
+        """
+        if stopping not in (None, "KKT", "KKTVAR", "GAP"):
+            raise ValueError("stopping_type can only be KKT, KKTVAR or GAP.")
+
+        start = time.perf_counter()
+        deadline = None if time_budget is None else start + time_budget
+
+        y = np.asarray(y, dtype=np.float64)
+        if w0 is None:
+            w0 = np.ones(self.n) / self.n if self.optimizer is CauchySimplex else np.eye(1, self.n, 0)[0]
+        self.cluster.call_each('set_weights', [(w0[s],) for s in self.slices])
+
+        residual = self.residual(y)
+
+        status = "max_iter"
+        count = 0
+        while count < max_iter:
+            summary = self.gradient(residual)
+
+            if stopping is not None and (count + 1) % check_every == 0:
+                if self.check_stopping(summary, stopping, tol):
+                    count += 1
+                    status = "converged"
+                    break
+
+            if self.optimizer is CauchySimplex:
+                residual = self.cauchy_simplex_step(summary, y, gamma)
+            else:
+                residual = self.pairwise_frank_wolfe_step(summary, residual)
+                if (count + 1) % self.refresh_every == 0:
+                    residual = self.residual(y)
+            count += 1
+
+            if deadline is not None and time.perf_counter() >= deadline:
+                status = "time_budget"
+                break
+
+        w = np.concatenate(self.cluster.call('weights'))
+        return SolveResult(w, (residual @ residual) / 2, count, time.perf_counter() - start, status)
+
+    def residual(self, y):
+        """ The residual `w @ X - y`, from the partial images of the workers """
+        return sum(self.cluster.call('image')) - y
+
+    def gradient(self, residual):
+        """ Returns the reductions of the gradient over all the workers, see `HullPartition.gradient` """
+        summaries = self.cluster.call('gradient', residual, self.tol, self.tol)
+
+        # min and max return the first optimum, so ties go to the lowest index as in np.argmin
+        s = min(summaries, key=lambda summary: summary['min'])
+        v = max(summaries, key=lambda summary: summary['max'])
+
+        return {
+            'grad_x': sum(summary['grad_x'] for summary in summaries),
+            'grad_grad_x': sum(summary['grad_grad_x'] for summary in summaries),
+            'min': s['min'],
+            'argmin': s['argmin'],
+            'max': v['max'],
+            'argmax': v['argmax'],
+            'weight': v['weight'],
+            'support_min': min(summary['support_min'] for summary in summaries),
+            'support_max': max(summary['support_max'] for summary in summaries),
+            'active_min': min(summary['active_min'] for summary in summaries),
+        }
+
+    def cauchy_simplex_step(self, summary, y, gamma=1):
+        """ Take a Cauchy-Simplex step, and return the new residual """
+        grad_x = summary['grad_x']
+
+        diff = summary['max'] - grad_x
+        max_step_size = (1 / diff if diff > self.min_step_diff else 1 / self.min_step_diff) * gamma
+
+        directions = self.cluster.call('direction', grad_x)
+        d_grad = sum(d_grad for d_grad, _ in directions)
+        d_image = sum(image for _, image in directions)
+
+        quadratic_form = d_image @ d_image
+        cauchy_step_size = d_grad / quadratic_form if quadratic_form > 0 else 0
+        step_size = clip(cauchy_step_size, 0, max_step_size)
+
+        steps = self.cluster.call('step', step_size, self.tol)
+        support_size = sum(size for size, _ in steps)
+        total = sum(step_sum for _, step_sum in steps)
+
+        # A single non-zero weight is a vertex, which the Cauchy-Simplex step leaves unchanged
+        return sum(self.cluster.call('normalise', None if support_size == 1 else total)) - y
+
+    def pairwise_frank_wolfe_step(self, summary, residual):
+        """ Take a Pairwise Frank-Wolfe step, and return the new residual """
+        s_index, v_index = summary['argmin'], summary['argmax']
+        alpha = summary['weight']
+
+        rows = {}
+        for partition_rows in self.cluster.call('rows', (s_index, v_index)):
+            rows.update(partition_rows)
+        pair_image = rows[s_index] - rows[v_index]
+
+        pair_distance = pair_image @ pair_image
+        if pair_distance > 0:
+            cauchy_step_size = (summary['max'] - summary['min']) / (alpha * pair_distance)
+        else:
+            cauchy_step_size = 0
+        step_size = clip(cauchy_step_size, 0, 1)
+
+        mass = step_size * alpha
+        self.cluster.call('move', s_index, v_index, mass)
+
+        # Mass only moves between two indices, so the residual has a rank-2 update
+        return residual + mass * pair_image
+
+    @staticmethod
+    def check_stopping(summary, stopping, tol):
+        """ The stopping conditions of `validate_gradient_conditions`, from the reductions of the gradient """
+        if stopping == "GAP":
+            return summary['grad_x'] - summary['min'] < tol
+
+        if stopping == "KKT":
+            if summary['support_max'] == -np.inf:
+                return False
+            valid = summary['support_max'] - summary['support_min'] < tol
+            b = -(summary['support_max'] + summary['support_min']) / 2
+
+            # The non-active gradients are within tol / 2 of -b, so the active set check is made over all of grad
+            return valid and summary['min'] + b > -tol
+
+        grad_x = summary['grad_x']
+        valid = summary['grad_grad_x'] - grad_x ** 2 < tol ** 2
+        return valid and summary['active_min'] - grad_x > -tol
+
+    def close(self):
+        """ Stop the cluster, if it was created by the solver """
+        if self._owns_cluster:
+            self.cluster.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
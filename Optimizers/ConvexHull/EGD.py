@@ -13,20 +13,54 @@ class EGD(ConvexHull, ArmijoSearch, Optimizer):
             The n-points that make up the convex hull
         y : (d, ) np.ndarray
             The point to project into the hull
+        G : (n, n) np.ndarray or None
+            The Gram matrix X X^T, if the objective is evaluated through it
     """
-    def __init__(self, X, y):
+    def __init__(self, X, y, gram="auto", incremental=False, refresh_every=100, dtype=None,
+                 chunk_size=None, n_threads=1, line_search="armijo", inplace=False):
         """ Initialize EGD Optimizer Class
 
             Parameters
             ----------
-            X : (n, d) np.ndarray
-                The n-points that make up the convex hull
+            X : (n, d) np.ndarray or str
+                The n-points that make up the convex hull, or the path to a `.npy` file
             y : (d, ) np.ndarray
                 The point to project into the hull
+            gram : bool, str or (n, n) np.ndarray
+                Whether to evaluate the objective through the Gram matrix X X^T. See `ConvexHull`
+            incremental : bool
+                If True, the residual at the point returned by `search` is carried to the next call,
+                rather than recomputed. See `ConvexHull`
+            refresh_every : int
+                Number of carried residuals between full recomputations of the residual
+            dtype : np.dtype, optional
+                The floating point type used for all arithmetic. See `ConvexHull`
+            chunk_size : int, optional
+                Number of rows of `X` per block when streaming products with `X`. See `ConvexHull`
+            n_threads : int
+                Number of threads used to process the row blocks. See `ConvexHull`
+            line_search : str
+                Either 'armijo' for a backtracking line search, or 'newton' for an exact minimisation
+                of the objective along the exponentiated gradient curve using Newton's method
+            inplace : bool
+                If True, the iterates, the gradient and the points along the Newton line search are
+                written into a preallocated workspace instead of being allocated. See `ConvexHull`
+
+            Notes
+            -----
+            Every Newton iteration needs a single (fused) product of three vectors with `X` or `G`, and
+            the residual at the final point is exact, so with `incremental=True` an iteration typically
+            costs the gradient and two or three such products. The Armijo line search needs one product
+            per trial step, which is O(n^2) rather than O(nd) in Gram mode.
         """
-        ConvexHull.__init__(self, X, y)
+        if line_search not in ("armijo", "newton"):
+            raise ValueError("line_search can only be 'armijo' or 'newton'.")
+
+        ConvexHull.__init__(self, X, y, gram=gram, incremental=incremental, refresh_every=refresh_every,
+                            dtype=dtype, chunk_size=chunk_size, n_threads=n_threads, inplace=inplace)
+        self.line_search = line_search
 
-    def update(self, x, d, step_size):
+    def update(self, x, d, step_size, out=None):
         """ Perform a step using the EGD scheme
 
             Parameters
@@ -36,14 +70,26 @@ class EGD(ConvexHull, ArmijoSearch, Optimizer):
             d : (n, ) np.ndarray
                 The direction to take
             step_size : float
+            out : (n, ) np.ndarray, optional
+                If given, the new point is written into `out` instead of a new array
 
             Returns
             -------
             (n, ) np.ndarray
                 The point after the step has been taken
         """
-        z = x * np.exp(-step_size * d)
-        return z / np.sum(z)
+        # Shifting d does not change the normalised point, but stops the exponential from overflowing
+        if out is None:
+            z = x * np.exp(-step_size * (d - np.min(d)))
+            return z / np.sum(z)
+
+        # The same arithmetic as above, but without temporaries
+        z = np.subtract(d, np.min(d), out=out)
+        z *= -step_size
+        np.exp(z, out=z)
+        z *= x
+
+        return np.divide(z, np.sum(z), out=z)
 
     def search(self, x, step_size=1, c1=1e-4, c2=0.5, max_iter=100):
         """ Perform a step using the EGD scheme using the optimal step size
@@ -53,13 +99,13 @@ class EGD(ConvexHull, ArmijoSearch, Optimizer):
             x : (n, ) np.ndarray
                 The starting point to take the step
             step_size : float
-                The maximum candidate step size
+                The maximum candidate step size for the Armijo line search
             c1 : float
                 Parameter for the armijo line search
             c2 : float
                 Parameter for the armijo line search
             max_iter : int
-                Maximum iterations for the armijo line search
+                Maximum iterations for the line search
 
             Returns
             -------
@@ -68,10 +114,166 @@ class EGD(ConvexHull, ArmijoSearch, Optimizer):
 
             Notes
             -----
-            The step size is determined through an Armijo line search
+            The step size is determined through the line search chosen by `line_search`
         """
-        d = self.f(x, grad=True)
-        step_size = self.backtracking_armijo_line_search(x, d, step_size,
-                                                         c1=c1, c2=c2, max_iter=max_iter)
+        if self.line_search == "newton":
+            return self.newton_search(x, max_iter=max_iter)
+
+        self.telemetry.begin()
+
+        residual, d = self.residual_and_gradient(x)
+        self.record_gradient(x, d)
+        self.telemetry.lap('gradient')
+
+        f0 = self.objective(x, residual)
+        out = None if self.workspace is None else self.workspace.output(x, dtype=d.dtype)
+        step_size = self.backtracking_armijo_line_search(x, d, step_size, c1=c1, c2=c2, max_iter=max_iter,
+                                                         f0=f0, grad0=d, out=out)
+        self.telemetry.lap('line_search')
+
+        x_new = self.update(x, d, step_size, out=out)
+        self.telemetry.lap('update')
+
+        self.telemetry.end(x, x_new, grad=d, step_size=step_size, objective=lambda: f0)
+
+        return x_new
+
+    def newton_search(self, x, max_iter=100, rtol=1e-3):
+        """ Perform a step using the EGD scheme, with the step size minimising the objective
+
+            Parameters
+            ----------
+            x : (n, ) np.ndarray
+                The starting point to take the step
+            max_iter : int
+                Maximum number of Newton iterations
+            rtol : float
+                The Newton iterations stop once the change in the step size is below `rtol` times the
+                step size
+
+            Returns
+            -------
+            (n, ) np.ndarray
+                The point after the step has been taken
+
+            Notes
+            -----
+            Along the curve x(t) = x exp(-t grad) / Z(t), with c = grad - grad @ x(t),
+                x'(t) = -x(t) c    and    x''(t) = x(t) (c^2 - x(t) @ c^2)
+            so the first two derivatives of the objective at t follow from the images of x(t), x'(t)
+            and x''(t). At t = 0 the last term reduces to sum(x c^3), which is known from the gradient.
+        """
+        self.telemetry.begin()
+
+        if self.chunk_size is None or self.use_gram:
+            residual, grad = self.residual_and_gradient(x)
+            self.telemetry.lap('gradient')
+
+            grad_x = grad @ x
+            d_image = None
+        else:
+            # As in Cauchy-Simplex, the image of x * centred is computed in the same pass as the gradient
+            residual = self.residual_at(x)
+            grad_x = residual @ (residual + self.y)
+
+            grad, d_image = self.gradient(residual, weights=x, shift=grad_x, out=self.buffer('grad', x.shape, x))
+            self.cache_gradient(x, residual, grad)
+            self.telemetry.lap('gradient')
+
+        self.record_gradient(x, grad)
+
+        if self.workspace is None:
+            centred = grad - grad_x
+            d = x * centred
+            cubed = centred ** 3
+        else:
+            centred = np.subtract(grad, grad_x, out=self.workspace.like('centred', grad))
+            d = np.multiply(x, centred, out=self.workspace.like('direction', centred))
+            cubed = np.power(centred, 3, out=self.workspace.like('cubed', centred))
+
+        if d_image is None:
+            d_image = self.image(d, out=self.buffer('d_image', self.target_image.shape, d))
+
+        derivative = -(d @ grad)
+        second_derivative = self.quadratic_form(d, image=d_image) + x @ cubed
+        self.telemetry.lap('direction')
+
+        f0 = self.objective(x, residual)
+        if derivative >= 0:
+            self.telemetry.end(x, x, grad=grad, step_size=0, objective=lambda: f0)
+            return x
+
+        t = -derivative / second_derivative if second_derivative > 0 else 1
+
+        # The minimum is bracketed by [lower, upper], and Newton steps outside of it are replaced by
+        # bisection, or doubling while no upper bound is known
+        lower, upper = 0, np.inf
+        if self.workspace is None:
+            out, residual_out = None, None
+        else:
+            # The residual at `x` is carried with it, so the residuals along the curve go in the other buffer
+            out = self.workspace.output(x, dtype=grad.dtype)
+            residual_out = self.workspace.output(residual, name='residual')
+
+        for _ in range(max_iter):
+            x_t = self.update(x, grad, t, out=out)
+            residual_t, derivative, second_derivative = self.curve_derivatives(x_t, grad, out=residual_out)
+            self.telemetry.count('f_evals')
+
+            if derivative == 0 and second_derivative > 0:
+                break
+            elif derivative < 0:
+                lower = t
+            else:
+                upper = t
+
+            t_new = t - derivative / second_derivative if second_derivative > 0 else np.inf
+            if not lower < t_new < upper:
+                t_new = (lower + upper) / 2 if upper < np.inf else 2 * t
+
+            if abs(t_new - t) <= rtol * t:
+                break
+            t = t_new
+        self.telemetry.lap('line_search')
+
+        if self.objective(x_t, residual_t) > f0:
+            x_t, t = x, 0
+        elif self.incremental:
+            self.carry_state(x_t, residual_t)
+        self.telemetry.lap('update')
+
+        self.telemetry.end(x, x_t, grad=grad, step_size=t, objective=lambda: f0)
+
+        return x_t
+
+    def curve_derivatives(self, x, grad, out=None):
+        """ Returns the residual at `x(t)`, and the first two derivatives of the objective along the
+            exponentiated gradient curve, where `x` is the point `x(t)` on the curve. With `inplace`, the
+            residual is written into `out`
+        """
+        if self.workspace is None:
+            centred = grad - grad @ x
+            dx = -x * centred
+            ddx = x * (centred ** 2 - x @ centred ** 2)
+
+            images = self.image(np.stack([x, dx, ddx]))
+            residual = images[0] - self.target_image
+        else:
+            # The same arithmetic, with the three points written into the rows of one workspace array
+            curve = self.workspace.get('curve', (3,) + x.shape, np.result_type(x, grad))
+            _, dx, ddx = curve
+            curve[0] = x
+
+            centred = np.subtract(grad, grad @ x, out=self.workspace.like('centred', grad))
+            np.negative(np.multiply(x, centred, out=dx), out=dx)
+            np.square(centred, out=ddx)
+            ddx -= x @ ddx
+            ddx *= x
+
+            images = self.image(curve, out=self.buffer('curve_image', (3,) + self.target_image.shape, curve))
+
+            residual = np.subtract(images[0], self.target_image, out=out)
 
-        return self.update(x, d, step_size)
+        if self.use_gram:
+            return residual, dx @ residual, dx @ images[1] + ddx @ residual
+        return residual, residual @ images[1], images[1] @ images[1] + residual @ images[2]
@@ -0,0 +1,143 @@
+import math
+
+import numpy as np
+
+from Optimizers import Optimizer
+from .ConvexHull import ConvexHull
+from Optimizers.utils import project_onto_standard_simplex
+
+
+class FISTA(ConvexHull, Optimizer):
+    """ Projection onto a convex hull using the accelerated projected gradient method FISTA
+
+        Attributes
+        ----------
+        X : (n, d) np.ndarray
+            The n-points that make up the convex hull
+        y : (d, ) np.ndarray
+            The point to project into the hull
+        G : (n, n) np.ndarray or None
+            The Gram matrix X X^T, if the objective is evaluated through it
+        step_size : float
+            The gradient step taken before projecting onto the simplex
+        restart : bool
+            Whether the momentum is reset when it points uphill
+
+        Notes
+        -----
+        The gradient is evaluated at the extrapolated point, which is carried between calls to `search`
+        together with the momentum parameter when `search` is given the exact array it last returned.
+        Otherwise the momentum starts again from `x`.
+
+        As the gradient is not evaluated at the iterate, every stopping check made by `solve` costs one
+        gradient evaluation, unless the momentum was just reset. Passing `check_every` to `solve`
+        amortises this, e.g. `check_every=10` adds a tenth of a gradient per iteration.
+    """
+    def __init__(self, X, y, step_size=None, restart=True, gram="auto", dtype=None, chunk_size=None,
+                 n_threads=1, inplace=False):
+        """ Initialize FISTA Optimizer Class
+
+            Parameters
+            ----------
+            X : (n, d) np.ndarray or str
+                The n-points that make up the convex hull, or the path to a `.npy` file
+            y : (d, ) np.ndarray
+                The point to project into the hull
+            step_size : float, optional
+                The gradient step taken before projecting onto the simplex. Defaults to slightly less
+                than 1 / L, where L is the Lipschitz constant of the gradient
+            restart : bool
+                If True, the momentum is reset whenever it points uphill (gradient adaptive restart)
+            gram : bool, str or (n, n) np.ndarray
+                Whether to evaluate the objective through the Gram matrix X X^T. See `ConvexHull`
+            dtype : np.dtype, optional
+                The floating point type used for all arithmetic. See `ConvexHull`
+            chunk_size : int, optional
+                Number of rows of `X` per block when streaming products with `X`. See `ConvexHull`
+            n_threads : int
+                Number of threads used to process the row blocks. See `ConvexHull`
+            inplace : bool
+                If True, every array of size n, including the extrapolated point, is written into a
+                preallocated workspace instead of being allocated. See `ConvexHull`
+        """
+        ConvexHull.__init__(self, X, y, gram=gram, dtype=dtype, chunk_size=chunk_size, n_threads=n_threads,
+                            inplace=inplace)
+        self.step_size = self.default_step_size() if step_size is None else step_size
+        self.restart = restart
+
+        self._momentum = None
+
+    def update(self, x, d, step_size, out=None):
+        """ Perform a projected gradient step
+
+            Parameters
+            ----------
+            x : (n, ) np.ndarray
+                The starting point to take the step
+            d : (n, ) np.ndarray
+                The direction to take
+            step_size : float
+            out : (n, ) np.ndarray, optional
+                If given, the new point is written into `out` instead of a new array
+
+            Returns
+            -------
+            (n, ) np.ndarray
+                The point after the step has been taken
+        """
+        if out is None:
+            return project_onto_standard_simplex(x - step_size * d)
+
+        step = np.subtract(x, np.multiply(d, step_size, out=out), out=out)
+        return project_onto_standard_simplex(step, out=out)
+
+    def search(self, x):
+        """ Perform a FISTA step
+
+            Parameters
+            ----------
+            x : (n, ) np.ndarray
+                The current iterate
+
+            Returns
+            -------
+            (n, ) np.ndarray
+                The next iterate
+        """
+        self.telemetry.begin()
+
+        if self._momentum is not None and self._momentum[0] is x:
+            _, z, t = self._momentum
+        else:
+            z, t = x, 1
+
+        _, grad = self.residual_and_gradient(z)
+        self.record_gradient(z, grad)
+        self.telemetry.lap('gradient')
+
+        out = None if self.workspace is None else self.workspace.output(x, dtype=np.result_type(z, grad))
+        x_new = self.update(z, grad, self.step_size, out=out)
+        t_new = (1 + math.sqrt(1 + 4 * t ** 2)) / 2
+        self.telemetry.lap('update')
+
+        if self.workspace is None:
+            step = x_new - x
+        else:
+            step = np.subtract(x_new, x, out=self.workspace.like('step', x_new))
+
+        if self.restart and grad @ step > 0:
+            z_new, t_new = x_new, 1
+        elif self.workspace is None:
+            z_new = x_new + ((t - 1) / t_new) * step
+        else:
+            # `z` is still needed for the objective, so the other extrapolation buffer is used
+            z_new = np.multiply(step, (t - 1) / t_new, out=self.workspace.output(z, name='extrapolated'))
+            z_new += x_new
+
+        self._momentum = (x_new, z_new, t_new)
+        self.telemetry.lap('direction')
+
+        # The gradient is at the extrapolated point, so the gap and objective are recorded there
+        self.telemetry.end(z, x_new, grad=grad, step_size=self.step_size, objective=lambda: self.f(z))
+
+        return x_new
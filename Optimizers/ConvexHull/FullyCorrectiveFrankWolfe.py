@@ -0,0 +1,162 @@
+import numpy as np
+
+from .AwayStepFrankWolfe import AwayStepFrankWolfe
+from .CauchySimplex import CauchySimplex
+from Optimizers.utils import as_dtype
+
+
+class FullyCorrectiveFrankWolfe(AwayStepFrankWolfe):
+    """ Projection onto a convex hull using the Fully-Corrective Frank-Wolfe Optimizer
+
+        Away-Step FW steps are taken, and every `correct_every` steps the weights are re-optimised over
+        the active vertices only, using Cauchy-Simplex on the sub-hull they span.
+
+        Attributes
+        ----------
+        X : (n, d) np.ndarray
+            The n-points that make up the convex hull
+        y : (d, ) np.ndarray
+            The point to project into the hull
+        tol : float
+            The tolerance for the zero-set
+        G : (n, n) np.ndarray or None
+            The Gram matrix X X^T, if the objective is evaluated through it
+        correct_every : int
+            The number of steps between corrections
+        corrective_iter : int
+            The maximum number of Cauchy-Simplex iterations in each correction
+    """
+    def __init__(self, X, y, tol=None, gram="auto", incremental=False, refresh_every=100,
+                 dtype=None, chunk_size=None, n_threads=1, correct_every=10, corrective_iter=100,
+                 inplace=False):
+        """ Initialize Fully-Corrective FW Optimizer Class
+
+            Parameters
+            ----------
+            X : (n, d) np.ndarray or str
+                The n-points that make up the convex hull, or the path to a `.npy` file
+            y : (d, ) np.ndarray
+                The point to project into the hull
+            tol : float, optional
+                The tolerance for the zero-set. Defaults to 1e-10, scaled to the precision of `dtype`
+            gram : bool, str or (n, n) np.ndarray
+                Whether to evaluate the objective through the Gram matrix X X^T. See `ConvexHull`
+            incremental : bool
+                If True, the residual is carried between calls to `search` and updated in O(d)
+                (or O(n) in Gram mode) rather than recomputed. See `ConvexHull`
+            refresh_every : int
+                Number of incremental updates between full recomputations of the residual
+            dtype : np.dtype, optional
+                The floating point type used for all arithmetic. See `ConvexHull`
+            chunk_size : int, optional
+                Number of rows of `X` per block when streaming products with `X`. See `ConvexHull`
+            n_threads : int
+                Number of threads used to process the row blocks. See `ConvexHull`
+            correct_every : int
+                The number of steps between corrections
+            corrective_iter : int
+                The maximum number of Cauchy-Simplex iterations in each correction
+            inplace : bool
+                If True, every array of size n is written into a preallocated workspace instead of
+                being allocated. See `ConvexHull`
+        """
+        AwayStepFrankWolfe.__init__(self, X, y, tol=tol, gram=gram, incremental=incremental,
+                                    refresh_every=refresh_every, dtype=dtype, chunk_size=chunk_size,
+                                    n_threads=n_threads, inplace=inplace)
+        self.correct_every = correct_every
+        self.corrective_iter = corrective_iter
+
+        self._steps = 0
+        self._corrector = None
+        self._corrector_active = None
+
+    def search(self, x):
+        """ Perform an Away-Step FW step, followed by a correction every `correct_every` steps
+
+            Parameters
+            ----------
+            x : (n, ) np.ndarray
+                The starting point to take the step
+
+            Returns
+            -------
+            (n, ) np.ndarray
+                The point after the step has been taken
+        """
+        self.telemetry.begin()
+
+        x_new = AwayStepFrankWolfe.search(self, x)
+
+        self._steps += 1
+        if self._steps % self.correct_every == 0:
+            # The corrected point is written over neither `x` nor `x_new`, whose residual may be carried
+            out = None if self.workspace is None else self.workspace.output(x, name='corrected')
+            x_new = self.correct(x_new, out=out)
+            self.telemetry.lap('correction')
+
+        self.telemetry.end(x, x_new)
+
+        return x_new
+
+    def correct(self, x, out=None):
+        """ Re-optimise the weights of `x` over its active vertices
+
+            Parameters
+            ----------
+            x : (n, ) np.ndarray
+                A point in the probability simplex
+            out : (n, ) np.ndarray, optional
+                If given, the re-optimised point is written into `out` instead of a new array. It must
+                not be `x`
+
+            Returns
+            -------
+            (n, ) np.ndarray
+                The re-optimised point, whose support is contained in the support of `x`
+        """
+        active = self.active_set(x)
+
+        optimizer = self.corrector(active)
+        w_active = optimizer.solve(x[active] / np.sum(x[active]), max_iter=self.corrective_iter).w
+
+        keep = w_active > self.tol
+        active = active[keep]
+
+        if out is None:
+            w = np.zeros_like(x)
+        else:
+            w = out
+            w.fill(0)
+        w[active] = w_active[keep] / np.sum(w_active[keep])
+
+        self._active = (w, active)
+        return w
+
+    def corrector(self, active):
+        """ Returns the Cauchy-Simplex optimizer used by `correct`, restricted to the points `active`
+
+            The optimizer is created once, and re-sliced to the active points for every correction whose
+            active points differ from the last. It shares the telemetry of this optimizer, so the work of
+            the corrections is recorded in the steps that make them.
+        """
+        optimizer = self._corrector
+        # A copy made by `astype` shares the corrector, which is then of the wrong dtype
+        if optimizer is None or optimizer.dtype != self.dtype:
+            optimizer = CauchySimplex(self.X[active], self.y, tol=self.tol, gram=False, dtype=self._cast_dtype,
+                                      inplace=self.workspace is not None)
+            self._corrector = optimizer
+            self._corrector_active = None
+
+        if not np.array_equal(active, self._corrector_active):
+            optimizer.X = as_dtype(self.X[active], self._cast_dtype)
+            if self.use_gram:
+                optimizer.G = self.G[np.ix_(active, active)]
+            else:
+                optimizer.G = as_dtype(optimizer._make_gram(optimizer.X, "auto"), self._cast_dtype)
+            optimizer.set_target(self.y)
+            self._corrector_active = active
+
+        optimizer.tol = self.tol
+        optimizer.telemetry = self.telemetry
+
+        return optimizer
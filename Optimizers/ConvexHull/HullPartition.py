@@ -0,0 +1,130 @@
+import numpy as np
+
+from Optimizers.utils import dense_rows
+
+
+class HullPartition:
+    """ The rows of X, and the matching weights, held by one worker of a `DistributedSolver`
+
+        Every method takes and returns O(d) data, or scalars, except `set_weights` and `weights`,
+        which are only used at the start and end of a solve. The gradient and direction of the last
+        iteration are kept on the worker between calls.
+
+        Attributes
+        ----------
+        X : (n_i, d) np.ndarray or scipy.sparse matrix
+            The rows of X held by this worker
+        offset : int
+            The index of the first row of this partition in X
+        w : (n_i, ) np.ndarray
+            The weights of these rows
+    """
+    def __init__(self, X, offset=0):
+        self.X = X
+        self.offset = offset
+
+        self.w = None
+        self._grad = None
+        self._d = None
+        self._z = None
+
+    @classmethod
+    def from_file(cls, path, start, stop):
+        """ Memory-map rows `start:stop` of a `.npy` file """
+        return cls(np.load(path, mmap_mode='r')[start:stop], offset=start)
+
+    def __len__(self):
+        return self.X.shape[0]
+
+    def set_weights(self, w):
+        self.w = np.asarray(w, dtype=np.float64)
+
+    def weights(self):
+        return self.w
+
+    def image(self):
+        """ Returns the partial image `w_i @ X_i` """
+        return self.w @ self.X
+
+    def gradient(self, residual, tol=1e-10, e=1e-10):
+        """ Computes the gradient slice `X_i @ residual`, and returns its reductions
+
+            Parameters
+            ----------
+            residual : (d, ) np.ndarray
+                The residual `w @ X - y`
+            tol : float
+                The tolerance for the zero-set used by the step
+            e : float
+                The tolerance for the zero-set used by the stopping conditions
+
+            Returns
+            -------
+            dict
+                grad_x, grad_grad_x : `grad @ w` and `grad ** 2 @ w` over this partition
+                min, argmin : the smallest gradient and its index in X
+                max, argmax, weight : the largest gradient over `w > tol`, its index in X and its weight
+                support_min, support_max : the range of the gradient over `w > e`
+                active_min : the smallest gradient over `w <= e`
+        """
+        grad = self.X @ residual
+        self._grad = grad
+
+        w = self.w
+        support = w > tol
+
+        s = int(np.argmin(grad))
+        masked = np.where(support, grad, -np.inf)
+        v = int(np.argmax(masked))
+
+        stopping_support = w > e
+
+        return {
+            'grad_x': float(grad @ w),
+            'grad_grad_x': float(np.einsum('i,i,i->', grad, grad, w)),
+            'min': float(grad[s]),
+            'argmin': self.offset + s,
+            'max': float(masked[v]),
+            'argmax': self.offset + v,
+            'weight': float(w[v]),
+            'support_min': float(np.min(grad, where=stopping_support, initial=np.inf)),
+            'support_max': float(np.max(grad, where=stopping_support, initial=-np.inf)),
+            'active_min': float(np.min(grad, where=~stopping_support, initial=np.inf)),
+        }
+
+    def direction(self, grad_x):
+        """ Computes the Cauchy-Simplex direction `w * (grad - grad_x)`, and returns `d @ grad` and `d @ X_i` """
+        d = self.w * (self._grad - grad_x)
+        self._d = d
+
+        return float(d @ self._grad), d @ self.X
+
+    def step(self, step_size, tol=1e-10):
+        """ Computes the unnormalised Cauchy-Simplex step, and returns the support size of `w` and the sum
+            of the step
+        """
+        z = self.w - step_size * self._d
+        z[self.w < tol] = 0
+        self._z = z
+
+        return int(np.count_nonzero(self.w > 0)), float(np.sum(z))
+
+    def normalise(self, total):
+        """ Divides the step by `total`, the sum over all partitions, and returns the new partial image.
+            If `total` is None the step is discarded
+        """
+        if total is not None:
+            self.w = self._z / total
+        self._z = None
+
+        return self.image()
+
+    def rows(self, indices):
+        """ Returns the rows of X, given as indices into X, that are held by this partition """
+        return {i: dense_rows(self.X, i - self.offset) for i in indices if 0 <= i - self.offset < len(self)}
+
+    def move(self, to_index, from_index, mass):
+        """ Moves `mass` from `from_index` to `to_index`, for the indices held by this partition """
+        for index, sign in ((to_index, 1), (from_index, -1)):
+            if 0 <= index - self.offset < len(self):
+                self.w[index - self.offset] += sign * mass
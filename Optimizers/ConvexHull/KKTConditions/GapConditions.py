@@ -0,0 +1,12 @@
+import numpy as np
+
+
+def validate_gap_conditions(w, grad, tol=1e-3):
+    """ The Frank-Wolfe duality gap `grad @ w - min(grad)` bounds f(w) - f*, so a gap below tol
+        certifies that w is within tol of optimal
+    """
+    return frank_wolfe_gap(w, grad) < tol
+
+
+def frank_wolfe_gap(w, grad):
+    return grad @ w - np.min(grad)
@@ -1,15 +1,64 @@
+import numpy as np
+
+from .GapConditions import validate_gap_conditions
 from .KKTConditions import validate_kkt_conditions
 from .KKTVARConditions import validate_kkt_var_conditions
 
 
-def validate_stopping_conditions(w, X, y, tol=1e-6, e=1e-10, stopping_type="TOL"):
+def validate_stopping_conditions(w, X, y, tol=1e-6, e=1e-10, stopping_type="TOL", grad=None):
+    """ Returns True if `w` satisfies the stopping condition for the projection of y onto the hull of X
+
+        The gradient `(w @ X - y) @ X.T` is only computed if `grad` is not given
+    """
+    grad = (w @ X - y) @ X.T if grad is None else grad
+    return validate_gradient_conditions(w, grad, tol=tol, e=e, stopping_type=stopping_type)
+
+
+def validate_gradient_conditions(w, grad, tol=1e-6, e=1e-10, stopping_type="KKT"):
+    """ Same as `validate_stopping_conditions`, but using a precomputed gradient
+
+        'KKT' and 'KKTVAR' check that the gradient is constant over the support of `w`, by its range
+        or by its w-weighted standard deviation. 'GAP' checks the Frank-Wolfe duality gap, which bounds
+        the sub-optimality of `w`. Each costs a few reductions over `grad`.
+    """
     if stopping_type == "KKT":
-        grad = (w @ X - y) @ X.T
         return validate_kkt_conditions(w, grad, tol=tol, e=e)
 
     elif stopping_type == "KKTVAR":
-        grad = (w @ X - y) @ X.T
         return validate_kkt_var_conditions(w, grad, tol=tol, e=e)
 
+    elif stopping_type == "GAP":
+        return validate_gap_conditions(w, grad, tol=tol)
+
+    else:
+        raise ValueError("stopping_type can only be KKT, KKTVAR or GAP.")
+
+
+def validate_batch_gradient_conditions(W, grad, tol=1e-6, e=1e-10, stopping_type="KKT"):
+    """ Same as `validate_gradient_conditions`, but checks each row of the (k, n) weights `W` against
+        the matching row of `grad`, and returns a (k, ) boolean array
+    """
+    if stopping_type == "KKT":
+        non_active_set = W > e
+
+        max_ = np.max(grad, axis=1, where=non_active_set, initial=-np.inf)
+        min_ = np.min(grad, axis=1, where=non_active_set, initial=np.inf)
+
+        # Rows with an empty non-active set violate dL/db = 0, and fail the check as in the single query case
+        valid = (max_ > -np.inf) & (max_ - min_ < tol)
+        with np.errstate(invalid='ignore'):
+            b = -(max_ + min_) / 2
+        return valid & (np.min(grad, axis=1) + b > -tol)
+
+    elif stopping_type == "KKTVAR":
+        b = np.sum(grad * W, axis=1)
+        variance = np.einsum('ij,ij,ij->i', grad, grad, W) - b ** 2
+
+        active_min = np.min(grad, axis=1, where=W <= e, initial=np.inf)
+        return (variance < tol ** 2) & (active_min - b > -tol)
+
+    elif stopping_type == "GAP":
+        return np.sum(grad * W, axis=1) - np.min(grad, axis=1) < tol
+
     else:
-        raise ValueError("stopping_type can only be KKT, KKTVAR or TOL.")
+        raise ValueError("stopping_type can only be KKT, KKTVAR or GAP.")
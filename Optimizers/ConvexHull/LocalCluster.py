@@ -0,0 +1,132 @@
+import multiprocessing
+import os
+import pickle
+
+
+def _worker_loop(connection, factory, args):
+    state = factory(*args)
+
+    while True:
+        message = connection.recv_bytes()
+        method, method_args = pickle.loads(message)
+        if method is None:
+            break
+
+        try:
+            result = (True, getattr(state, method)(*method_args))
+        except Exception as error:
+            result = (False, error)
+
+        connection.send_bytes(pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL))
+
+    connection.close()
+
+
+class LocalCluster:
+    """ A cluster of worker processes on this machine, each holding one object and running its methods
+
+        This is the stand-in for a multi-machine cluster used by `DistributedSolver`. Every worker
+        is a process connected to this one by a pipe, so all the data exchanged between them is
+        pickled, as it would be over a network. The number of bytes sent and received is counted.
+
+        Attributes
+        ----------
+        n_workers : int
+            The number of worker processes
+        bytes_sent : int
+            The number of bytes sent to the workers since they were started
+        bytes_received : int
+            The number of bytes received from the workers since they were started
+
+        Notes
+        -----
+        The workers are stopped by `close`, so the cluster should be used as a context manager
+
+            >>> with LocalCluster(4) as cluster:
+            ...     cluster.start(HullPartition, [(X[:50], 0), (X[50:], 50)])
+            ...     images = cluster.call('image')
+    """
+    def __init__(self, n_workers=None, context=None):
+        """ Initialize the Local Cluster
+
+            Parameters
+            ----------
+            n_workers : int, optional
+                The number of worker processes. Defaults to `os.cpu_count()`
+            context : str, optional
+                The multiprocessing start method, e.g. 'fork' or 'spawn'. Defaults to the platform default
+        """
+        self.n_workers = os.cpu_count() if n_workers is None else n_workers
+        self._context = multiprocessing.get_context(context)
+
+        self._processes = []
+        self._connections = []
+
+        self.bytes_sent = 0
+        self.bytes_received = 0
+
+    def start(self, factory, args):
+        """ Start a worker for each tuple in `args`, holding the object `factory(*args[i])`
+
+            The objects of any earlier call are discarded. `args` may have fewer entries than
+            `n_workers`, but not more.
+        """
+        if len(args) > self.n_workers:
+            raise ValueError(f"Got {len(args)} workers, but the cluster only has {self.n_workers}.")
+
+        self.stop()
+        for worker_args in args:
+            parent, child = self._context.Pipe()
+            process = self._context.Process(target=_worker_loop, args=(child, factory, worker_args), daemon=True)
+            process.start()
+            child.close()
+
+            self._processes.append(process)
+            self._connections.append(parent)
+
+    def call(self, method, *args):
+        """ Call `method(*args)` on every worker, and return the results in worker order """
+        return self.call_each(method, [args] * len(self._connections))
+
+    def call_each(self, method, args):
+        """ Call `method(*args[i])` on worker i, and return the results in worker order """
+        for connection, worker_args in zip(self._connections, args):
+            message = pickle.dumps((method, tuple(worker_args)), protocol=pickle.HIGHEST_PROTOCOL)
+            connection.send_bytes(message)
+            self.bytes_sent += len(message)
+
+        results = []
+        for connection in self._connections:
+            message = connection.recv_bytes()
+            self.bytes_received += len(message)
+            results.append(pickle.loads(message))
+
+        for ok, result in results:
+            if not ok:
+                raise result
+
+        return [result for _, result in results]
+
+    def stop(self):
+        """ Stop the workers started by `start` """
+        for connection in self._connections:
+            try:
+                connection.send_bytes(pickle.dumps((None, ())))
+            except (BrokenPipeError, OSError):
+                pass
+            connection.close()
+
+        for process in self._processes:
+            process.join()
+
+        self._processes = []
+        self._connections = []
+
+    def close(self):
+        self.stop()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -1,6 +1,6 @@
 import numpy as np
 
-from Optimizers import ArmijoSearch, Optimizer
+from Optimizers import ArmijoSearch, Optimizer, kernels
 from .ConvexHull import ConvexHull
 from Optimizers.utils import clip
 
@@ -16,23 +16,49 @@ class PairwiseFrankWolfe(ConvexHull, ArmijoSearch, Optimizer):
             The point to project into the hull
         tol : float
             The tolerance for the zero-set
+        G : (n, n) np.ndarray or None
+            The Gram matrix X X^T, if the objective is evaluated through it
     """
-    def __init__(self, X, y, tol=1e-10):
+    def __init__(self, X, y, tol=None, gram="auto", incremental=False, refresh_every=100,
+                 dtype=None, chunk_size=None, n_threads=1, backend="numpy", inplace=False):
         """ Initialize PFW Optimizer Class
 
             Parameters
             ----------
-            X : (n, d) np.ndarray
-                The n-points that make up the convex hull
+            X : (n, d) np.ndarray or str
+                The n-points that make up the convex hull, or the path to a `.npy` file
             y : (d, ) np.ndarray
                 The point to project into the hull
-            tol : float
-                The tolerance for the zero-set
+            tol : float, optional
+                The tolerance for the zero-set. Defaults to 1e-10, scaled to the precision of `dtype`
+            gram : bool, str or (n, n) np.ndarray
+                Whether to evaluate the objective through the Gram matrix X X^T. See `ConvexHull`
+            incremental : bool
+                If True, the residual is carried between calls to `search` and updated in O(d)
+                (or O(n) in Gram mode) rather than recomputed. See `ConvexHull`
+            refresh_every : int
+                Number of incremental updates between full recomputations of the residual
+            dtype : np.dtype, optional
+                The floating point type used for all arithmetic. See `ConvexHull`
+            chunk_size : int, optional
+                Number of rows of `X` per block when streaming products with `X`. See `ConvexHull`
+            n_threads : int
+                Number of threads used to process the row blocks. See `ConvexHull`
+            backend : str
+                Either "numpy" or "numba". The Numba backend chooses the index pair with a compiled
+                single-pass kernel, when `chunk_size` is not given. It falls back to NumPy with a
+                warning if Numba is not installed
+            inplace : bool
+                If True, every array of size n is written into a preallocated workspace instead of
+                being allocated. See `ConvexHull`
         """
-        ConvexHull.__init__(self, X, y)
+        ConvexHull.__init__(self, X, y, gram=gram, incremental=incremental,
+                            refresh_every=refresh_every, dtype=dtype, chunk_size=chunk_size,
+                            n_threads=n_threads, inplace=inplace)
         self.tol = tol
+        self.backend = kernels.resolve_backend(backend)
 
-    def update(self, x, d, step_size):
+    def update(self, x, d, step_size, out=None):
         """ Perform a step using the PFW scheme
 
             Parameters
@@ -42,6 +68,8 @@ class PairwiseFrankWolfe(ConvexHull, ArmijoSearch, Optimizer):
             d : tuple
                 2-tuple containing the ('to', 'from') index pair
             step_size : float
+            out : (n, ) np.ndarray, optional
+                If given, the new point is written into `out` instead of a copy of `x`
 
             Returns
             -------
@@ -55,7 +83,11 @@ class PairwiseFrankWolfe(ConvexHull, ArmijoSearch, Optimizer):
         """
         s_index, v_index = d
 
-        w = x.copy()
+        if out is None:
+            w = x.copy()
+        else:
+            w = out
+            np.copyto(w, x)
         alpha = w[v_index]
 
         w[s_index] += step_size * alpha
@@ -80,17 +112,83 @@ class PairwiseFrankWolfe(ConvexHull, ArmijoSearch, Optimizer):
             -----
             The step size is determined through a line search
         """
-        grad = self.f(x, grad=True)
-
-        s_index, v_index = self.frank_wolfe_pair(x, grad, tol=self.tol)
+        self.telemetry.begin()
+
+        residual, grad = self.residual_and_gradient(x)
+        self.record_gradient(x, grad)
+        self.telemetry.lap('gradient')
+
+        if self.chunk_size is not None:
+            s_index, v_index = self._blocked_frank_wolfe_pair(x, grad)
+        elif self.backend == "numba":
+            s_index, v_index = kernels.frank_wolfe_pair(x, grad, self.tol)
+        elif self.workspace is not None:
+            s_index, v_index = self._masked_frank_wolfe_pair(x, grad)
+        else:
+            s_index, v_index = self.frank_wolfe_pair(x, grad, tol=self.tol)
+        self.telemetry.lap('direction')
 
         alpha = x[v_index]
-        d_X = alpha * (self.X[s_index] - self.X[v_index])
+        pair_distance = self.pair_distance(s_index, v_index)
 
-        cauchy_step_size = - (x @ self.X - self.y) @ d_X / (d_X @ d_X)
+        if pair_distance > 0:
+            # (x @ X - y) @ (X[s] - X[v]) is the gradient difference, so only ||X[s] - X[v]||^2 is needed
+            cauchy_step_size = (grad[v_index] - grad[s_index]) / (alpha * pair_distance)
+        else:
+            cauchy_step_size = 0
         step_size = clip(cauchy_step_size, 0, 1)
+        self.telemetry.lap('line_search')
+
+        out = None if self.workspace is None else self.workspace.output(x)
+        x_new = self.update(x, (s_index, v_index), step_size, out=out)
+
+        if self.incremental:
+            # Mass only moves between two indices, so the residual has a rank-2 update
+            self.carry_state(x_new, self.updated_residual(residual, s_index, v_index, step_size * alpha))
+        self.telemetry.lap('update')
+
+        self.telemetry.end(x, x_new, grad=grad, step_size=step_size, objective=lambda: self.objective(x, residual))
+
+        return x_new
+
+    def updated_residual(self, residual, s_index, v_index, mass):
+        """ Returns the residual after `mass` has moved from `v_index` to `s_index` """
+        if self.workspace is None:
+            pair_image = self.image_rows(s_index) - self.image_rows(v_index)
+            return residual + mass * pair_image
+
+        pair_image = self.workspace.like('pair_image', residual)
+        np.subtract(self.image_rows(s_index), self.image_rows(v_index), out=pair_image)
+
+        # `residual` is still needed until the end of `search`, so the other residual buffer is used
+        out = np.multiply(pair_image, mass, out=self.workspace.output(residual, name='residual'))
+        return np.add(residual, out, out=out)
 
-        return self.update(x, (s_index, v_index), step_size)
+    def _masked_frank_wolfe_pair(self, x, grad):
+        """ `frank_wolfe_pair`, with the masked gradient written into the workspace """
+        support = np.greater(x, self.tol, out=self.workspace.like('mask', x, dtype=bool))
+
+        masked = self.workspace.like('masked_grad', grad)
+        masked.fill(-np.inf)
+        np.copyto(masked, grad, where=support)
+
+        return np.argmin(grad), np.argmax(masked)
+
+    def _blocked_frank_wolfe_pair(self, x, grad):
+        def block_pair(index):
+            grad_block = grad[index]
+            masked = np.where(x[index] > self.tol, grad_block, -np.inf)
+
+            s, v = np.argmin(grad_block), np.argmax(masked)
+            return (grad_block[s], index.start + s), (masked[v], index.start + v)
+
+        s_candidates, v_candidates = zip(*self.map_blocks(block_pair, rows_only=True))
+
+        # min and max return the first optimum, so ties go to the lowest index as in np.argmin
+        s_index = min(s_candidates, key=lambda candidate: candidate[0])[1]
+        v_index = max(v_candidates, key=lambda candidate: candidate[0])[1]
+
+        return s_index, v_index
 
     @staticmethod
     def frank_wolfe_pair(x, grad, tol=1e-10):
@@ -0,0 +1,162 @@
+import os
+
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from .CauchySimplex import CauchySimplex
+
+
+# The optimizer built by each worker process, shared by all the chunks it solves
+_worker = {}
+
+
+def _init_worker(source, shape, dtype, optimizer, optimizer_kwargs):
+    if shape is None:
+        X = np.load(source, mmap_mode='r')
+    else:
+        shm = shared_memory.SharedMemory(name=source)
+        X = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+        _worker['shm'] = shm
+
+    _worker['optimizer'] = optimizer(X, np.zeros(X.shape[1], dtype=X.dtype), **optimizer_kwargs)
+
+
+def _solve_chunk(Y, w0, solve_kwargs):
+    optimizer = _worker['optimizer']
+
+    results = []
+    for y in Y:
+        optimizer.set_target(y)
+        results.append(optimizer.solve(w0, **solve_kwargs))
+
+    return results
+
+
+class ProcessPoolSolver:
+    """ Projection of many independent points onto the same convex hull using a pool of processes
+
+        `X` is placed in shared memory once, and every worker builds a single optimizer over it that
+        is re-targeted for each point. This keeps the Gram matrix, if one is used, to one per worker.
+
+        Attributes
+        ----------
+        X : (n, d) np.ndarray or str
+            The n-points that make up the convex hull, or the path to a `.npy` file
+        optimizer : class
+            One of `CauchySimplex`, `EGD` or `PairwiseFrankWolfe`
+        n_workers : int
+            The number of worker processes
+        chunk_size : int
+            The number of points sent to a worker in a single task
+        max_pending : int
+            The maximum number of chunks in flight, which bounds the memory used by queued results
+        optimizer_kwargs : dict
+            Additional keyword arguments given to the optimizer
+
+        Notes
+        -----
+        The shared memory is released by `close`, so the solver should be used as a context manager
+
+            >>> with ProcessPoolSolver(X, optimizer=CauchySimplex, n_workers=8) as solver:
+            ...     for result in solver.solve(Y, max_iter=1000, stopping="KKT"):
+            ...         ...
+    """
+    def __init__(self, X, optimizer=CauchySimplex, n_workers=None, chunk_size=64, max_pending=None,
+                 optimizer_kwargs=None):
+        """ Initialize the Process-Pool Solver
+
+            Parameters
+            ----------
+            X : (n, d) np.ndarray or str
+                The n-points that make up the convex hull. A path to a `.npy` file is memory-mapped by
+                each worker instead of being copied into shared memory
+            optimizer : class
+                One of `CauchySimplex`, `EGD` or `PairwiseFrankWolfe`
+            n_workers : int, optional
+                The number of worker processes. Defaults to `os.cpu_count()`
+            chunk_size : int
+                The number of points sent to a worker in a single task
+            max_pending : int, optional
+                The maximum number of chunks in flight. Defaults to twice the number of workers
+            optimizer_kwargs : dict, optional
+                Additional keyword arguments given to the optimizer
+        """
+        self.optimizer = optimizer
+        self.optimizer_kwargs = {} if optimizer_kwargs is None else optimizer_kwargs
+
+        self.n_workers = os.cpu_count() if n_workers is None else n_workers
+        self.chunk_size = chunk_size
+        self.max_pending = 2 * self.n_workers if max_pending is None else max_pending
+
+        self._shm = None
+        if isinstance(X, (str, os.PathLike)):
+            self.X = np.load(X, mmap_mode='r')
+            initargs = (os.fspath(X), None, None)
+        else:
+            X = np.ascontiguousarray(X)
+
+            self._shm = shared_memory.SharedMemory(create=True, size=max(X.nbytes, 1))
+            self.X = np.ndarray(X.shape, dtype=X.dtype, buffer=self._shm.buf)
+            self.X[:] = X
+            initargs = (self._shm.name, X.shape, X.dtype)
+
+        self._executor = ProcessPoolExecutor(max_workers=self.n_workers, initializer=_init_worker,
+                                             initargs=initargs + (optimizer, self.optimizer_kwargs))
+
+    def solve(self, Y, w0=None, **solve_kwargs):
+        """ Project every point of `Y`, yielding the results in order
+
+            Parameters
+            ----------
+            Y : (k, d) np.ndarray or iterable of (d, ) np.ndarray
+                The points to project into the hull. Any iterable is consumed lazily, one chunk at a time
+            w0 : (n, ) np.ndarray, optional
+                The starting point for every projection. Defaults to the centroid weights
+            **solve_kwargs
+                Keyword arguments given to `Optimizer.solve`, e.g. `max_iter`, `stopping` and `tol`
+
+            Yields
+            ------
+            SolveResult
+                The result of each projection, in the order of `Y`
+        """
+        n = self.X.shape[0]
+        w0 = np.ones(n) / n if w0 is None else w0
+
+        rows = iter(Y)
+        pending = deque()
+
+        def submit():
+            chunk = list(islice(rows, self.chunk_size))
+            if len(chunk) > 0:
+                pending.append(self._executor.submit(_solve_chunk, np.asarray(chunk), w0, solve_kwargs))
+            return len(chunk) > 0
+
+        while len(pending) < self.max_pending and submit():
+            pass
+
+        while len(pending) > 0:
+            results = pending.popleft().result()
+            submit()
+
+            yield from results
+
+    def close(self):
+        """ Shut down the workers and release the shared memory """
+        self._executor.shutdown()
+
+        if self._shm is not None:
+            self.X = None
+            self._shm.close()
+            self._shm.unlink()
+            self._shm = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,125 @@
+import numpy as np
+
+from Optimizers import Optimizer
+from .ConvexHull import ConvexHull
+from Optimizers.utils import clip, project_onto_standard_simplex
+
+
+class ProjectedGradient(ConvexHull, Optimizer):
+    """ Projection onto a convex hull using Projected Gradient Descent
+
+        Attributes
+        ----------
+        X : (n, d) np.ndarray
+            The n-points that make up the convex hull
+        y : (d, ) np.ndarray
+            The point to project into the hull
+        G : (n, n) np.ndarray or None
+            The Gram matrix X X^T, if the objective is evaluated through it
+        step_size : float
+            The gradient step taken before projecting onto the simplex
+    """
+    def __init__(self, X, y, step_size=None, gram="auto", dtype=None, chunk_size=None, n_threads=1,
+                 inplace=False):
+        """ Initialize Projected Gradient Optimizer Class
+
+            Parameters
+            ----------
+            X : (n, d) np.ndarray or str
+                The n-points that make up the convex hull, or the path to a `.npy` file
+            y : (d, ) np.ndarray
+                The point to project into the hull
+            step_size : float, optional
+                The gradient step taken before projecting onto the simplex. Defaults to slightly less
+                than 1 / L, where L is the Lipschitz constant of the gradient
+            gram : bool, str or (n, n) np.ndarray
+                Whether to evaluate the objective through the Gram matrix X X^T. See `ConvexHull`
+            dtype : np.dtype, optional
+                The floating point type used for all arithmetic. See `ConvexHull`
+            chunk_size : int, optional
+                Number of rows of `X` per block when streaming products with `X`. See `ConvexHull`
+            n_threads : int
+                Number of threads used to process the row blocks. See `ConvexHull`
+            inplace : bool
+                If True, every array of size n is written into a preallocated workspace instead of
+                being allocated. See `ConvexHull`
+        """
+        ConvexHull.__init__(self, X, y, gram=gram, dtype=dtype, chunk_size=chunk_size, n_threads=n_threads,
+                            inplace=inplace)
+        self.step_size = self.default_step_size() if step_size is None else step_size
+
+    def update(self, x, d, step_size, out=None):
+        """ Perform a projected gradient step
+
+            Parameters
+            ----------
+            x : (n, ) np.ndarray
+                The starting point to take the step
+            d : (n, ) np.ndarray
+                The direction to take
+            step_size : float
+            out : (n, ) np.ndarray, optional
+                If given, the new point is written into `out` instead of a new array
+
+            Returns
+            -------
+            (n, ) np.ndarray
+                The point after the step has been taken
+        """
+        if out is None:
+            return project_onto_standard_simplex(x - step_size * d)
+
+        step = np.subtract(x, np.multiply(d, step_size, out=out), out=out)
+        return project_onto_standard_simplex(step, out=out)
+
+    def search(self, x):
+        """ Perform a projected gradient step, followed by an exact line search towards it
+
+            Parameters
+            ----------
+            x : (n, ) np.ndarray
+                The starting point to take the step
+
+            Returns
+            -------
+            (n, ) np.ndarray
+                The point after the step has been taken
+
+            Notes
+            -----
+            The segment between x and its projected gradient step lies in the simplex, so the exact
+            minimiser along it is also feasible. This makes the step a descent step even when
+            `step_size` is larger than 1 / L.
+        """
+        self.telemetry.begin()
+
+        residual, grad = self.residual_and_gradient(x)
+        self.record_gradient(x, grad)
+        self.telemetry.lap('gradient')
+
+        if self.workspace is None:
+            projected = self.update(x, grad, self.step_size)
+            d = x - projected
+        else:
+            projected = self.update(x, grad, self.step_size,
+                                    out=self.workspace.like('projected', grad, dtype=np.result_type(x, grad)))
+            d = np.subtract(x, projected, out=self.workspace.like('direction', projected))
+        self.telemetry.lap('direction')
+
+        d_image = self.image(d, out=self.buffer('d_image', self.target_image.shape, d))
+        quadratic_form = self.quadratic_form(d, image=d_image)
+        cauchy_step_size = d @ grad / quadratic_form if quadratic_form > 0 else 0
+        step_size = clip(cauchy_step_size, 0, 1)
+        self.telemetry.lap('line_search')
+
+        if self.workspace is None:
+            x_new = (1 - step_size) * x + step_size * projected
+        else:
+            # The same arithmetic, written into the weights buffer that is not `x`
+            x_new = np.multiply(x, 1 - step_size, out=self.workspace.output(x, dtype=projected.dtype))
+            x_new += np.multiply(projected, step_size, out=self.workspace.like('scaled', projected))
+        self.telemetry.lap('update')
+
+        self.telemetry.end(x, x_new, grad=grad, step_size=step_size, objective=lambda: self.objective(x, residual))
+
+        return x_new
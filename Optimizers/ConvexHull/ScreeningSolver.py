@@ -0,0 +1,146 @@
+import time
+
+import numpy as np
+
+from Optimizers import SolveResult
+from .CauchySimplex import CauchySimplex
+from .KKTConditions.GapConditions import frank_wolfe_gap
+from Optimizers.utils import squared_row_norms
+
+
+class ScreeningSolver:
+    """ Projection onto a convex hull with gap-safe screening of the hull points
+
+        The optimizer is periodically stopped and every point that is provably not in the support of
+        the optimal solution is removed from `X`. The optimizer is then restarted on the smaller set.
+
+        Attributes
+        ----------
+        X : (n, d) np.ndarray
+            The n-points that make up the convex hull
+        y : (d, ) np.ndarray
+            The point to project into the hull
+        optimizer : class
+            One of the `Optimizers.ConvexHull` optimizers
+        screen_every : int
+            The number of iterations between screening tests
+        optimizer_kwargs : dict
+            Additional keyword arguments given to the optimizer
+
+        Notes
+        -----
+        For a point `w` with residual `r = w @ X - y`, the Frank-Wolfe gap `grad @ w - min(grad)` bounds
+        `f(w) - f*`, and so `||r - r*|| <= sqrt(2 * gap)` where `r*` is the (unique) optimal residual.
+        The optimal gradient `X @ r*` is then within `||X[i]|| * sqrt(2 * gap)` of the current gradient
+        at each point. Point i is discarded if its lower bound is larger than the upper bound of some
+        other point, as it can then never attain the minimum of the optimal gradient.
+    """
+    def __init__(self, X, y, optimizer=CauchySimplex, screen_every=10, optimizer_kwargs=None):
+        """ Initialize the Screening Solver
+
+            Parameters
+            ----------
+            X : (n, d) np.ndarray
+                The n-points that make up the convex hull
+            y : (d, ) np.ndarray
+                The point to project into the hull
+            optimizer : class
+                One of the `Optimizers.ConvexHull` optimizers
+            screen_every : int
+                The number of iterations between screening tests
+            optimizer_kwargs : dict, optional
+                Additional keyword arguments given to the optimizer
+        """
+        self.X = X
+        self.y = y
+
+        self.optimizer = optimizer
+        self.optimizer_kwargs = {} if optimizer_kwargs is None else optimizer_kwargs
+        self.screen_every = screen_every
+
+        self.row_norms = np.sqrt(squared_row_norms(X))
+
+    def screen(self, w, grad, row_norms):
+        """ Returns the mask of points that can still be in the optimal support
+
+            Parameters
+            ----------
+            w : (m, ) np.ndarray
+                The current point, over the remaining points
+            grad : (m, ) np.ndarray
+                Gradient at `w`
+            row_norms : (m, ) np.ndarray
+                The norms of the remaining points
+
+            Returns
+            -------
+            (m, ) np.ndarray of bool
+        """
+        gap = max(frank_wolfe_gap(w, grad), 0)
+        radius = np.sqrt(2 * gap) * row_norms
+
+        return grad - radius <= np.min(grad + radius)
+
+    def solve(self, w0, max_iter=1000, time_budget=None, stopping=None, tol=1e-6, search_kwargs=None):
+        """ Run the optimizer, screening the points every `screen_every` iterations
+
+            Parameters
+            ----------
+            w0 : (n, ) np.ndarray
+                The starting point, assumed to be in the probability simplex
+            max_iter : int
+                The maximum number of calls to `search`, over all screening rounds
+            time_budget : float, optional
+                The maximum wall time in seconds
+            stopping : str, optional
+                The stopping condition, either 'KKT', 'KKTVAR' or 'GAP'. See `Optimizer.solve`
+            tol : float
+                The tolerance for the stopping condition
+            search_kwargs : dict, optional
+                Keyword arguments given to every call of `search`
+
+            Returns
+            -------
+            SolveResult
+                The weights are given in the original indexing of `X`
+        """
+        start = time.perf_counter()
+
+        index = np.arange(self.X.shape[0])
+        X, row_norms, w = self.X, self.row_norms, w0
+        G = self.optimizer_kwargs.get('gram', "auto")
+
+        iterations = 0
+        status = "max_iter"
+        while iterations < max_iter:
+            optimizer = self.optimizer(X, self.y, **{**self.optimizer_kwargs, 'gram': G})
+            G = optimizer.G if optimizer.use_gram else False
+
+            remaining_budget = None if time_budget is None else time_budget - (time.perf_counter() - start)
+            result = optimizer.solve(w, max_iter=min(self.screen_every, max_iter - iterations),
+                                     time_budget=remaining_budget, stopping=stopping, tol=tol,
+                                     search_kwargs=search_kwargs)
+
+            iterations += result.iterations
+            w = result.w
+            status = result.status
+
+            if status in ("converged", "time_budget"):
+                break
+
+            keep = self.screen(w, optimizer.f(w, grad=True), row_norms)
+            if not np.all(keep):
+                index, X, row_norms, w = index[keep], X[keep], row_norms[keep], w[keep]
+
+                # The screen only guarantees the optimum is in `keep`, the current mass may all be outside it
+                mass = np.sum(w)
+                w = w / mass if mass > 0 else np.ones(len(w)) / len(w)
+
+                if G is not False:
+                    G = G[np.ix_(keep, keep)]
+
+        w_full = np.zeros(self.X.shape[0])
+        w_full[index] = w
+
+        z = w @ X - self.y
+        return SolveResult(w_full, (z @ z) / 2, iterations, time.perf_counter() - start, status)
@@ -0,0 +1,176 @@
+from collections import OrderedDict
+
+import numpy as np
+
+from .CauchySimplex import CauchySimplex
+from .EGD import EGD
+
+
+class WarmStartCache:
+    """ Warm starts for repeated projections onto the same hull, seeded from the nearest solved query
+
+        Solutions are stored sparsely together with their query `y`. A new query is started from the
+        solution of the closest stored query, and the least recently used solutions are evicted once the
+        cache is full.
+
+        Attributes
+        ----------
+        n : int
+            The number of points in the hull
+        max_size : int
+            The maximum number of stored solutions
+        max_distance : float
+            Stored queries further than this from the new query are not used
+        inflate : float or None
+            The total mass given to the zero entries of a warm start. If None, it is chosen per optimizer
+        tol : float
+            Weights below this are not stored, and are re-inflated when used as a warm start
+        hits : int
+            The number of warm starts taken from a stored solution
+        misses : int
+            The number of warm starts that fell back to the centroid
+
+        Notes
+        -----
+        The zero entries of a warm start need to be re-inflated for Cauchy-Simplex and EGD, as their
+        multiplicative updates (and the Cauchy-Simplex zero-set `x < tol`) would otherwise never let them
+        enter the support. The other optimizers can add any point to the support, through the
+        Frank-Wolfe vertex or the projection onto the simplex, while the Frank-Wolfe variants remove
+        inflated mass only one point per step, so they are warm-started without inflation by default.
+
+        A warm start only pays off when the stored query is close to the new one; for distant queries
+        it can take more iterations than the centroid, which `max_distance` guards against.
+    """
+    def __init__(self, n, max_size=1000, max_distance=np.inf, inflate=None, tol=1e-10):
+        """ Initialize the Warm-Start Cache
+
+            Parameters
+            ----------
+            n : int
+                The number of points in the hull
+            max_size : int
+                The maximum number of stored solutions
+            max_distance : float
+                Stored queries further than this from the new query are not used
+            inflate : float, optional
+                The total mass given to the zero entries of a warm start. Defaults to 1e-2 for the
+                multiplicative `CauchySimplex` and `EGD`, and 0 otherwise
+            tol : float
+                Weights below this are not stored, and are re-inflated when used as a warm start
+        """
+        self.n = n
+        self.max_size = max_size
+        self.max_distance = max_distance
+        self.inflate = inflate
+        self.tol = tol
+
+        self.hits = 0
+        self.misses = 0
+
+        # Queries are kept in fixed slots for the nearest-neighbour search, and the OrderedDict maps
+        # the slots in use to their sparse solutions, in least recently used order
+        self._queries = None
+        self._solutions = OrderedDict()
+
+    def __len__(self):
+        return len(self._solutions)
+
+    @property
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total > 0 else 0.0
+
+    def nearest(self, y):
+        """ Returns the slot of the stored query closest to `y`, or None if there is none in range """
+        if len(self._solutions) == 0:
+            return None
+
+        slots = np.fromiter(self._solutions.keys(), dtype=int, count=len(self._solutions))
+        diff = self._queries[slots] - y
+
+        distances = np.einsum('ij,ij->i', diff, diff)
+        i = np.argmin(distances)
+
+        return slots[i] if distances[i] <= self.max_distance ** 2 else None
+
+    def warm_start(self, y, inflate=1e-2):
+        """ Returns the starting point for the query `y`
+
+            Parameters
+            ----------
+            y : (d, ) np.ndarray
+                The point to project into the hull
+            inflate : float
+                The total mass given to the zero entries, used if the cache has no `inflate` set
+
+            Returns
+            -------
+            (n, ) np.ndarray
+                The re-inflated solution of the nearest stored query, or the centroid weights on a miss
+        """
+        slot = self.nearest(y)
+        if slot is None:
+            self.misses += 1
+            return np.ones(self.n) / self.n
+
+        self.hits += 1
+        self._solutions.move_to_end(slot)
+
+        support, weights = self._solutions[slot]
+        inflate = inflate if self.inflate is None else self.inflate
+
+        zero_count = self.n - len(support)
+        if zero_count == 0 or inflate == 0:
+            w0 = np.zeros(self.n)
+            w0[support] = weights
+            return w0
+
+        w0 = np.full(self.n, inflate / zero_count)
+        w0[support] = (1 - inflate) * weights
+
+        return w0
+
+    def store(self, y, w):
+        """ Store the solution `w` of the query `y`, evicting the least recently used if full """
+        if self._queries is None:
+            self._queries = np.empty((self.max_size, len(y)))
+
+        if len(self._solutions) < self.max_size:
+            slot = len(self._solutions)
+        else:
+            slot, _ = self._solutions.popitem(last=False)
+
+        support = np.flatnonzero(w > self.tol)
+
+        self._queries[slot] = y
+        self._solutions[slot] = (support, w[support] / np.sum(w[support]))
+
+    def solve(self, optimizer, y, **solve_kwargs):
+        """ Project `y` with a warm-started `optimizer`, and store the solution
+
+            Parameters
+            ----------
+            optimizer : ConvexHull
+                One of the `Optimizers.ConvexHull` optimizers over the hull. It is re-targeted to `y`
+            y : (d, ) np.ndarray
+                The point to project into the hull
+            **solve_kwargs
+                Keyword arguments given to `Optimizer.solve`
+
+            Returns
+            -------
+            SolveResult
+        """
+        inflate = 1e-2 if isinstance(optimizer, (CauchySimplex, EGD)) else 0
+
+        optimizer.set_target(y)
+        result = optimizer.solve(self.warm_start(y, inflate=inflate), **solve_kwargs)
+
+        self.store(y, result.w)
+        return result
+
+    def clear(self):
+        """ Remove all stored solutions and reset the statistics """
+        self._solutions.clear()
+        self.hits = 0
+        self.misses = 0
@@ -0,0 +1,155 @@
+import inspect
+import time
+
+import numpy as np
+
+from Optimizers import SolveResult
+from .CauchySimplex import CauchySimplex
+from .KKTConditions.KKTConditions import validate_kkt_conditions
+
+
+class WorkingSetSolver:
+    """ Projection onto a convex hull with many points by optimizing over a small working set
+
+        The optimizer is run on a subset of the rows of `X`. The remaining points are then priced
+        with a single pass `X @ residual`, and the points that most violate the KKT conditions
+        are added to the working set. This is repeated until the KKT conditions hold over all points.
+
+        Attributes
+        ----------
+        X : (n, d) np.ndarray
+            The n-points that make up the convex hull
+        y : (d, ) np.ndarray
+            The point to project into the hull
+        optimizer : class
+            The optimizer used on the working set, e.g. `CauchySimplex` or `PairwiseFrankWolfe`
+        initial_size : int
+            The number of points in the initial working set
+        max_add : int
+            The maximum number of points added to the working set in each round
+        tol : float
+            The tolerance for the zero-set
+    """
+    def __init__(self, X, y, optimizer=CauchySimplex, initial_size=100, max_add=50, tol=1e-10,
+                 optimizer_kwargs=None):
+        """ Initialize the Working-Set Solver
+
+            Parameters
+            ----------
+            X : (n, d) np.ndarray
+                The n-points that make up the convex hull
+            y : (d, ) np.ndarray
+                The point to project into the hull
+            optimizer : class
+                The optimizer used on the working set, e.g. `CauchySimplex` or `PairwiseFrankWolfe`
+            initial_size : int
+                The number of points in the initial working set
+            max_add : int
+                The maximum number of points added to the working set in each round
+            tol : float
+                The tolerance for the zero-set. It is also given to the optimizer, if the optimizer
+                has a zero-set
+            optimizer_kwargs : dict, optional
+                Additional keyword arguments given to the optimizer
+        """
+        self.X = X
+        self.y = y
+
+        self.optimizer = optimizer
+        self.optimizer_kwargs = {} if optimizer_kwargs is None else dict(optimizer_kwargs)
+
+        # Optimizers such as EGD and FISTA never set weights to zero, and take no `tol`
+        if 'tol' in inspect.signature(optimizer).parameters:
+            self.optimizer_kwargs.setdefault('tol', tol)
+
+        self.initial_size = initial_size
+        self.max_add = max_add
+        self.tol = tol
+
+    def f(self, w):
+        z = w @ self.X - self.y
+        return (z @ z) / 2
+
+    def price(self, working_set, w_working):
+        """ Returns the gradient over all points, given the weights on the working set """
+        residual = w_working @ self.X[working_set] - self.y
+        return self.X @ residual
+
+    def solve(self, w0=None, max_rounds=100, max_iter=1000, kkt_tol=1e-6, inflate=1e-3, prune=True,
+              search_kwargs=None):
+        """ Alternate between solving on the working set and adding violating points
+
+            Parameters
+            ----------
+            w0 : (n, ) np.ndarray, optional
+                The starting point. Its support is used as the initial working set. If not given,
+                the working set is the `initial_size` points with the smallest gradient at the
+                centroid of `X`
+            max_rounds : int
+                The maximum number of pricing rounds
+            max_iter : int
+                The maximum number of optimizer iterations on the working set in each round
+            kkt_tol : float
+                Tolerance for the KKT conditions, on the working set and over all points
+            inflate : float
+                The total mass given to the points added in a round. This is needed as the
+                Cauchy-Simplex zero-set would otherwise never let them enter the support
+            prune : bool
+                If True, points with zero weight are removed from the working set after each round
+            search_kwargs : dict, optional
+                Keyword arguments given to the optimizer's `search`
+
+            Returns
+            -------
+            SolveResult
+                `iterations` is the total number of optimizer iterations over all rounds
+        """
+        start = time.perf_counter()
+        n = self.X.shape[0]
+
+        if w0 is None:
+            grad = self.X @ (np.ones(n) / n @ self.X - self.y)
+            working_set = np.sort(np.argsort(grad)[:self.initial_size])
+            w_working = np.ones(len(working_set)) / len(working_set)
+        else:
+            working_set = np.flatnonzero(w0 > self.tol)
+            w_working = w0[working_set] / np.sum(w0[working_set])
+
+        iterations = 0
+        status = "max_iter"
+        for _ in range(max_rounds):
+            optimizer = self.optimizer(self.X[working_set], self.y, **self.optimizer_kwargs)
+            result = optimizer.solve(w_working, max_iter=max_iter, stopping="KKT", tol=kkt_tol,
+                                     search_kwargs=search_kwargs)
+
+            iterations += result.iterations
+            w_working = result.w
+
+            grad = self.price(working_set, w_working)
+
+            w = np.zeros(n)
+            w[working_set] = w_working
+            if validate_kkt_conditions(w, grad, tol=kkt_tol, e=self.tol):
+                status = "converged"
+                break
+
+            # Points outside the working set whose gradient is below the Lagrange multiplier
+            outside = np.ones(n, dtype=bool)
+            outside[working_set] = False
+
+            candidates = np.flatnonzero(outside & (grad < grad @ w - kkt_tol))
+            new_points = candidates[np.argsort(grad[candidates])[:self.max_add]]
+
+            if prune:
+                keep = w_working > self.tol
+                working_set, w_working = working_set[keep], w_working[keep] / np.sum(w_working[keep])
+
+            if len(new_points) > 0:
+                working_set = np.concatenate([working_set, new_points])
+                w_working = np.concatenate([(1 - inflate) * w_working,
+                                            np.full(len(new_points), inflate / len(new_points))])
+
+        w = np.zeros(n)
+        w[working_set] = w_working
+
+        return SolveResult(w, self.f(w), iterations, time.perf_counter() - start, status)
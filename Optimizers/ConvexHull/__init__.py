@@ -1,4 +1,18 @@
 from .CauchySimplex import CauchySimplex
 from .EGD import EGD
 from .PairwiseFrankWolfe import PairwiseFrankWolfe
+from .AwayStepFrankWolfe import AwayStepFrankWolfe
+from .FullyCorrectiveFrankWolfe import FullyCorrectiveFrankWolfe
+from .ProjectedGradient import ProjectedGradient
+from .FISTA import FISTA
+from .BatchCauchySimplex import BatchCauchySimplex
+from .BatchPairwiseFrankWolfe import BatchPairwiseFrankWolfe
+from .WorkingSetSolver import WorkingSetSolver
+from .ScreeningSolver import ScreeningSolver
+from .ProcessPoolSolver import ProcessPoolSolver
+from .HullPartition import HullPartition
+from .LocalCluster import LocalCluster
+from .DaskCluster import DaskCluster
+from .DistributedSolver import DistributedSolver
+from .WarmStartCache import WarmStartCache
 from .KKTConditions.StoppingCondition import validate_stopping_conditions
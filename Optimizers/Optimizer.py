@@ -1,8 +1,21 @@
+import time
+
+import numpy as np
+
 from abc import ABC
 from abc import abstractmethod
 
+from .SolveResult import SolveResult
+from .Telemetry import NullTelemetry
+
 
 class Optimizer(ABC):
+    # Replaced by a `Telemetry` instance to record each call to `search`
+    telemetry = NullTelemetry()
+
+    # A `Workspace` of preallocated arrays, for optimizers constructed with `inplace=True`
+    workspace = None
+
     @abstractmethod
     def update(self, x, d, step_size):
         pass
@@ -10,3 +23,95 @@ class Optimizer(ABC):
     @abstractmethod
     def search(self, x, step_size=1, c1=1e-4, c2=0.5, max_iter=100):
         pass
+
+    def solve(self, w0, max_iter=1000, time_budget=None, stopping=None, tol=1e-6, check_every=1,
+              search_kwargs=None, refine_iter=0):
+        """ Repeatedly call `search` until a stopping condition or budget is met
+
+            Parameters
+            ----------
+            w0 : (n, ) np.ndarray
+                The starting point, assumed to be in the probability simplex
+            max_iter : int
+                The maximum number of calls to `search`
+            time_budget : float, optional
+                The maximum wall time in seconds. Checked after every iteration
+            stopping : str, optional
+                The stopping condition, either 'KKT', 'KKTVAR' or 'GAP'. If None, only the budgets are
+                used. 'GAP' stops once the Frank-Wolfe duality gap `grad @ w - min(grad)`, which bounds
+                `f(w) - f*` for convex objectives, is below `tol`
+            tol : float
+                The tolerance for the stopping condition
+            check_every : int
+                The stopping condition is only checked every `check_every` iterations
+            search_kwargs : dict, optional
+                Keyword arguments given to every call of `search`
+            refine_iter : int
+                If the optimizer runs in a lower precision `dtype`, the number of float64 iterations
+                run from the final point to refine the solution
+
+            Returns
+            -------
+            SolveResult
+
+            Notes
+            -----
+            The stopping condition is checked on the gradient computed by `search`, so it costs no
+            additional gradient evaluations, only a few reductions over it. This makes it cheap enough
+            to check every iteration. As that gradient is evaluated at the start of the step, a
+            converged solve returns the point that satisfied the condition. An optimizer whose gradient
+            is evaluated elsewhere, such as FISTA at its extrapolated point, pays one gradient
+            evaluation per check, which a larger `check_every` amortises.
+        """
+        from .ConvexHull.KKTConditions.StoppingCondition import validate_gradient_conditions
+
+        search_kwargs = {} if search_kwargs is None else search_kwargs
+        e = getattr(self, 'tol', 1e-10)
+
+        start = time.perf_counter()
+        deadline = None if time_budget is None else start + time_budget
+
+        dtype = getattr(self, 'dtype', None)
+        w = w0 if dtype is None else np.asarray(w0, dtype=dtype)
+
+        status = "max_iter"
+        count = 0
+        while count < max_iter:
+            w_new = self.search(w, **search_kwargs)
+            count += 1
+
+            if stopping is not None and count % check_every == 0:
+                grad = self.gradient_at(w)
+                if validate_gradient_conditions(w, grad, tol=tol, e=e, stopping_type=stopping):
+                    status = "converged"
+                    break
+
+            w = w_new
+
+            if deadline is not None and time.perf_counter() >= deadline:
+                status = "time_budget"
+                break
+
+        if refine_iter > 0 and dtype is not None and dtype != np.float64:
+            refined = self.astype(np.float64).solve(w, max_iter=refine_iter, stopping=stopping, tol=tol,
+                                                    check_every=check_every, search_kwargs=search_kwargs)
+            return SolveResult(refined.w, refined.f, count + refined.iterations, time.perf_counter() - start,
+                               refined.status)
+
+        if self.workspace is not None:
+            # The final point is a workspace buffer, which later calls to `search` would overwrite
+            w = w.copy()
+
+        return SolveResult(w, self.f(w), count, time.perf_counter() - start, status)
+
+    def record_gradient(self, x, grad):
+        """ Store the gradient computed by `search`, so it can be reused by `solve` """
+        self._gradient = (x, grad)
+
+    def gradient_at(self, x):
+        """ Returns the gradient at `x`, reusing the one computed by the last `search` if possible """
+        record = getattr(self, '_gradient', None)
+        if record is not None and record[0] is x:
+            return record[1]
+
+        return self.f(x, grad=True)
@@ -0,0 +1,201 @@
+import numpy as np
+
+from Optimizers import ArmijoSearch, Optimizer
+from .SampleWeighting import SampleWeighting
+
+from .Distributions import TruncatedUnitNormal
+
+
+class AwayStepFrankWolfe(SampleWeighting, ArmijoSearch, Optimizer):
+    """ Optimal question weighting using the Away-Step FW Optimizer
+
+        Attributes
+        ----------
+        data : (d, n) np.ndarray or scipy.sparse matrix
+            Array containing the student marks. Assumed to be d students and n questions
+        integration_points : (m, ) np.ndarray
+            Points to evaluate the target and base distribution at
+        target_distribution : Distributions.TruncatedGaussian or Distributions.Gaussian
+        base_distribution : Distributions.TruncatedUnitNormal or Distributions.UnitNormal
+            The base distribution used in the kernel density approximation
+        e : float
+            The scaling parameter for the kernel density approximation
+        tol : float
+            Tolerance for the zero-set
+
+        Notes
+        -----
+        Each step either moves towards the question with the smallest gradient (a Frank-Wolfe step), or
+        away from the active question with the largest gradient (an away step), whichever has the larger
+        gap. The active questions are kept as an explicit list, which is carried between calls to
+        `search` when it is given the exact array it last returned.
+    """
+    def __init__(self, data, integration_points, target_distribution, base_distribution=TruncatedUnitNormal(),
+                 e=0.01, tol=None, dtype=None, inplace=False, kde="direct"):
+        """ Initialize the Away-Step FW Optimizer class
+
+            Parameters
+            ----------
+            data : (d, n) np.ndarray or scipy.sparse matrix
+                Array containing the student marks. Assumed to be d students and n questions
+            integration_points : (m + 1, ) np.ndarray
+                Points to evaluate the target and base distribution at
+            target_distribution : Distributions.TruncatedGaussian or Distributions.Gaussian
+            base_distribution : Distributions.TruncatedUnitNormal or Distributions.UnitNormal
+                The base distribution used in the kernel density approximation
+            e : float
+                The scaling parameter for the kernel density approximation
+            tol : float, optional
+                Tolerance for the zero-set. Defaults to 1e-10, scaled to the precision of `dtype`
+            dtype : np.dtype, optional
+                The floating point type used for all arithmetic, e.g. np.float32. If not given,
+                float64 tolerances are used
+            inplace : bool
+                If True, the weights are written into a preallocated workspace instead of being
+                allocated each iteration. Points returned by `search` are then reused two iterations
+                later, so copy any that need to be kept
+            kde : str
+                One of "direct", "binned" or "banded". The binned KDE evaluates the density and its
+                gradient by linear binning and an FFT convolution, which is much faster for many
+                students, but requires evenly spaced integration points. The banded KDE only evaluates
+                the kernel within 8 bandwidths of each integration point, changing the density by at most
+                about 1e-14 / e
+
+            Notes
+            -----
+            The given `integration_points` is not the same as the `integration_points` attribute, as we
+            only store `integration_points[:-1]`, that is, everything except the last point
+        """
+        SampleWeighting.__init__(self, data, integration_points, target_distribution,
+                                 base_distribution=base_distribution, e=e, dtype=dtype,
+                                 inplace=inplace, kde=kde)
+        self.tol = tol
+        self._active = None
+
+    def update(self, x, d, step_size, out=None):
+        """ Perform a step using the Away-Step FW scheme
+
+            Parameters
+            ----------
+            x : (n, ) np.ndarray
+                The starting point to take the step
+            d : tuple
+                2-tuple containing the vertex index, and whether the step is an away step
+            step_size : float
+            out : (n, ) np.ndarray, optional
+                If given, the new point is written into `out` instead of a new array
+
+            Returns
+            -------
+            (n, ) np.ndarray
+                The point after the step has been taken
+        """
+        index, away = d
+
+        if away:
+            w = (1 + step_size) * x if out is None else np.multiply(x, 1 + step_size, out=out)
+            w[index] -= step_size
+        else:
+            w = (1 - step_size) * x if out is None else np.multiply(x, 1 - step_size, out=out)
+            w[index] += step_size
+
+        return w
+
+    def search(self, x, c1=1e-4, c2=0.5, max_iter=100):
+        """ Perform a step using the Away-Step FW scheme
+
+            Parameters
+            ----------
+            x : (n, ) np.ndarray
+                The starting point to take the step
+            c1 : float
+                Parameter for the armijo line search
+            c2 : float
+                Parameter for the armijo line search
+            max_iter : int
+                Maximum iterations for the armijo line search
+
+            Returns
+            -------
+            (n, ) np.ndarray
+                The point after the step has been taken
+
+            Notes
+            -----
+            The step size is determined through an Armijo line search
+        """
+        self.telemetry.begin()
+
+        f0, grad = self.value_and_grad(x)
+        self.record_gradient(x, grad)
+        self.telemetry.lap('gradient')
+
+        active = self.active_set(x)
+        s_index, v_index = self.frank_wolfe_pair(grad, active)
+
+        grad_x = grad @ x
+        if grad_x - grad[s_index] >= grad[v_index] - grad_x:
+            d, max_step_size = (s_index, False), 1
+        else:
+            d, max_step_size = (v_index, True), x[v_index] / (1 - x[v_index])
+        self.telemetry.lap('direction')
+
+        out = None if self.workspace is None else self.workspace.output(x)
+
+        step_size = self.backtracking_armijo_line_search(x, d, max_step_size,
+                                                         c1=c1, c2=c2, max_iter=max_iter,
+                                                         f0=f0, grad0=grad, out=out)
+        self.telemetry.lap('line_search')
+
+        x_new = self.update(x, d, step_size, out=out)
+        if d[1] and step_size == max_step_size:
+            x_new[d[0]] = 0
+
+        self._active = (x_new, self.updated_active_set(active, *d, step_size, max_step_size))
+        self.telemetry.lap('update')
+
+        self.telemetry.end(x, x_new, grad=grad, step_size=step_size, objective=lambda: f0)
+
+        return x_new
+
+    def active_set(self, x):
+        """ Returns the indices of the active questions of `x`, reusing the carried list if possible """
+        if self._active is not None and self._active[0] is x:
+            return self._active[1]
+        return np.flatnonzero(x > self.tol)
+
+    @staticmethod
+    def updated_active_set(active, index, away, step_size, max_step_size):
+        """ Returns the active questions after a step towards, or away from, the question `index` """
+        if step_size == 0:
+            return active
+
+        if away:
+            return active[active != index] if step_size == max_step_size else active
+        elif step_size == 1:
+            return np.array([index])
+        elif index not in active:
+            return np.append(active, index)
+
+        return active
+
+    @staticmethod
+    def frank_wolfe_pair(grad, active):
+        """ Returns the Frank-Wolfe vertex and the away vertex
+
+            Parameters
+            ----------
+            grad : (n, ) np.ndarray
+                Gradient at the current point
+            active : (k, ) np.ndarray
+                The indices of the active questions
+
+            Returns
+            -------
+            tuple
+                Tuple containing the ('to', 'away') index pair
+        """
+        s_index = np.argmin(grad)
+        v_index = active[np.argmax(grad[active])]
+
+        return s_index, v_index
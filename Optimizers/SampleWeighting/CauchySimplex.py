@@ -1,6 +1,6 @@
 import numpy as np
 
-from Optimizers import ArmijoSearch, Optimizer
+from Optimizers import ArmijoSearch, Optimizer, kernels
 from .SampleWeighting import SampleWeighting
 
 from .Distributions import TruncatedUnitNormal
@@ -11,7 +11,7 @@ class CauchySimplex(SampleWeighting, ArmijoSearch, Optimizer):
 
         Attributes
         ----------
-        data : (d, n) np.ndarray
+        data : (d, n) np.ndarray or scipy.sparse matrix
             Array containing the student marks. Assumed to be d students and n questions
         integration_points : (m, ) np.ndarray
             Points to evaluate the target and base distribution at
@@ -24,12 +24,13 @@ class CauchySimplex(SampleWeighting, ArmijoSearch, Optimizer):
             Tolerance for the zero-set
     """
     def __init__(self, data, integration_points, target_distribution, base_distribution=TruncatedUnitNormal(),
-                 e=0.01, tol=1e-10):
+                 e=0.01, tol=None, dtype=None, backend="numpy", inplace=False,
+                 kde="direct"):
         """ Initialize the Cauchy-Simplex Optimizer class
 
             Parameters
             ----------
-            data : (d, n) np.ndarray
+            data : (d, n) np.ndarray or scipy.sparse matrix
                 Array containing the student marks. Assumed to be d students and n questions
             integration_points : (m + 1, ) np.ndarray
                 Points to evaluate the target and base distribution at
@@ -38,8 +39,25 @@ class CauchySimplex(SampleWeighting, ArmijoSearch, Optimizer):
                 The base distribution used in the kernel density approximation
             e : float
                 The scaling parameter for the kernel density approximation
-            tol : float
-                Tolerance for the zero-set
+            tol : float, optional
+                Tolerance for the zero-set. Defaults to 1e-10, scaled to the precision of `dtype`
+            dtype : np.dtype, optional
+                The floating point type used for all arithmetic, e.g. np.float32. If not given,
+                float64 tolerances are used
+            backend : str
+                Either "numpy" or "numba". The Numba backend computes the maximum step size and the
+                update with compiled single-pass kernels. It falls back to NumPy with a warning if
+                Numba is not installed
+            inplace : bool
+                If True, the weights and the search direction are written into a preallocated workspace
+                instead of being allocated each iteration. Points returned by `search` are then
+                reused two iterations later, so copy any that need to be kept
+            kde : str
+                One of "direct", "binned" or "banded". The binned KDE evaluates the density and its
+                gradient by linear binning and an FFT convolution, which is much faster for many
+                students, but requires evenly spaced integration points. The banded KDE only evaluates
+                the kernel within 8 bandwidths of each integration point, changing the density by at most
+                about 1e-14 / e
 
             Notes
             -----
@@ -47,10 +65,12 @@ class CauchySimplex(SampleWeighting, ArmijoSearch, Optimizer):
             only store `integration_points[:-1]`, that is, everything except the last point
         """
         SampleWeighting.__init__(self, data, integration_points, target_distribution,
-                                 base_distribution=base_distribution, e=e)
+                                 base_distribution=base_distribution, e=e, dtype=dtype,
+                                 inplace=inplace, kde=kde)
         self.tol = tol
+        self.backend = kernels.resolve_backend(backend)
 
-    def update(self, x, d, step_size):
+    def update(self, x, d, step_size, out=None):
         """ Perform a step using the Cauchy-Simplex scheme
 
             Parameters
@@ -60,16 +80,35 @@ class CauchySimplex(SampleWeighting, ArmijoSearch, Optimizer):
             d : (n, ) np.ndarray
                 The direction to take
             step_size : float
+            out : (n, ) np.ndarray, optional
+                If given, the new point is written into `out` instead of a new array
 
             Returns
             -------
             (n, ) np.ndarray
                 The point after the step has been taken
         """
-        z = x - step_size * d
-        z[x < self.tol] = 0
+        if self.backend == "numba":
+            z = np.empty(len(x), dtype=np.result_type(x, d)) if out is None else out
+            if kernels.cauchy_simplex_update(x, d, step_size, self.tol, z):
+                return z
+            if out is None:
+                return x.copy()
+            np.copyto(out, x)
+            return out
+
+        if out is None:
+            z = x - step_size * d
+            z[x < self.tol] = 0
+
+            return z / np.sum(z)
+
+        zero_set = None if self.workspace is None else self.workspace.like('mask', x, dtype=bool)
 
-        return z / np.sum(z)
+        z = np.subtract(x, np.multiply(d, step_size, out=out), out=out)
+        np.copyto(z, 0, where=np.less(x, self.tol, out=zero_set))
+
+        return np.divide(z, np.sum(z), out=z)
 
     def search(self, x, c1=1e-4, c2=0.5, max_iter=100, gamma=1):
         """ Perform a step using the Cauchy-Simplex scheme using the optimal step size
@@ -97,18 +136,43 @@ class CauchySimplex(SampleWeighting, ArmijoSearch, Optimizer):
             -----
             The step size is determined through an Armijo line search
         """
-        grad = self.f(x, grad=True)
-        d = x * (grad - grad @ x)
-
-        max_step_size = self.max_step_size(x, grad, tol=self.tol) * gamma
+        self.telemetry.begin()
+
+        f0, grad = self.value_and_grad(x)
+        self.record_gradient(x, grad)
+        self.telemetry.lap('gradient')
+
+        if self.workspace is None:
+            d = x * (grad - grad @ x)
+            support = None
+            out = None
+        else:
+            d = self.workspace.like('direction', grad, dtype=np.result_type(x, grad))
+            np.multiply(x, np.subtract(grad, grad @ x, out=d), out=d)
+            support = self.workspace.like('support', x, dtype=bool)
+            out = self.workspace.output(x, dtype=d.dtype)
+        self.telemetry.lap('direction')
+
+        if self.backend == "numba":
+            max_step_size = kernels.max_step_size(x, grad, self.tol, self.min_step_diff) * gamma
+        else:
+            max_step_size = self.max_step_size(x, grad, tol=self.tol, min_diff=self.min_step_diff,
+                                               support=support) * gamma
 
         step_size = self.backtracking_armijo_line_search(x, d, max_step_size,
-                                                         c1=c1, c2=c2, max_iter=max_iter)
+                                                         c1=c1, c2=c2, max_iter=max_iter,
+                                                         f0=f0, grad0=grad, out=out)
+        self.telemetry.lap('line_search')
+
+        x_new = self.update(x, d, step_size, out=out)
+        self.telemetry.lap('update')
+
+        self.telemetry.end(x, x_new, grad=grad, step_size=step_size, objective=lambda: f0)
 
-        return self.update(x, d, step_size)
+        return x_new
 
     @staticmethod
-    def max_step_size(x, grad, tol=1e-10):
+    def max_step_size(x, grad, tol=1e-10, min_diff=1e-6, support=None):
         """ Compute the maximum step size
 
             Parameters
@@ -119,12 +183,16 @@ class CauchySimplex(SampleWeighting, ArmijoSearch, Optimizer):
                 Gradient at the point `x`
             tol : float
                 Tolerance for the zero set
+            min_diff : float
+                Differences below this are treated as zero, giving a maximum step size of 1 / min_diff
+            support : (n, ) np.ndarray of bool, optional
+                A buffer to write the support mask into
 
             Returns
             -------
             float
         """
-        support = x > tol
+        support = np.greater(x, tol, out=support)
 
-        diff = np.max(grad[support]) - x @ grad
-        return 1 / diff if diff > 1e-6 else 1e6
+        diff = np.max(grad, where=support, initial=-np.inf) - x @ grad
+        return 1 / diff if diff > min_diff else 1 / min_diff
@@ -1,7 +1,71 @@
+import functools
+import math
+
 import numpy as np
 from scipy.special import erf
 
-C = np.sqrt(2 * np.pi)
+# Python floats, so that lower precision arrays are not promoted to float64
+C = float(np.sqrt(2 * np.pi))
+SQRT_2 = float(np.sqrt(2))
+
+
+class NormalTable:
+    """ A lookup table of the unit normal CDF, evaluated by linear interpolation
+
+        The table is over the standardised variable `(x - mu) / std`, so one table serves every
+        bandwidth. Use `normal_table` to share it between distributions and optimizers.
+
+        Only the CDF is tabulated. The pdf is a single vectorised `exp`, which is faster than an
+        interpolation, while `erf` is often not vectorised.
+
+        Attributes
+        ----------
+        step : float
+            The spacing of the table
+        cutoff : float
+            The table covers [-cutoff, cutoff]. Outside it the end values are used
+        max_error : float
+            The largest absolute error. Linear interpolation is within step^2 / 8 times the largest
+            second derivative of the CDF, 0.242, and the values beyond the cutoff are within Phi(-cutoff).
+            The defaults give about 3e-8
+    """
+    def __init__(self, step=1e-3, cutoff=8.0):
+        self.step = step
+        self.cutoff = cutoff
+
+        num_points = int(math.ceil(2 * cutoff / step)) + 1
+        u = -cutoff + step * np.arange(num_points)
+
+        self._cdf = (1 + erf(u / SQRT_2)) / 2
+
+        self.max_error = step ** 2 / 8 * 0.242 + (1 + math.erf(-cutoff / SQRT_2)) / 2
+
+    def cdf(self, u):
+        """ The unit normal CDF at the standardised points `u`, which may be a scalar or an array """
+        table = self._cdf
+
+        u = np.asarray(u)
+        position = np.atleast_1d(u.astype(np.float64, copy=False) * (1 / self.step))
+        position += self.cutoff / self.step
+        np.clip(position, 0, len(table) - 1, out=position)
+
+        index = position.astype(np.intp)
+        np.minimum(index, len(table) - 2, out=index)
+        position -= index
+
+        left = np.take(table, index)
+        values = np.take(table, index + 1)
+        values -= left
+        values *= position
+        values += left
+
+        return values.reshape(u.shape).astype(np.result_type(u, 1.0), copy=False)[()]
+
+
+@functools.lru_cache(maxsize=None)
+def normal_table(step=1e-3, cutoff=8.0):
+    """ Returns the `NormalTable` with this step and cutoff, building it only on the first call """
+    return NormalTable(step=step, cutoff=cutoff)
 
 
 class UnitNormal:
@@ -21,14 +85,30 @@ class UnitNormal:
 
         return np.exp(-0.5 * (scaled_x ** 2)) / C
 
+    def pdf(self, u):
+        """ The unit normal pdf at the standardised points `u` """
+        return np.exp(-0.5 * (u ** 2)) / C
+
 
 class TruncatedUnitNormal:
     unit_normal = UnitNormal()
 
-    def __init__(self, a=0, b=1):
+    def __init__(self, a=0, b=1, table=None):
+        """ Initialize the truncated unit normal kernel
+
+            Parameters
+            ----------
+            a, b : float
+                The interval the kernel is truncated to
+            table : NormalTable, optional
+                If given, the normal CDF used for the truncation mass is interpolated from the table
+                instead of being computed with `erf`, to within `table.max_error`
+        """
         self.a = a
         self.b = b
 
+        self.table = table
+
         self.c = self._Phi(self.b) - self._Phi(self.a)
 
     def __call__(self, x, mu, std, grad=False):
@@ -41,14 +121,22 @@ class TruncatedUnitNormal:
             std : float
         """
         # c = std * (self._Phi((self.b - mu) / std) - self._Phi((self.a - mu) / std))
-        c = self._Phi((self.b - mu) / std) - self._Phi((self.a - mu) / std)
+        c = self.cdf((self.b - mu) / std) - self.cdf((self.a - mu) / std)
 
         mask = (self.a <= x) * (x <= self.b)
         return self.unit_normal(x, mu, std, grad=grad) * mask[:, None] / c[None, :]
 
+    def pdf(self, u):
+        """ The untruncated unit normal pdf at the standardised points `u` """
+        return self.unit_normal.pdf(u)
+
+    def cdf(self, u):
+        """ The unit normal CDF at the standardised points `u` """
+        return self._Phi(u) if self.table is None else self.table.cdf(u)
+
     @staticmethod
     def _Phi(x):
-        return (1 + erf(x / np.sqrt(2))) / 2
+        return (1 + erf(x / SQRT_2)) / 2
 
 
 class Gaussian:
@@ -71,7 +159,7 @@ class TruncatedGaussian:
         self.a = a
         self.b = b
 
-        self.c = (self._Phi((self.b - mu) / std) - self._Phi((self.a - mu) / std))
+        self.c = float(self._Phi((self.b - mu) / std) - self._Phi((self.a - mu) / std))
 
     def __call__(self, x, grad=False):
         """ Returns the pdf evaluated at the x-points
@@ -85,4 +173,4 @@ class TruncatedGaussian:
 
     @staticmethod
     def _Phi(x):
-        return (1 + erf(x / np.sqrt(2))) / 2
+        return (1 + erf(x / SQRT_2)) / 2
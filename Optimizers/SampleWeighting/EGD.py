@@ -11,7 +11,7 @@ class EGD(SampleWeighting, ArmijoSearch, Optimizer):
 
         Attributes
         ----------
-        data : (d, n) np.ndarray
+        data : (d, n) np.ndarray or scipy.sparse matrix
             Array containing the student marks. Assumed to be d students and n questions
         integration_points : (m, ) np.ndarray
             Points to evaluate the target and base distribution at
@@ -21,12 +21,13 @@ class EGD(SampleWeighting, ArmijoSearch, Optimizer):
         e : float
             The scaling parameter for the kernel density approximation
     """
-    def __init__(self, data, integration_points, target_distribution, base_distribution=TruncatedUnitNormal(), e=0.01):
+    def __init__(self, data, integration_points, target_distribution, base_distribution=TruncatedUnitNormal(), e=0.01,
+                 dtype=None, inplace=False, kde="direct"):
         """ Initialize the EGD Optimizer class
 
             Parameters
             ----------
-            data : (d, n) np.ndarray
+            data : (d, n) np.ndarray or scipy.sparse matrix
                 Array containing the student marks. Assumed to be d students and n questions
             integration_points : (m + 1, ) np.ndarray
                 Points to evaluate the target and base distribution at
@@ -35,6 +36,19 @@ class EGD(SampleWeighting, ArmijoSearch, Optimizer):
                 The base distribution used in the kernel density approximation
             e : float
                 The scaling parameter for the kernel density approximation
+            dtype : np.dtype, optional
+                The floating point type used for all arithmetic, e.g. np.float32. If not given,
+                float64 tolerances are used
+            inplace : bool
+                If True, the weights are written into a preallocated workspace instead of being allocated
+                each iteration. Points returned by `search` are then reused two iterations later, so copy
+                any that need to be kept
+            kde : str
+                One of "direct", "binned" or "banded". The binned KDE evaluates the density and its
+                gradient by linear binning and an FFT convolution, which is much faster for many
+                students, but requires evenly spaced integration points. The banded KDE only evaluates
+                the kernel within 8 bandwidths of each integration point, changing the density by at most
+                about 1e-14 / e
 
             Notes
             -----
@@ -42,9 +56,10 @@ class EGD(SampleWeighting, ArmijoSearch, Optimizer):
             only store `integration_points[:-1]`, that is, everything except the last point
         """
         SampleWeighting.__init__(self, data, integration_points, target_distribution,
-                                 base_distribution=base_distribution, e=e)
+                                 base_distribution=base_distribution, e=e, dtype=dtype,
+                                 inplace=inplace, kde=kde)
 
-    def update(self, x, d, step_size):
+    def update(self, x, d, step_size, out=None):
         """ Perform a step using the EGD scheme
 
             Parameters
@@ -54,14 +69,22 @@ class EGD(SampleWeighting, ArmijoSearch, Optimizer):
             d : (n, ) np.ndarray
                 The direction to take
             step_size : float
+            out : (n, ) np.ndarray, optional
+                If given, the new point is written into `out` instead of a new array
 
             Returns
             -------
             (n, ) np.ndarray
                 The point after the step has been taken
         """
-        z = x * np.exp(-step_size * d)
-        return z / np.sum(z)
+        if out is None:
+            z = x * np.exp(-step_size * d)
+            return z / np.sum(z)
+
+        z = np.exp(np.multiply(d, -step_size, out=out), out=out)
+        z *= x
+
+        return np.divide(z, np.sum(z), out=z)
 
     def search(self, x, step_size=1, c1=1e-4, c2=0.5, max_iter=100):
         """ Perform a step using the Cauchy-Simplex scheme using the optimal step size
@@ -88,8 +111,21 @@ class EGD(SampleWeighting, ArmijoSearch, Optimizer):
             -----
             The step size is determined through an Armijo line search
         """
-        d = self.f(x, grad=True)
+        self.telemetry.begin()
+
+        f0, d = self.value_and_grad(x)
+        self.record_gradient(x, d)
+        self.telemetry.lap('gradient')
+
+        out = None if self.workspace is None else self.workspace.output(x, dtype=np.result_type(x, d))
         step_size = self.backtracking_armijo_line_search(x, d, step_size,
-                                                         c1=c1, c2=c2, max_iter=max_iter)
+                                                         c1=c1, c2=c2, max_iter=max_iter,
+                                                         f0=f0, grad0=d, out=out)
+        self.telemetry.lap('line_search')
+
+        x_new = self.update(x, d, step_size, out=out)
+        self.telemetry.lap('update')
+
+        self.telemetry.end(x, x_new, grad=d, step_size=step_size, objective=lambda: f0)
 
-        return self.update(x, d, step_size)
+        return x_new
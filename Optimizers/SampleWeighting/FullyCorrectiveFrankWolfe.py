@@ -0,0 +1,186 @@
+import numpy as np
+
+from .AwayStepFrankWolfe import AwayStepFrankWolfe
+from .CauchySimplex import CauchySimplex
+
+from .Distributions import TruncatedUnitNormal
+
+
+class FullyCorrectiveFrankWolfe(AwayStepFrankWolfe):
+    """ Optimal question weighting using the Fully-Corrective FW Optimizer
+
+        Away-Step FW steps are taken, and every `correct_every` steps the weights are re-optimised over
+        the active questions only, using Cauchy-Simplex on those columns of `data`.
+
+        Attributes
+        ----------
+        data : (d, n) np.ndarray or scipy.sparse matrix
+            Array containing the student marks. Assumed to be d students and n questions
+        integration_points : (m, ) np.ndarray
+            Points to evaluate the target and base distribution at
+        target_distribution : Distributions.TruncatedGaussian or Distributions.Gaussian
+        base_distribution : Distributions.TruncatedUnitNormal or Distributions.UnitNormal
+            The base distribution used in the kernel density approximation
+        e : float
+            The scaling parameter for the kernel density approximation
+        tol : float
+            Tolerance for the zero-set
+        correct_every : int
+            The number of steps between corrections
+        corrective_iter : int
+            The maximum number of Cauchy-Simplex iterations in each correction
+    """
+    def __init__(self, data, integration_points, target_distribution, base_distribution=TruncatedUnitNormal(),
+                 e=0.01, tol=None, dtype=None, correct_every=10, corrective_iter=20,
+                 inplace=False, kde="direct"):
+        """ Initialize the Fully-Corrective FW Optimizer class
+
+            Parameters
+            ----------
+            data : (d, n) np.ndarray or scipy.sparse matrix
+                Array containing the student marks. Assumed to be d students and n questions
+            integration_points : (m + 1, ) np.ndarray
+                Points to evaluate the target and base distribution at
+            target_distribution : Distributions.TruncatedGaussian or Distributions.Gaussian
+            base_distribution : Distributions.TruncatedUnitNormal or Distributions.UnitNormal
+                The base distribution used in the kernel density approximation
+            e : float
+                The scaling parameter for the kernel density approximation
+            tol : float, optional
+                Tolerance for the zero-set. Defaults to 1e-10, scaled to the precision of `dtype`
+            dtype : np.dtype, optional
+                The floating point type used for all arithmetic, e.g. np.float32. If not given,
+                float64 tolerances are used
+            correct_every : int
+                The number of steps between corrections
+            corrective_iter : int
+                The maximum number of Cauchy-Simplex iterations in each correction
+            inplace : bool
+                If True, the weights are written into a preallocated workspace instead of being
+                allocated each iteration. Points returned by `search` are then reused two iterations
+                later, so copy any that need to be kept
+            kde : str
+                One of "direct", "binned" or "banded". The binned KDE evaluates the density and its
+                gradient by linear binning and an FFT convolution, which is much faster for many
+                students, but requires evenly spaced integration points. The banded KDE only evaluates
+                the kernel within 8 bandwidths of each integration point, changing the density by at most
+                about 1e-14 / e
+
+            Notes
+            -----
+            The given `integration_points` is not the same as the `integration_points` attribute, as we
+            only store `integration_points[:-1]`, that is, everything except the last point
+        """
+        AwayStepFrankWolfe.__init__(self, data, integration_points, target_distribution,
+                                    base_distribution=base_distribution, e=e, tol=tol, dtype=dtype,
+                                    inplace=inplace, kde=kde)
+        self.correct_every = correct_every
+        self.corrective_iter = corrective_iter
+
+        self._steps = 0
+        self._corrector = None
+        self._corrector_active = None
+
+    def search(self, x, c1=1e-4, c2=0.5, max_iter=100):
+        """ Perform an Away-Step FW step, followed by a correction every `correct_every` steps
+
+            Parameters
+            ----------
+            x : (n, ) np.ndarray
+                The starting point to take the step
+            c1 : float
+                Parameter for the armijo line search
+            c2 : float
+                Parameter for the armijo line search
+            max_iter : int
+                Maximum iterations for the armijo line search
+
+            Returns
+            -------
+            (n, ) np.ndarray
+                The point after the step has been taken
+        """
+        self.telemetry.begin()
+
+        x_new = AwayStepFrankWolfe.search(self, x, c1=c1, c2=c2, max_iter=max_iter)
+
+        self._steps += 1
+        if self._steps % self.correct_every == 0:
+            # The corrected point is written over neither `x` nor `x_new`
+            out = None if self.workspace is None else self.workspace.output(x, name='corrected')
+            x_new = self.correct(x_new, c1=c1, c2=c2, max_iter=max_iter, out=out)
+            self.telemetry.lap('correction')
+
+        self.telemetry.end(x, x_new)
+
+        return x_new
+
+    def correct(self, x, c1=1e-4, c2=0.5, max_iter=100, out=None):
+        """ Re-optimise the weights of `x` over its active questions
+
+            Parameters
+            ----------
+            x : (n, ) np.ndarray
+                A point in the probability simplex
+            c1 : float
+                Parameter for the armijo line search
+            c2 : float
+                Parameter for the armijo line search
+            max_iter : int
+                Maximum iterations for the armijo line search
+            out : (n, ) np.ndarray, optional
+                If given, the re-optimised point is written into `out` instead of a new array. It must
+                not be `x`
+
+            Returns
+            -------
+            (n, ) np.ndarray
+                The re-optimised point, whose support is contained in the support of `x`
+        """
+        active = self.active_set(x)
+        optimizer = self.corrector(active)
+
+        search_kwargs = {'c1': c1, 'c2': c2, 'max_iter': max_iter}
+        w_active = optimizer.solve(x[active] / np.sum(x[active]), max_iter=self.corrective_iter,
+                                   search_kwargs=search_kwargs).w
+
+        keep = w_active > self.tol
+        active = active[keep]
+
+        if out is None:
+            w = np.zeros_like(x)
+        else:
+            w = out
+            w.fill(0)
+        w[active] = w_active[keep] / np.sum(w_active[keep])
+
+        self._active = (w, active)
+        return w
+
+    def corrector(self, active):
+        """ Returns the Cauchy-Simplex optimizer used by `correct`, restricted to the questions `active`
+
+            The optimizer is created once, and re-sliced to the active questions for every correction
+            whose active questions differ from the last, so the target density and the KDE are not
+            rebuilt. It shares the telemetry of this optimizer, so the work of the corrections is
+            recorded in the steps that make them.
+        """
+        optimizer = self._corrector
+        # A copy made by `astype` shares the corrector, which is then of the wrong dtype
+        if optimizer is None or optimizer.dtype != self.dtype:
+            # Only integration_points[:-1] is stored, so the last point is recovered from dx
+            integration_points = np.append(self.integration_points, self.integration_points[-1] + self.dx[-1])
+            optimizer = CauchySimplex(self.data[:, active], integration_points, self.target_distribution,
+                                      base_distribution=self.base_distribution, e=self.e, tol=self.tol,
+                                      dtype=self.dtype, inplace=self.workspace is not None, kde=self.kde_method)
+            self._corrector = optimizer
+            self._corrector_active = None
+
+        if not np.array_equal(active, self._corrector_active):
+            optimizer.data = self.data[:, active]
+            self._corrector_active = active
+
+        optimizer.tol = self.tol
+        optimizer.telemetry = self.telemetry
+
+        return optimizer
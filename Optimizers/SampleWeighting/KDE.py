@@ -0,0 +1,326 @@
+import math
+
+import numpy as np
+from scipy import fft, sparse
+
+from .Distributions import C, TruncatedUnitNormal, UnitNormal
+
+
+KDE_METHODS = ("direct", "binned", "banded")
+
+
+def make_kde(method, base_distribution, e, integration_points, dx):
+    """ Returns the KDE engine for `method`, which is one of "direct", "binned" or "banded" """
+    if method == "direct":
+        return DirectKDE(base_distribution, e, integration_points)
+    elif method == "binned":
+        return BinnedKDE(base_distribution, e, integration_points, dx)
+    elif method == "banded":
+        return BandedKDE(base_distribution, e, integration_points)
+
+    raise ValueError(f"kde can only be one of {KDE_METHODS}, got {method!r}.")
+
+
+class DirectKDE:
+    """ Kernel density estimation by evaluating the kernel between every integration point and student
+
+        Each evaluation builds an (m, num_students) kernel matrix, so it costs O(m num_students), and
+        the gradient O(m num_students n).
+    """
+    def __init__(self, base_distribution, e, integration_points):
+        self.base_distribution = base_distribution
+        self.e = e
+        self.integration_points = integration_points
+
+    def density(self, scores):
+        """ The KDE of `scores` evaluated at the integration points """
+        return np.mean(self.base_distribution(self.integration_points, scores, self.e), axis=1) / self.e
+
+    def density_gradient(self, scores, data):
+        """ The gradient of `density` with respect to the weights, where `scores = data @ w` """
+        C_ = - 1 / (len(scores) * (self.e ** 2))
+        return C_ * self.base_distribution(self.integration_points, scores, self.e, grad=True) @ data
+
+    def density_and_gradient(self, scores, data):
+        """ Returns `density(scores)` and `density_gradient(scores, data)`
+
+            The derivative of the normal kernels is `-scaled_x` times the kernel, so for them the kernel
+            matrix, and its exponentials, are only evaluated once
+        """
+        if not isinstance(self.base_distribution, (UnitNormal, TruncatedUnitNormal)):
+            return self.density(scores), self.density_gradient(scores, data)
+
+        kernel = self.base_distribution(self.integration_points, scores, self.e)
+        density = np.mean(kernel, axis=1) / self.e
+
+        kernel *= (scores[None, :] - self.integration_points[:, None]) / self.e
+        C_ = - 1 / (len(scores) * (self.e ** 2))
+        return density, C_ * kernel @ data
+
+
+class BinnedKDE:
+    """ Kernel density estimation by linear binning and an FFT convolution with the kernel
+
+        The scores are linearly binned onto a regular grid that contains the integration points, and
+        the binned counts are convolved with the kernel sampled on the same grid. An evaluation then
+        costs O(num_students + m log m), and the gradient bins every question's column of `data`,
+        costing O(num_students n + n m log m).
+
+        Attributes
+        ----------
+        base_distribution : Distributions.TruncatedUnitNormal or Distributions.UnitNormal
+        e : float
+            The scaling parameter for the kernel density approximation
+        integration_points : (m, ) np.ndarray
+            The points the density is evaluated at, which must be evenly spaced
+        oversample : int
+            The number of bins between consecutive integration points
+        cutoff : float
+            The kernel is truncated at `cutoff * e`, beyond which it is below 1e-14 for the default
+
+        Notes
+        -----
+        Linear binning has an error of order (bin width / e)^2, so the bins are made at most
+        `e / bins_per_e` wide by placing `oversample` bins between each pair of integration points.
+        Scores more than `cutoff * e` outside the integration points are dropped, as their kernel is
+        truncated to zero at every integration point.
+    """
+    def __init__(self, base_distribution, e, integration_points, dx, bins_per_e=16, cutoff=8.0):
+        if not isinstance(base_distribution, (UnitNormal, TruncatedUnitNormal)):
+            raise ValueError("The binned KDE only supports UnitNormal and TruncatedUnitNormal base distributions.")
+
+        spacing = float(np.mean(dx))
+        if not np.allclose(dx, spacing, rtol=1e-3, atol=0):
+            raise ValueError("The binned KDE requires evenly spaced integration points.")
+
+        self.base_distribution = base_distribution
+        self.e = e
+        self.integration_points = integration_points
+        self.cutoff = cutoff
+
+        self.oversample = max(1, math.ceil(spacing * bins_per_e / e))
+        self.bin_width = spacing / self.oversample
+
+        # The bins cover the integration points, and `cutoff * e` either side of them
+        self.radius = math.ceil(cutoff * e / self.bin_width)
+        self.start = float(integration_points[0]) - self.radius * self.bin_width
+        self.num_bins = (len(integration_points) - 1) * self.oversample + 1 + 2 * self.radius
+
+        offsets = np.arange(-self.radius, self.radius + 1) * (self.bin_width / e)
+        kernel = np.exp(-0.5 * offsets ** 2) / C
+        kernel_grad = -(offsets / C) * np.exp(-0.5 * offsets ** 2)
+
+        self._fft_size = fft.next_fast_len(self.num_bins + 2 * self.radius)
+        self._kernel = fft.rfft(kernel, self._fft_size)
+        self._kernel_grad = fft.rfft(kernel_grad, self._fft_size)
+
+        self._mask = truncation_mask(base_distribution, integration_points)
+
+    def density(self, scores):
+        """ The KDE of `scores` evaluated at the integration points """
+        rows, weights = self._bins(scores)
+        return self._density(np.bincount(rows, weights=weights, minlength=self.num_bins), len(scores))
+
+    def density_gradient(self, scores, data):
+        """ The gradient of `density` with respect to the weights, where `scores = data @ w` """
+        return self._density_gradient(self.binning_matrix(scores), data)
+
+    def density_and_gradient(self, scores, data):
+        """ Returns `density(scores)` and `density_gradient(scores, data)`, binning the scores once """
+        binning = self.binning_matrix(scores)
+        binned = np.asarray(binning.sum(axis=1)).reshape(-1)
+
+        return self._density(binned, len(scores)), self._density_gradient(binning, data)
+
+    def _density(self, binned, num_students):
+        return self._masked(self.convolve(binned, self._kernel) / (num_students * self.e))
+
+    def _density_gradient(self, binning, data):
+        binned = binning @ data
+        binned = binned.toarray() if sparse.issparse(binned) else np.asarray(binned)
+
+        density_gradient = self.convolve(binned, self._kernel_grad) * (-1 / (binning.shape[1] * self.e ** 2))
+        return self._masked(density_gradient)
+
+    def binning_matrix(self, scores):
+        """ Returns the (num_bins, num_students) sparse matrix that linearly bins each student at its score,
+            scaled by its weight. Binning a column of per-student values is a product with this matrix
+        """
+        rows, weights, columns = self._bins(scores, columns=True)
+        return sparse.csr_matrix((weights, (rows, columns)), shape=(self.num_bins, len(scores)))
+
+    def _bins(self, scores, columns=False):
+        """ The two bins of each student that are inside the grid, and the weight of the student in each """
+        position = (np.asarray(scores, dtype=np.float64) - self.start) / self.bin_width
+        left = np.floor(position).astype(np.int64)
+        fraction = position - left
+
+        rows = np.concatenate([left, left + 1])
+        weights = np.concatenate([1 - fraction, fraction])
+
+        student_weights = truncation_weights(self.base_distribution, np.asarray(scores, dtype=np.float64), self.e)
+        if student_weights is not None:
+            weights *= np.tile(student_weights, 2)
+
+        inside = (rows >= 0) & (rows < self.num_bins)
+        if not columns:
+            return rows[inside], weights[inside]
+        return rows[inside], weights[inside], np.tile(np.arange(len(scores)), 2)[inside]
+
+    def convolve(self, binned, kernel_fft):
+        """ Convolve the binned values with the kernel, and return the result at the integration points """
+        kernel_fft = kernel_fft if binned.ndim == 1 else kernel_fft[:, None]
+        convolved = fft.irfft(fft.rfft(binned, self._fft_size, axis=0) * kernel_fft, self._fft_size, axis=0)
+
+        # The k-th integration point is bin `radius + k * oversample`, and the full convolution shifts
+        # it by another `radius`, the centre of the kernel
+        stop = 2 * self.radius + (len(self.integration_points) - 1) * self.oversample + 1
+        return convolved[2 * self.radius:stop:self.oversample].astype(self.integration_points.dtype, copy=False)
+
+    def _masked(self, values):
+        return _masked(values, self._mask)
+
+
+class BandedKDE:
+    """ Kernel density estimation with the kernel truncated to `cutoff * e`, as a sparse banded matrix
+
+        Once sorted, the students within `cutoff * e` of an integration point are a contiguous range, so
+        the non-negligible entries of the (m, num_students) kernel matrix are found by a binary search per
+        integration point and evaluated alone. Time and memory then scale with num_students times the
+        number of integration points within `cutoff * e` of a score, rather than num_students times m.
+
+        Attributes
+        ----------
+        base_distribution : Distributions.TruncatedUnitNormal or Distributions.UnitNormal
+        e : float
+            The scaling parameter for the kernel density approximation
+        integration_points : (m, ) np.ndarray
+            The points the density is evaluated at
+        cutoff : float
+            The number of bandwidths `e` beyond which the kernel is treated as zero
+
+        Notes
+        -----
+        Every dropped entry has a kernel below phi(cutoff), and a kernel derivative below
+        cutoff * phi(cutoff) for cutoff >= 1, where phi is the unit normal pdf. So the density is
+        within `error_bound` of the untruncated one, scaled by the largest 1 / c for the truncated
+        kernel, and each entry of its gradient within `error_bound * cutoff / e` times the largest
+        entry of `data`. The default cutoff of 8 gives an `error_bound` of about 5e-15 / e.
+    """
+    def __init__(self, base_distribution, e, integration_points, cutoff=8.0):
+        if not isinstance(base_distribution, (UnitNormal, TruncatedUnitNormal)):
+            raise ValueError("The banded KDE only supports UnitNormal and TruncatedUnitNormal base distributions.")
+
+        self.base_distribution = base_distribution
+        self.e = e
+        self.integration_points = integration_points
+        self.cutoff = cutoff
+
+        self._mask = truncation_mask(base_distribution, integration_points)
+
+    @property
+    def error_bound(self):
+        """ The largest error in the density, before the truncated kernel's 1 / c, from the dropped entries """
+        return math.exp(-0.5 * self.cutoff ** 2) / (C * self.e)
+
+    def density(self, scores):
+        """ The KDE of `scores` evaluated at the integration points """
+        rows, _, _, kernel = self.kernel_entries(scores)
+        return self._density(rows, kernel, len(scores))
+
+    def density_gradient(self, scores, data):
+        """ The gradient of `density` with respect to the weights, where `scores = data @ w` """
+        return self._density_gradient(self.kernel_matrix(scores, grad=True), data)
+
+    def density_and_gradient(self, scores, data):
+        """ Returns `density(scores)` and `density_gradient(scores, data)`, evaluating the band and its
+            exponentials once, as the derivative of the kernel is `-scaled_x` times the kernel
+        """
+        rows, columns, scaled_x, kernel = self.kernel_entries(scores)
+        density = self._density(rows, kernel, len(scores))
+
+        kernel *= -scaled_x
+        return density, self._density_gradient(self._csr(rows, columns, kernel, len(scores)), data)
+
+    def _density(self, rows, kernel, num_students):
+        density = np.bincount(rows, weights=kernel, minlength=len(self.integration_points)) / (num_students * self.e)
+        return _masked(density.astype(self.integration_points.dtype, copy=False), self._mask)
+
+    def _density_gradient(self, kernel_matrix, data):
+        density_gradient = kernel_matrix @ data
+        density_gradient = density_gradient.toarray() if sparse.issparse(density_gradient) else density_gradient
+
+        return _masked(density_gradient * (-1 / (kernel_matrix.shape[1] * self.e ** 2)), self._mask)
+
+    def kernel_matrix(self, scores, grad=False):
+        """ Returns the (m, num_students) sparse matrix of the kernel, or its derivative, truncated to the band """
+        rows, columns, scaled_x, kernel = self.kernel_entries(scores)
+        if grad:
+            kernel *= -scaled_x
+
+        return self._csr(rows, columns, kernel, len(scores))
+
+    def kernel_entries(self, scores):
+        """ The integration point, student, scaled difference and kernel value of every entry in the band """
+        rows, columns, scaled_x = self.band(scores)
+
+        kernel = self.base_distribution.pdf(scaled_x)
+
+        weights = truncation_weights(self.base_distribution, scores, self.e)
+        if weights is not None:
+            kernel *= weights[columns]
+
+        return rows, columns, scaled_x, kernel
+
+    def _csr(self, rows, columns, values, num_students):
+        # The entries are already ordered by row, so the CSR structure is known without sorting
+        indptr = np.concatenate([[0], np.cumsum(np.bincount(rows, minlength=len(self.integration_points)))])
+        return sparse.csr_matrix((values, columns, indptr), shape=(len(self.integration_points), num_students))
+
+    def band(self, scores):
+        """ Returns the integration point and student of every pair within `cutoff * e`, and their scaled
+            difference `(x - score) / e`
+        """
+        order = np.argsort(scores, kind='stable')
+        sorted_scores = scores[order]
+
+        x = self.integration_points
+        radius = self.cutoff * self.e
+        lower = np.searchsorted(sorted_scores, x - radius, side='left')
+        upper = np.searchsorted(sorted_scores, x + radius, side='right')
+
+        counts = upper - lower
+        rows = np.repeat(np.arange(len(x)), counts)
+
+        # The position in `sorted_scores` of each entry, counting up from `lower` within each row
+        starts = np.cumsum(counts) - counts
+        positions = np.arange(counts.sum()) + np.repeat(lower - starts, counts)
+
+        columns = order[positions]
+        scaled_x = (x[rows] - sorted_scores[positions]) / self.e
+
+        return rows, columns, scaled_x
+
+
+def truncation_mask(base_distribution, x):
+    """ The indicator of [a, b] at `x` for the truncated kernel, or None """
+    if not isinstance(base_distribution, TruncatedUnitNormal):
+        return None
+    return ((base_distribution.a <= x) & (x <= base_distribution.b)).astype(x.dtype)
+
+
+def truncation_weights(base_distribution, scores, e):
+    """ The weight 1 / c of each student for the truncated kernel, with c the probability mass of the
+        student's kernel inside [a, b], or None
+    """
+    if not isinstance(base_distribution, TruncatedUnitNormal):
+        return None
+
+    a, b = base_distribution.a, base_distribution.b
+    return 1 / (base_distribution.cdf((b - scores) / e) - base_distribution.cdf((a - scores) / e))
+
+
+def _masked(values, mask):
+    if mask is None:
+        return values
+    return values * (mask if values.ndim == 1 else mask[:, None])
@@ -1,6 +1,6 @@
 import numpy as np
 
-from Optimizers import ArmijoSearch, Optimizer
+from Optimizers import ArmijoSearch, Optimizer, kernels
 from .SampleWeighting import SampleWeighting
 
 from .Distributions import TruncatedUnitNormal
@@ -11,7 +11,7 @@ class PairwiseFrankWolfe(SampleWeighting, ArmijoSearch, Optimizer):
 
         Attributes
         ----------
-        data : (d, n) np.ndarray
+        data : (d, n) np.ndarray or scipy.sparse matrix
             Array containing the student marks. Assumed to be d students and n questions
         integration_points : (m, ) np.ndarray
             Points to evaluate the target and base distribution at
@@ -24,12 +24,13 @@ class PairwiseFrankWolfe(SampleWeighting, ArmijoSearch, Optimizer):
             Tolerance for the zero-set
     """
     def __init__(self, data, integration_points, target_distribution, base_distribution=TruncatedUnitNormal(),
-                 e=0.01, tol=1e-10):
+                 e=0.01, tol=None, dtype=None, backend="numpy", inplace=False,
+                 kde="direct"):
         """ Initialize the PFW Optimizer class
 
             Parameters
             ----------
-            data : (d, n) np.ndarray
+            data : (d, n) np.ndarray or scipy.sparse matrix
                 Array containing the student marks. Assumed to be d students and n questions
             integration_points : (m + 1, ) np.ndarray
                 Points to evaluate the target and base distribution at
@@ -38,8 +39,24 @@ class PairwiseFrankWolfe(SampleWeighting, ArmijoSearch, Optimizer):
                 The base distribution used in the kernel density approximation
             e : float
                 The scaling parameter for the kernel density approximation
-            tol : float
-                Tolerance for the zero-set
+            tol : float, optional
+                Tolerance for the zero-set. Defaults to 1e-10, scaled to the precision of `dtype`
+            dtype : np.dtype, optional
+                The floating point type used for all arithmetic, e.g. np.float32. If not given,
+                float64 tolerances are used
+            backend : str
+                Either "numpy" or "numba". The Numba backend chooses the index pair with a compiled
+                single-pass kernel. It falls back to NumPy with a warning if Numba is not installed
+            inplace : bool
+                If True, the weights and the search direction are written into a preallocated workspace
+                instead of being allocated each iteration. Points returned by `search` are then
+                reused two iterations later, so copy any that need to be kept
+            kde : str
+                One of "direct", "binned" or "banded". The binned KDE evaluates the density and its
+                gradient by linear binning and an FFT convolution, which is much faster for many
+                students, but requires evenly spaced integration points. The banded KDE only evaluates
+                the kernel within 8 bandwidths of each integration point, changing the density by at most
+                about 1e-14 / e
 
             Notes
             -----
@@ -47,10 +64,12 @@ class PairwiseFrankWolfe(SampleWeighting, ArmijoSearch, Optimizer):
             only store `integration_points[:-1]`, that is, everything except the last point
         """
         SampleWeighting.__init__(self, data, integration_points, target_distribution,
-                                 base_distribution=base_distribution, e=e)
+                                 base_distribution=base_distribution, e=e, dtype=dtype,
+                                 inplace=inplace, kde=kde)
         self.tol = tol
+        self.backend = kernels.resolve_backend(backend)
 
-    def update(self, x, d, step_size):
+    def update(self, x, d, step_size, out=None):
         """ Perform a step using the PFW scheme
 
             Parameters
@@ -60,6 +79,8 @@ class PairwiseFrankWolfe(SampleWeighting, ArmijoSearch, Optimizer):
             d : tuple
                 2-tuple containing the ('to', 'from') index pair
             step_size : float
+            out : (n, ) np.ndarray, optional
+                If given, the new point is written into `out` instead of a copy of `x`
 
             Returns
             -------
@@ -68,7 +89,11 @@ class PairwiseFrankWolfe(SampleWeighting, ArmijoSearch, Optimizer):
         """
         s_index, v_index = d
 
-        w = x.copy()
+        if out is None:
+            w = x.copy()
+        else:
+            w = out
+            np.copyto(w, x)
         alpha = w[v_index]
 
         w[s_index] += step_size * alpha
@@ -99,15 +124,32 @@ class PairwiseFrankWolfe(SampleWeighting, ArmijoSearch, Optimizer):
             -----
             The step size is determined through an Armijo line search
         """
-        grad = self.f(x, grad=True)
+        self.telemetry.begin()
+
+        f0, grad = self.value_and_grad(x)
+        self.record_gradient(x, grad)
+        self.telemetry.lap('gradient')
 
-        d = self.frank_wolfe_pair(x, grad, tol=self.tol)
+        if self.backend == "numba":
+            d = kernels.frank_wolfe_pair(x, grad, self.tol)
+        else:
+            d = self.frank_wolfe_pair(x, grad, tol=self.tol)
+        self.telemetry.lap('direction')
+
+        out = None if self.workspace is None else self.workspace.output(x)
 
         max_step_size = 1
         step_size = self.backtracking_armijo_line_search(x, d, max_step_size,
-                                                         c1=c1, c2=c2, max_iter=max_iter)
+                                                         c1=c1, c2=c2, max_iter=max_iter,
+                                                         f0=f0, grad0=grad, out=out)
+        self.telemetry.lap('line_search')
+
+        x_new = self.update(x, d, step_size, out=out)
+        self.telemetry.lap('update')
+
+        self.telemetry.end(x, x_new, grad=grad, step_size=step_size, objective=lambda: f0)
 
-        return self.update(x, d, step_size)
+        return x_new
 
     @staticmethod
     def frank_wolfe_pair(x, grad, tol=1e-10):
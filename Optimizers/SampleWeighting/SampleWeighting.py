@@ -1,45 +1,100 @@
+import copy
+
 import numpy as np
 
+from Optimizers.utils import as_dtype, dtype_tolerances
+from Optimizers.Workspace import Workspace
+from .KDE import make_kde
+
 
 class SampleWeighting:
-    def __init__(self, data, integration_points, target_distribution, base_distribution, e=0.01):
-        self.num_students = len(data)
+    def __init__(self, data, integration_points, target_distribution, base_distribution, e=0.01, dtype=None,
+                 inplace=False, kde="direct"):
+        self.dtype = np.dtype(np.float64 if dtype is None else dtype)
+
+        self.num_students = data.shape[0]
 
-        self.data = data
+        self.data = as_dtype(data, dtype)
 
+        integration_points = as_dtype(integration_points, dtype)
         self.integration_points = integration_points[:-1]
         self.dx = integration_points[1:] - integration_points[:-1]
 
         self.target_distribution = target_distribution
+        self.target_density = target_distribution(self.integration_points)
 
         self.e = e
 
         self.base_distribution = base_distribution
 
+        self.workspace = Workspace() if inplace else None
+
+        self.kde_method = kde
+        self.kde = make_kde(kde, base_distribution, e, self.integration_points, self.dx)
+
+    @property
+    def tol(self):
+        """ The tolerance for the zero-set, which defaults to a value scaled to `dtype` """
+        tol = getattr(self, '_tol', None)
+        return dtype_tolerances(self.dtype)[0] if tol is None else tol
+
+    @tol.setter
+    def tol(self, tol):
+        self._tol = tol
+
+    @property
+    def min_step_diff(self):
+        """ The guard used by `max_step_size`, scaled to `dtype` """
+        return dtype_tolerances(self.dtype)[1]
+
+    def astype(self, dtype):
+        """ Returns a copy with the data and integration points cast to `dtype` """
+        optimizer = copy.copy(self)
+
+        optimizer.dtype = np.dtype(dtype)
+        optimizer.data = as_dtype(self.data, dtype)
+        optimizer.integration_points = as_dtype(self.integration_points, dtype)
+        optimizer.dx = as_dtype(self.dx, dtype)
+        optimizer.target_density = self.target_distribution(optimizer.integration_points)
+
+        if self.workspace is not None:
+            optimizer.workspace = Workspace()
+
+        optimizer.kde = make_kde(self.kde_method, self.base_distribution, self.e, optimizer.integration_points,
+                                 optimizer.dx)
+
+        return optimizer
+
     def f(self, w, grad=False):
+        if grad:
+            return self.value_and_grad(w)[1]
+
+        self.telemetry.count('f_evals')
+
         rho = self.rho(w)
-        rho_grad = self.rho(w, grad=True) if grad else None
-        f = self.target_distribution(self.integration_points)
-        dx = self.dx
+        return (rho * self.safe_log(rho / self.target_density)) @ self.dx
 
-        if grad:
-            return (dx * (self.safe_log(rho / f) + 1)) @ rho_grad
+    def value_and_grad(self, w):
+        """ Returns the objective and its gradient at `w`, evaluating the kernel density once for both """
+        self.telemetry.count('f_evals')
+        self.telemetry.count('grad_evals')
+
+        rho, rho_grad = self.kde.density_and_gradient(self.data @ w, self.data)
+        log_ratio = self.safe_log(rho / self.target_density)
 
-        return (rho * self.safe_log(rho / f)) @ dx
+        return (rho * log_ratio) @ self.dx, (self.dx * (log_ratio + 1)) @ rho_grad
 
     def __call__(self, w, grad=False):
         return self.f(w, grad=grad)
 
     def rho(self, w, grad=False):
-        """ Kernel Density Estimation evaluated at the integration_points """
+        """ Kernel Density Estimation evaluated at the integration_points, computed by `kde` """
         X = self.data @ w
-        x = self.integration_points
 
         if grad:
-            C = - 1 / (self.num_students * (self.e ** 2))
-            return C * self.base_distribution(x, X, self.e, grad=True) @ self.data
+            return self.kde.density_gradient(X, self.data)
 
-        return np.mean(self.base_distribution(x, X, self.e), axis=1) / self.e
+        return self.kde.density(X)
 
     @staticmethod
     def safe_log(x):
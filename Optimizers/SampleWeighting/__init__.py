@@ -1,3 +1,5 @@
 from .CauchySimplex import CauchySimplex
 from .EGD import EGD
 from .PairwiseFrankWolfe import PairwiseFrankWolfe
+from .AwayStepFrankWolfe import AwayStepFrankWolfe
+from .FullyCorrectiveFrankWolfe import FullyCorrectiveFrankWolfe
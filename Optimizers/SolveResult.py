@@ -0,0 +1,44 @@
+import numpy as np
+
+
+class SolveResult:
+    """ The result of `Optimizer.solve`
+
+        The batch optimizers return the (k, n) weights of all their queries, with the objective,
+        iterations and status of each query given as (k, ) arrays
+
+        Attributes
+        ----------
+        w : (n, ) np.ndarray
+            The final weights
+        f : float
+            The objective evaluated at `w`
+        iterations : int
+            The number of calls made to `search`
+        time : float
+            The wall time of the solve in seconds
+        status : str
+            The reason the solve stopped. One of 'converged', 'max_iter' or 'time_budget'
+    """
+    def __init__(self, w, f, iterations, time, status):
+        self.w = w
+        self.f = f
+        self.iterations = iterations
+        self.time = time
+        self.status = status
+
+    @property
+    def converged(self):
+        if isinstance(self.status, str):
+            return self.status == "converged"
+        return np.asarray(self.status) == "converged"
+
+    def __repr__(self):
+        if np.ndim(self.f) > 0:
+            statuses, counts = np.unique(self.status, return_counts=True)
+            status = ", ".join(f"'{status}': {count}" for status, count in zip(statuses, counts))
+            return (f"SolveResult(max_f={np.max(self.f):.5e}, max_iterations={np.max(self.iterations)}, "
+                    f"time={self.time:.3e}, status={{{status}}})")
+
+        return (f"SolveResult(f={self.f:.5e}, iterations={self.iterations}, "
+                f"time={self.time:.3e}, status='{self.status}')")
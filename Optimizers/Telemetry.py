@@ -0,0 +1,195 @@
+import collections
+import json
+import time
+
+import numpy as np
+
+
+PHASES = ('gradient', 'direction', 'line_search', 'update')
+
+
+class NullTelemetry:
+    """ Telemetry that discards everything. This is the default of every optimizer, so the hooks in
+        `search` cost a few empty method calls when telemetry is disabled
+    """
+    enabled = False
+
+    def begin(self):
+        pass
+
+    def lap(self, phase):
+        pass
+
+    def count(self, name, n=1):
+        pass
+
+    def end(self, x, x_new, grad=None, step_size=None, objective=None):
+        pass
+
+    def close(self):
+        pass
+
+
+class Telemetry(NullTelemetry):
+    """ Records one entry per call to `search`, and writes it to a sink
+
+        Each record contains
+            iteration : the number of records written before this one
+            objective : the objective at the start of the iteration, if it is being recorded
+            gap : the Frank-Wolfe duality gap `grad @ x - min(grad)` at the start of the iteration
+            support_size : the number of non-zero weights after the iteration
+            step_size : the step size chosen by the iteration
+            f_evals, grad_evals : the number of objective and gradient evaluations
+            backtracks : the number of step size reductions in the Armijo line search
+            time : the wall time spent in each phase of the iteration
+            wall_time : the total wall time of the iteration
+
+        Batch optimizers record a list with an entry per row for `objective`, `gap`, `support_size`
+        and `step_size`.
+
+        Examples
+        --------
+        >>> optimizer = CauchySimplex(X, y)
+        >>> optimizer.telemetry = Telemetry(RingBufferSink(1000))
+        >>> result = optimizer.solve(w0)
+        >>> records = optimizer.telemetry.sink.records
+    """
+    enabled = True
+
+    def __init__(self, sink, objective=True):
+        """ Initialize the Telemetry class
+
+            Parameters
+            ----------
+            sink : RingBufferSink, JSONLSink or object
+                Any object with a `write(record)` method, and optionally a `close()` method
+            objective : bool
+                Whether to record the objective. Optimizers that do not already know the objective
+                evaluate it once more for the record, which is not included in the counts or timings
+        """
+        self.sink = sink
+        self.objective = objective
+
+        self.iteration = 0
+
+        self._depth = 0
+        self._reset()
+
+    def _reset(self):
+        self._times = dict.fromkeys(PHASES, 0.0)
+        self._counts = {'f_evals': 0, 'grad_evals': 0, 'backtracks': 0}
+        self._values = {'grad': None, 'step_size': None, 'objective': None}
+
+        self._start = self._mark = time.perf_counter()
+
+    def begin(self):
+        """ Start an iteration. Nested calls, e.g. from a `search` that calls another `search`,
+            are merged into the outermost iteration. Their counts and timings are added up, and the
+            gradient, step size and objective are those of the first nested iteration to give them,
+            which starts from the same point as the outermost one
+        """
+        if self._depth == 0:
+            self._reset()
+        self._depth += 1
+
+    def lap(self, phase):
+        """ Add the time since the previous lap, or the start of the iteration, to `phase` """
+        now = time.perf_counter()
+        self._times[phase] = self._times.get(phase, 0.0) + now - self._mark
+        self._mark = now
+
+    def count(self, name, n=1):
+        self._counts[name] = self._counts.get(name, 0) + n
+
+    def end(self, x, x_new, grad=None, step_size=None, objective=None):
+        """ End the iteration from `x` to `x_new`, and write its record
+
+            Parameters
+            ----------
+            x : np.ndarray
+                The point at the start of the iteration
+            x_new : np.ndarray
+                The point returned by the iteration
+            grad : np.ndarray, optional
+                The gradient at `x`
+            step_size : float or np.ndarray, optional
+            objective : callable, optional
+                Returns the objective at `x`. Only called if the objective is being recorded
+        """
+        wall_time = time.perf_counter() - self._start
+
+        values = {'grad': grad, 'step_size': step_size, 'objective': objective}
+        for key, value in values.items():
+            if value is not None and self._values[key] is None:
+                self._values[key] = value
+
+        self._depth -= 1
+        if self._depth > 0:
+            return
+
+        grad, step_size, objective = self._values['grad'], self._values['step_size'], self._values['objective']
+
+        record = {
+            'iteration': self.iteration,
+            'objective': None,
+            'gap': None if grad is None else _to_json(np.sum(grad * x, axis=-1) - np.min(grad, axis=-1)),
+            'support_size': _to_json(np.count_nonzero(x_new, axis=-1)),
+            'step_size': None if step_size is None else _to_json(step_size),
+            **self._counts,
+            'time': self._times,
+            'wall_time': wall_time,
+        }
+
+        if self.objective and objective is not None:
+            record['objective'] = _to_json(objective())
+
+        self.sink.write(record)
+        self.iteration += 1
+
+    def close(self):
+        close = getattr(self.sink, 'close', None)
+        if close is not None:
+            close()
+
+
+class RingBufferSink:
+    """ Keeps the last `max_size` records in memory """
+    def __init__(self, max_size=10000):
+        self.records = collections.deque(maxlen=max_size)
+
+    def write(self, record):
+        self.records.append(record)
+
+    def __len__(self):
+        return len(self.records)
+
+    def __iter__(self):
+        return iter(self.records)
+
+
+class JSONLSink:
+    """ Appends each record to a file as a line of JSON """
+    def __init__(self, path, mode='w'):
+        self.path = path
+        self._file = open(path, mode)
+
+    def write(self, record):
+        self._file.write(json.dumps(record) + '\n')
+
+    def flush(self):
+        self._file.flush()
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+def _to_json(value):
+    """ Converts numpy scalars and arrays to floats, ints and lists """
+    return np.asarray(value).tolist()
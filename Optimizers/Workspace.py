@@ -0,0 +1,36 @@
+import numpy as np
+
+
+class Workspace:
+    """ Preallocated arrays that an optimizer reuses between iterations, so steady-state iterations
+        do not allocate
+
+        Notes
+        -----
+        The iterates, and carried residuals, are written into two buffers in turn, so the point passed
+        to `search` is never overwritten by that call and stays valid until the call after. A returned
+        point that needs to outlive the next two calls to `search` should be copied.
+    """
+    def __init__(self):
+        self._arrays = {}
+
+    def get(self, name, shape, dtype):
+        """ Returns the array called `name`, allocating it if it does not exist or has another shape or type """
+        array = self._arrays.get(name)
+        if array is None or array.shape != shape or array.dtype != dtype:
+            array = np.empty(shape, dtype=dtype)
+            self._arrays[name] = array
+        return array
+
+    def like(self, name, x, dtype=None):
+        """ Returns the array called `name`, with the shape of `x` and its type unless `dtype` is given """
+        return self.get(name, x.shape, x.dtype if dtype is None else np.dtype(dtype))
+
+    def output(self, x, name='weights', dtype=None):
+        """ Returns the buffer to write the successor of `x` into, which alternates between two arrays
+            so that it is never `x` itself
+        """
+        first = self.like(f'{name}_0', x, dtype=dtype)
+        if first is x:
+            return self.like(f'{name}_1', x, dtype=dtype)
+        return first
@@ -1,3 +1,4 @@
 from .ArmijoSearch import ArmijoSearch
 from .Optimizer import Optimizer
-
+from .SolveResult import SolveResult
+from .Telemetry import NullTelemetry, Telemetry, RingBufferSink, JSONLSink
@@ -0,0 +1,100 @@
+""" Single-pass kernels for the per-iteration work of the optimizers, compiled with Numba when it is installed
+
+    Each kernel replaces a chain of small NumPy calls (masks, fancy indexing, reductions and their
+    temporaries) with one or two loops over the weights. Without Numba these are plain Python loops,
+    so the optimizers only use them with `backend="numba"`, which falls back to the NumPy backend
+    when Numba is not installed.
+"""
+import math
+import warnings
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+
+NUMBA_AVAILABLE = numba is not None
+
+BACKENDS = ("numpy", "numba")
+
+
+def resolve_backend(backend):
+    """ Returns the backend to use, falling back to "numpy" if "numba" is requested but not installed """
+    if backend not in BACKENDS:
+        raise ValueError(f"backend can only be one of {BACKENDS}, got {backend!r}.")
+
+    if backend == "numba" and not NUMBA_AVAILABLE:
+        warnings.warn("Numba is not installed, so the NumPy backend is used instead.", RuntimeWarning,
+                      stacklevel=3)
+        return "numpy"
+
+    return backend
+
+
+def _jit(func):
+    if numba is None:
+        return func
+    return numba.njit(cache=True, nogil=True)(func)
+
+
+@_jit
+def frank_wolfe_pair(x, grad, tol):
+    """ Returns the index of the smallest gradient, and of the largest gradient over x > tol
+
+        Ties go to the lowest index, as in `np.argmin` and `np.argmax`.
+    """
+    s_index, v_index = 0, -1
+    v_max = -math.inf
+
+    for i in range(x.shape[0]):
+        if grad[i] < grad[s_index]:
+            s_index = i
+        if x[i] > tol and (v_index < 0 or grad[i] > v_max):
+            v_index = i
+            v_max = grad[i]
+
+    return s_index, v_index
+
+
+@_jit
+def max_step_size(x, grad, tol, min_diff):
+    """ The Cauchy-Simplex maximum step size, 1 / (max(grad[x > tol]) - x @ grad) """
+    max_grad = -math.inf
+    grad_x = 0.0
+
+    for i in range(x.shape[0]):
+        grad_x += x[i] * grad[i]
+        if x[i] > tol and grad[i] > max_grad:
+            max_grad = grad[i]
+
+    diff = max_grad - grad_x
+    return 1 / diff if diff > min_diff else 1 / min_diff
+
+
+@_jit
+def cauchy_simplex_update(x, d, step_size, tol, out):
+    """ Writes the Cauchy-Simplex step `x - step_size * d`, with the zero-set removed and renormalised,
+        into `out`
+
+        Returns False, leaving `out` unnormalised, if `x` has a single non-zero entry and so the step
+        leaves it unchanged.
+    """
+    support = 0
+    total = 0.0
+
+    for i in range(x.shape[0]):
+        if x[i] > 0:
+            support += 1
+
+        z = 0.0 if x[i] < tol else x[i] - step_size * d[i]
+        out[i] = z
+        total += z
+
+    if support == 1:
+        return False
+
+    for i in range(x.shape[0]):
+        out[i] = out[i] / total
+
+    return True
@@ -1,6 +1,8 @@
 import numpy as np
 import sys
 
+from scipy import sparse
+
 
 def verbose_callback(count, max_iter, w, points, y):
     distance = np.sum((w @ points - y) ** 2) / 2
@@ -13,19 +15,51 @@ def verbose_callback(count, max_iter, w, points, y):
     sys.stdout.flush()
 
 
-def project_onto_standard_simplex(y):
-    """ https://gist.github.com/mgritter/4bf003cd399da2e57096af1050d64ddd """
-    n = len(y)
-    y_s = sorted(y, reverse=True)
+def project_onto_standard_simplex(y, out=None):
+    """ Euclidean projection of y, or of each row of y, onto the probability simplex
+
+        Uses Michelot's algorithm, vectorised over the rows. The threshold tau starts from the mean
+        of y minus 1 / n, and is repeatedly recomputed over the entries above it. It only increases,
+        so the active entries only shrink, and the loop stops once no row changes. This is expected
+        to take a handful of O(n) passes, with no sorting.
+
+        Parameters
+        ----------
+        y : (n, ) or (k, n) np.ndarray
+        out : np.ndarray, optional
+            If given, the projection is written into `out`, which has the shape of `y` and may be `y`
+
+        Returns
+        -------
+        np.ndarray
+            The projection, with the same shape as `y`
+    """
+    y = np.asarray(y)
+    Y = np.atleast_2d(y)
+
+    # A nan or inf entry would otherwise give a nan threshold, and the loop might not terminate
+    if not np.all(np.isfinite(Y)):
+        raise ValueError("Cannot project a point with non-finite entries onto the simplex.")
 
-    sum_y = 0
-    for i, y_i, y_next in zip(range(1, n+1), y_s, y_s[1:] + [0.0]):
-        sum_y += y_i
-        t = (sum_y - 1) / i
-        if t >= y_next:
+    count = np.full(len(Y), Y.shape[1], dtype=np.result_type(Y, 1.0))
+    tau = (np.sum(Y, axis=1) - 1) / count
+
+    active = np.empty(Y.shape, dtype=bool)
+    while True:
+        np.greater(Y, tau[:, None], out=active)
+        new_count = np.count_nonzero(active, axis=1)
+        if np.array_equal(new_count, count):
             break
 
-    return np.maximum(0, y - t)
+        count = new_count.astype(count.dtype)
+        tau = (np.sum(Y, axis=1, where=active) - 1) / count
+
+    if out is None:
+        return np.maximum(Y - tau[:, None], 0).reshape(y.shape)
+
+    projection = np.subtract(Y, tau[:, None], out=out.reshape(Y.shape))
+    np.maximum(projection, 0, out=projection)
+    return out
 
 
 def clip(val, min_val, max_val):
@@ -34,3 +68,37 @@ def clip(val, min_val, max_val):
     elif val > max_val:
         return max_val
     return val
+
+
+def dense_rows(X, index):
+    """ Returns the rows X[index] as a np.ndarray, only densifying those rows if X is sparse """
+    rows = X[index]
+    if not sparse.issparse(rows):
+        return rows
+
+    rows = rows.toarray()
+    return rows.reshape(-1) if np.ndim(index) == 0 else rows
+
+
+def squared_row_norms(X):
+    """ Returns ||X[i]||^2 for each row of X, which can be dense or sparse """
+    if sparse.issparse(X):
+        return np.asarray(X.multiply(X).sum(axis=1)).reshape(-1)
+    return np.sum(X ** 2, axis=1)
+
+
+def dtype_tolerances(dtype):
+    """ Returns the zero-set tolerance and the `max_step_size` guard for the floating point type
+
+        These are 1e-10 and 1e-6 for float64, and are scaled by sqrt(eps / eps_float64) for lower
+        precision types, e.g. about 2e-6 and 2e-2 for float32
+    """
+    scale = float(np.sqrt(np.finfo(dtype).eps / np.finfo(np.float64).eps))
+    return 1e-10 * scale, 1e-6 * scale
+
+
+def as_dtype(X, dtype):
+    """ Cast a dense or sparse array to `dtype`, without copying if it already has that type """
+    if X is None or dtype is None:
+        return X
+    return X.astype(dtype, copy=False)